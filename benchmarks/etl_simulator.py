@@ -0,0 +1,439 @@
+import os
+import json
+import glob
+import time
+import logging
+import argparse
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Defect kind → default rate (fraction of patient rows, or of doctors for null_keys)
+DEFAULT_RATES = {
+    "dropped_rows": 0.001,          # source rows never loaded into Stage / Target
+    "duplicate_keys": 0.001,        # source_patients keys inserted twice
+    "null_keys": 0.001,             # source_doctors.email (composite key) is NULL
+    "garbage_chars": 0.001,         # '#' appended to source_patients.first_name
+    "bad_dates": 0.001,             # stage_patients.date_of_birth (text) is not a valid date
+    "scd_overlaps": 0.001,          # extra historical version overlapping the current one in Target
+    "orphan_fks": 0.001,            # target_patients.primary_doctor_id has no target_doctors row
+    "transformation_drift": 0.001,  # target_patients.Age off by one year
+}
+
+# Validator (smoke-suite name) → defects that a correct run must report, per section.
+# Cross-environment validators use the key None.
+EXPECTATIONS = {
+    "count_validation": {None: {"dropped_rows", "duplicate_keys", "scd_overlaps", "soft_deletes"}},
+    "null_validation": {s: {"null_keys"} for s in ("SOURCEDB", "STAGEDB", "TARGETDB")},
+    "duplicate_validation": {"SOURCEDB": {"duplicate_keys"}},
+    "garbage_value_validation": {s: {"garbage_chars"} for s in ("SOURCEDB", "STAGEDB", "TARGETDB")},
+    "date_field_validation": {"STAGEDB": {"bad_dates"}},
+    "scd_metadata_field_validation": {"TARGETDB": {"scd_overlaps"}},
+    "Referential_Integrity_validation": {"TARGETDB": {"orphan_fks"}},
+    "data_completeness_validation_SourceToStage": {None: {"dropped_rows"}},
+    "data_completeness_validation_StageToTarget": {None: {"bad_dates", "orphan_fks"}},
+    "scd_validation_cross_env_SourceToStage": {None: {"dropped_rows"}},
+    "scd_validation_cross_env_StageToTarget": {None: {"bad_dates", "orphan_fks"}},
+    "transformation_validation": {None: {"dropped_rows", "transformation_drift"}},
+    # Schema differences by design (not injected at a rate): the text landing of date_of_birth in
+    # Stage, and the SCD / derived Age columns that only Target has
+    "datatype_constraints_Cross_ENV_validation_SourceToStage": {None: {"stage_type_changes"}},
+    "Check_Column_order": {None: {"target_added_columns"}},
+}
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Susan"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Moore"]
+SPECIALTIES = ["Cardiology", "Neurology", "Orthopedics", "Pediatrics", "General Surgery"]
+GENDERS = ["Male", "Female", "Other"]
+
+# Target Age is the age on a fixed date, so the data is reproducible. The expression is valid T-SQL;
+# the local engine translates DATEDIFF(YEAR, ...) the same way for the TRANSFORMATION query.
+AS_OF = "2025-06-06"
+AGE_SQL = (f"DATEDIFF(YEAR, date_of_birth, CAST('{AS_OF}' AS DATE)) - CASE WHEN MONTH(date_of_birth) > 6 "
+           f"OR (MONTH(date_of_birth) = 6 AND DAY(date_of_birth) > 6) THEN 1 ELSE 0 END")
+_AGE_SQL_DUCKDB = AGE_SQL.replace("DATEDIFF(YEAR,", "DATEDIFF('year',")
+
+
+def _pick(values, tag):
+    """Deterministic choice from a literal list, keyed on the row number and seed."""
+    items = ", ".join(f"'{v}'" for v in values)
+    return f"([{items}])[1 + (hash(i, {{seed}}, '{tag}') % {len(values)})::BIGINT]"
+
+
+def _hit(defect, column="i"):
+    """Predicate selecting ~rate of the rows for one defect kind."""
+    return f"(hash({column}, {{seed}}, '{defect}') % 1000000 < {{{defect}}})"
+
+
+SCD_COLUMNS = """
+    TIMESTAMP '2025-01-02' AS load_timestamp,
+    TIMESTAMP '2025-01-01' AS Version_Begin_Date,
+    TIMESTAMP '9999-12-31' AS Version_End_Date,
+    '1' AS Is_Current"""
+
+PATIENT_ROW = "CAST(regexp_extract(patient_id, '-(\\d+)$', 1) AS BIGINT)"
+
+BUILD_SQL = [
+    # --- Clean business data (what a perfect ETL would move) -----------------------
+    f"""
+    CREATE TEMP TABLE base_doctors AS
+    SELECT i, printf('B%d-%03d', i - 1, i) AS doctor_id,
+           {_pick(FIRST_NAMES, 'dfn')} AS first_name,
+           {_pick(LAST_NAMES, 'dln')} AS last_name,
+           {_pick(SPECIALTIES, 'dsp')} AS specialty,
+           printf('555-%07d', i) AS phone_number,
+           printf('doctor%d@example.com', i) AS email
+    FROM range(1, {{doctors}} + 1) t(i)
+    """,
+    f"""
+    CREATE TEMP TABLE base_patients AS
+    SELECT i, printf('P%d-%03d', i - 1, i) AS patient_id,
+           {_pick(FIRST_NAMES, 'pfn')} AS first_name,
+           {_pick(LAST_NAMES, 'pln')} AS last_name,
+           DATE '1935-01-01' + (hash(i, {{seed}}, 'dob') % 25000)::INTEGER AS date_of_birth,
+           {_pick(GENDERS, 'gen')} AS gender,
+           printf('%d Main Street Springfield', i) AS address,
+           printf('555-%07d', i) AS phone_number,
+           printf('patient%d@example.com', i) AS email,
+           printf('B%d-%03d', d - 1, d) AS primary_doctor_id,
+           hash(i, {{seed}}, 'deleted') % 1000000 < {{soft_deletes}} AS is_deleted
+    FROM (SELECT i, 1 + (hash(i, {{seed}}, 'doc') % {{doctors}})::BIGINT AS d
+          FROM range(1, {{patients}} + 1) t(i))
+    """,
+    # --- Source: data-quality defects that the ETL copies downstream -----------------
+    f"""
+    CREATE TABLE SOURCE_DB.dbo.source_doctors AS
+    SELECT doctor_id, first_name, last_name, specialty, phone_number,
+           CASE WHEN {_hit('null_keys')} THEN NULL ELSE email END AS email
+    FROM base_doctors
+    """,
+    f"""
+    CREATE TEMP TABLE loaded_patients AS
+    SELECT i, patient_id,
+           first_name || CASE WHEN {_hit('garbage_chars')} THEN '#' ELSE '' END AS first_name,
+           last_name, date_of_birth, gender, address, phone_number, email, primary_doctor_id, is_deleted
+    FROM base_patients
+    """,
+    # Soft-deleted keys are gone from the source and closed in the target
+    f"""
+    CREATE TABLE SOURCE_DB.dbo.source_patients AS
+    SELECT patient_id, first_name, last_name, date_of_birth, gender, address,
+           phone_number, email, primary_doctor_id
+    FROM loaded_patients, range(CASE WHEN {_hit('duplicate_keys')} THEN 2 ELSE 1 END) r(copy)
+    WHERE NOT is_deleted
+    """,
+    # --- Stage: text landing of date_of_birth, dropped rows ---------------------------
+    f"""
+    CREATE TABLE STAGE_DB.dbo.stage_doctors AS
+    SELECT doctor_id, first_name, last_name, specialty, phone_number, email, {SCD_COLUMNS}
+    FROM SOURCE_DB.dbo.source_doctors
+    """,
+    f"""
+    CREATE TABLE STAGE_DB.dbo.stage_patients AS
+    SELECT patient_id, first_name, last_name,
+           CASE WHEN {_hit('bad_dates')} THEN strftime(date_of_birth, '%Y-02-30')
+                ELSE strftime(date_of_birth, '%Y-%m-%d') END AS date_of_birth,
+           gender, address, phone_number, email, primary_doctor_id, {SCD_COLUMNS}
+    FROM loaded_patients
+    WHERE NOT is_deleted AND NOT {_hit('dropped_rows')}
+    """,
+    # --- Target: SCD2 dimension with history, orphans and transformation drift --------
+    """
+    CREATE TABLE TARGET_DB.dbo.target_doctors AS
+    SELECT * FROM STAGE_DB.dbo.stage_doctors
+    """,
+    f"""
+    CREATE TABLE TARGET_DB.dbo.target_patients AS
+    SELECT patient_id, first_name, last_name, date_of_birth, gender, address, phone_number, email,
+           CASE WHEN {_hit('orphan_fks')} THEN 'B-ORPHAN' ELSE primary_doctor_id END AS primary_doctor_id,
+           load_timestamp, Version_Begin_Date, Version_End_Date, Is_Current,
+           CAST(({_AGE_SQL_DUCKDB}) + CASE WHEN {_hit('transformation_drift')} THEN 1 ELSE 0 END AS INTEGER) AS Age
+    FROM (SELECT *, {SCD_COLUMNS} FROM loaded_patients)
+    WHERE is_deleted OR NOT {_hit('dropped_rows')}
+    """,
+    # Overlapping history: an older version whose end date runs past the current version's start
+    f"""
+    INSERT INTO TARGET_DB.dbo.target_patients
+    SELECT patient_id, first_name, last_name, date_of_birth, gender, address, phone_number, email,
+           primary_doctor_id, TIMESTAMP '2024-06-02', TIMESTAMP '2024-06-01', TIMESTAMP '2025-03-01', '0', Age
+    FROM (SELECT *, {PATIENT_ROW} AS i FROM TARGET_DB.dbo.target_patients)
+    WHERE {_hit('scd_overlaps')}
+    """,
+    """
+    CREATE VIEW TARGET_DB.dbo.doctor AS
+    SELECT doctor_id, first_name, last_name, specialty, phone_number, email
+    FROM TARGET_DB.dbo.target_doctors
+    """,
+    """
+    CREATE TABLE TARGET_DB.dbo.EX_INNOV_RISK_target_patients_Daily_DELETED AS
+    SELECT patient_id, TIMESTAMP '2025-06-01' AS CreatedDTM
+    FROM loaded_patients
+    WHERE is_deleted
+    """,
+    """
+    UPDATE TARGET_DB.dbo.target_patients T
+    SET Is_Current = '0', Version_End_Date = D.CreatedDTM
+    FROM TARGET_DB.dbo.EX_INNOV_RISK_target_patients_Daily_DELETED D
+    WHERE T.patient_id = D.patient_id
+    """,
+    # --- ETL audit tables: latest run per component is consistent ---------------------
+    """
+    CREATE TABLE TARGET_DB.dbo.ETL_Process_Log AS
+    SELECT * FROM (VALUES
+        (1, 'Load_Doctors',  'SUCCESS', TIMESTAMP '2025-06-01 01:00:00', TIMESTAMP '2025-06-01 01:05:00'),
+        (2, 'Load_Patients', 'FAILED',  TIMESTAMP '2025-06-01 01:05:00', TIMESTAMP '2025-06-01 01:20:00'),
+        (3, 'Load_Patients', 'SUCCESS', TIMESTAMP '2025-06-02 01:05:00', TIMESTAMP '2025-06-02 01:25:00')
+    ) t(ProcessLogId, ComponentName, Status, StartTime, EndTime)
+    """,
+    """
+    CREATE TABLE TARGET_DB.dbo.ETL_Detail_Process_Log AS
+    SELECT * FROM (VALUES
+        (1, 1, 'Load_Doctors',  'Rows loaded'),
+        (2, 2, 'Load_Patients', 'Load aborted'),
+        (3, 3, 'Load_Patients', 'Rows loaded')
+    ) t(DetailID, ProcessLogId, ComponentName, DetailMessage)
+    """,
+    """
+    CREATE TABLE TARGET_DB.dbo.ETL_Error_Log AS
+    SELECT * FROM (VALUES
+        (1, 2, 'Load_Patients', 'Conversion failed for date_of_birth')
+    ) t(ErrorID, ProcessLogId, ComponentName, ErrorMessage)
+    """,
+]
+
+# Ground truth, measured on the built databases (not derived from the rates)
+TRUTH_SQL = {
+    "dropped_rows": """
+        SELECT COUNT(DISTINCT s.patient_id) FROM SOURCE_DB.dbo.source_patients s
+        WHERE NOT EXISTS (SELECT 1 FROM STAGE_DB.dbo.stage_patients t WHERE t.patient_id = s.patient_id)""",
+    "duplicate_keys": """
+        SELECT COUNT(*) FROM (SELECT patient_id FROM SOURCE_DB.dbo.source_patients
+                              GROUP BY patient_id HAVING COUNT(*) > 1)""",
+    "null_keys": "SELECT COUNT(*) FROM SOURCE_DB.dbo.source_doctors WHERE email IS NULL",
+    "garbage_chars": "SELECT COUNT(*) FROM SOURCE_DB.dbo.source_patients WHERE first_name LIKE '%#%'",
+    "bad_dates": "SELECT COUNT(*) FROM STAGE_DB.dbo.stage_patients WHERE TRY_CAST(date_of_birth AS DATE) IS NULL",
+    "scd_overlaps": "SELECT COUNT(*) FROM TARGET_DB.dbo.target_patients WHERE Version_Begin_Date = TIMESTAMP '2024-06-01'",
+    "orphan_fks": """
+        SELECT COUNT(*) FROM TARGET_DB.dbo.target_patients p
+        WHERE NOT EXISTS (SELECT 1 FROM TARGET_DB.dbo.target_doctors d WHERE d.doctor_id = p.primary_doctor_id)""",
+    "transformation_drift": f"""
+        SELECT COUNT(*) FROM TARGET_DB.dbo.target_patients WHERE Age <> {_AGE_SQL_DUCKDB}""",
+    "soft_deletes": "SELECT COUNT(*) FROM TARGET_DB.dbo.EX_INNOV_RISK_target_patients_Daily_DELETED",
+    "stage_type_changes": """
+        SELECT COUNT(*) FROM information_schema.columns s
+        JOIN information_schema.columns t
+          ON t.table_catalog = 'STAGE_DB' AND t.table_name = replace(s.table_name, 'source_', 'stage_')
+         AND lower(t.column_name) = lower(s.column_name)
+        WHERE s.table_catalog = 'SOURCE_DB' AND s.table_name IN ('source_patients', 'source_doctors')
+          AND s.data_type <> t.data_type""",
+    "target_added_columns": """
+        SELECT COUNT(*) FROM information_schema.columns t
+        WHERE t.table_catalog = 'TARGET_DB' AND t.table_name IN ('target_patients', 'target_doctors')
+          AND NOT EXISTS (SELECT 1 FROM information_schema.columns s
+                          WHERE s.table_catalog = 'SOURCE_DB'
+                            AND s.table_name = replace(t.table_name, 'target_', 'source_')
+                            AND lower(s.column_name) = lower(t.column_name))""",
+}
+
+
+class ETLSimulator:
+    """
+    Builds Source / Stage / Target DuckDB databases of a chosen size with defects injected at
+    known rates, the matching Data.xlsx configuration, and a ground-truth file of what each
+    validator should report.
+    """
+
+    def __init__(self, rows, data_dir=os.path.join("benchmarks", "data"), rates=None,
+                 soft_delete_rate=0.01, seed=42):
+        self.rows = int(rows)
+        self.data_dir = data_dir
+        self.rates = dict(DEFAULT_RATES, **(rates or {}))
+        self.soft_delete_rate = soft_delete_rate
+        self.seed = int(seed)
+        self.workbook_path = os.path.join(data_dir, "Data.xlsx")
+
+    def _params(self):
+        params = {defect: int(rate * 1000000) for defect, rate in self.rates.items()}
+        params.update({
+            "seed": self.seed,
+            "patients": self.rows,
+            "doctors": max(1, self.rows // 10),
+            "soft_deletes": int(self.soft_delete_rate * 1000000),
+        })
+        return params
+
+    # ------------------------------------------------------------------
+    def build(self):
+        """(Re)create the three databases and Data.xlsx. Returns the ground truth."""
+        import duckdb
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        for old in glob.glob(os.path.join(self.data_dir, "*.duckdb*")):
+            os.remove(old)
+
+        params = self._params()
+        start = time.perf_counter()
+        conn = duckdb.connect(":memory:")
+        try:
+            for name in ("SOURCE_DB", "STAGE_DB", "TARGET_DB"):
+                conn.execute(f"ATTACH '{os.path.join(self.data_dir, name + '.duckdb')}' AS {name}")
+                conn.execute(f"CREATE SCHEMA {name}.dbo")
+
+            for sql in BUILD_SQL:
+                conn.execute(sql.format(**params))
+
+            defects = {defect: conn.execute(sql).fetchone()[0] for defect, sql in TRUTH_SQL.items()}
+            table_rows = {}
+            for name in ("SOURCE_DB", "STAGE_DB", "TARGET_DB"):
+                tables = conn.execute(
+                    "SELECT table_name FROM information_schema.tables "
+                    "WHERE table_catalog = ? AND table_type = 'BASE TABLE'", [name]
+                ).fetchall()
+                table_rows[name] = {
+                    t: conn.execute(f'SELECT COUNT(*) FROM {name}.dbo."{t}"').fetchone()[0] for (t,) in tables
+                }
+        finally:
+            conn.close()
+
+        self.write_workbook()
+        truth = {
+            "rows": self.rows,
+            "seed": self.seed,
+            "rates": self.rates,
+            "soft_delete_rate": self.soft_delete_rate,
+            "defects": defects,
+            "table_rows": table_rows,
+            "build_seconds": round(time.perf_counter() - start, 2),
+        }
+        with open(os.path.join(self.data_dir, "ground_truth.json"), "w", encoding="utf-8") as f:
+            json.dump(truth, f, indent=2)
+
+        logging.info(f"🏭 Simulated {self.rows:,} patients in {truth['build_seconds']} s → {defects}")
+        return truth
+
+    # ------------------------------------------------------------------
+    def write_workbook(self):
+        """Data.xlsx with the same sheets / columns as the project workbook, describing these tables."""
+        import pandas as pd
+
+        def columns(db, table, cols):
+            return [
+                {"Database": db, "table_name": table, "column_name": c, "Data_Type": t,
+                 "Constraints": k, "Other_SQL_query": None}
+                for c, t, k in cols
+            ]
+
+        doctor_cols = [
+            ("doctor_id", "VARCHAR", "PRIMARY KEY, COMPOSITE KEY"), ("first_name", "VARCHAR", None),
+            ("last_name", "VARCHAR", None), ("specialty", "VARCHAR", None),
+            ("phone_number", "VARCHAR", None), ("email", "VARCHAR", "COMPOSITE KEY"),
+        ]
+        patient_cols = [
+            ("patient_id", "VARCHAR", "PRIMARY KEY, COMPOSITE KEY"), ("first_name", "VARCHAR", None),
+            ("last_name", "VARCHAR", None), ("date_of_birth", "DATE", None), ("gender", "VARCHAR", None),
+            ("address", "VARCHAR", None), ("phone_number", "VARCHAR", None), ("email", "VARCHAR", None),
+            ("primary_doctor_id", "VARCHAR", "FOREIGN KEY"),
+        ]
+        scd_cols = [
+            ("load_timestamp", "DATETIME2", None), ("Version_Begin_Date", "DATETIME2", None),
+            ("Version_End_Date", "DATETIME2", None), ("Is_Current", "VARCHAR", None),
+        ]
+        stage_patient_cols = [(c, "VARCHAR" if c == "date_of_birth" else t, k) for c, t, k in patient_cols]
+
+        sheets = {
+            "Smoke_Suite_Test_cases": pd.DataFrame({
+                "Sr. no.": range(1, 26),
+                "Test Cases": [
+                    "count_validation", "data_completeness_validation_SourceToStage",
+                    "data_completeness_validation_StageToTarget",
+                    "datatype_constraints_Cross_ENV_validation_SourceToStage",
+                    "datatype_constraints_Cross_ENV_validation_SourceToTarget",
+                    "datatype_constraints_validation", "Referential_Integrity_validation",
+                    "date_field_validation", "duplicate_validation", "garbage_value_validation",
+                    "null_validation", "other_validation", "scd_metadata_field_validation",
+                    "scd_validation_cross_env_SourceToStage", "scd_validation_cross_env_StageToTarget",
+                    "transformation_validation", "Check_Column_order", "Data_Precision_validation",
+                    "ETL_Batch_Column_Exclusion_validation", "Job_Run_validation", "ETL_Log_Table_validation",
+                    "ETL_Process_VS_Details_validation", "DeletedVsTarget_validation",
+                    "DeletedVsSource_validation", "Readd_Record_validation",
+                ],
+                # No SQL Agent on the local engine
+                "Run (Y/N)": ["Y"] * 19 + ["N"] + ["Y"] * 5,
+            }),
+            "SOURCEDB": pd.DataFrame(
+                columns("source_db", "source_doctors", doctor_cols)
+                + columns("source_db", "source_patients", patient_cols)),
+            "STAGEDB": pd.DataFrame(
+                columns("stage_db", "stage_doctors", doctor_cols + scd_cols)
+                + columns("stage_db", "stage_patients", stage_patient_cols + scd_cols)),
+            "TARGETDB": pd.DataFrame(
+                columns("target_db", "target_doctors", doctor_cols + scd_cols)
+                + columns("target_db", "target_patients", patient_cols + scd_cols + [("Age", "INT", None)])),
+            "Table_Mapping": pd.DataFrame([
+                {"source_table": "source_doctors", "stage_table": "stage_doctors",
+                 "target_table": "target_doctors", "target_view": "doctor", "deleted_table": None,
+                 "Component_Name": "Load_Doctors"},
+                {"source_table": "source_patients", "stage_table": "stage_patients",
+                 "target_table": "target_patients", "target_view": None,
+                 "deleted_table": "EX_INNOV_RISK_target_patients_Daily_DELETED",
+                 "Component_Name": "Load_Patients"},
+            ]),
+            "TRANSFORMATION": pd.DataFrame([{
+                "Database": "source_db", "table_name": "source_patients", "column_name": "date_of_birth",
+                "Is_Transformation": "Y",
+                "Source_Query": f"SELECT patient_id, {AGE_SQL} AS Age FROM source_patients",
+                "Target_Query": "SELECT patient_id, Age FROM target_patients",
+            }]),
+            "Referential Integrity Check": pd.DataFrame([{
+                "parent_table": "target_doctors", "parent_column": "doctor_id",
+                "child_table": "target_patients", "child_column": "primary_doctor_id",
+            }]),
+            "TARGETDW": pd.DataFrame(columns=["Job_Name", "SP_Name", "Job_Command", "Run (Y/N)"]),
+            "Audit_tables": pd.DataFrame([{
+                "Audit_table_1": "ETL_Process_Log", "Audit_table_2": "ETL_Detail_Process_Log",
+                "Audit_table_3": "ETL_Error_Log", "Common_Column": "ProcessLogId, ComponentName",
+            }]),
+        }
+        with pd.ExcelWriter(self.workbook_path, engine="openpyxl") as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+        return self.workbook_path
+
+
+def expected_defects(validator, sections, truth):
+    """Defects (with at least one injected row) that this validator run should report."""
+    by_section = EXPECTATIONS.get(validator, {})
+    if None in by_section:
+        kinds = by_section[None]
+    else:
+        kinds = set().union(*(by_section.get(s, set()) for s in sections))
+    return sorted(k for k in kinds if truth["defects"].get(k, 0) > 0)
+
+
+def classify(result, truth):
+    """Add expected / outcome (TP, FP, FN, TN, ERROR) to a benchmark record."""
+    expected = expected_defects(result["validator"], result["sections"], truth)
+    detected = result["status"] == "FAIL"
+    result["expected_defects"] = expected
+    if result["status"] == "ERROR":
+        result["outcome"] = "ERROR"
+    elif expected:
+        result["outcome"] = "TP" if detected else "FN"
+    else:
+        result["outcome"] = "FP" if detected else "TN"
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate Source/Stage/Target databases with injected defects")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--defect-rate", type=float, help="same rate for every defect kind")
+    parser.add_argument("--rate", nargs=2, action="append", metavar=("DEFECT", "RATE"), default=[],
+                        help=f"override one rate; defects: {', '.join(DEFAULT_RATES)}")
+    parser.add_argument("--soft-delete-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=os.path.join("benchmarks", "data"))
+    args = parser.parse_args()
+
+    rates = {k: args.defect_rate for k in DEFAULT_RATES} if args.defect_rate is not None else {}
+    rates.update({k: float(v) for k, v in args.rate})
+    ETLSimulator(args.rows, args.data_dir, rates, args.soft_delete_rate, args.seed).build()
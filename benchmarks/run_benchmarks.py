@@ -0,0 +1,273 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db_helper import DBHelper
+from utils.config_loader import ConfigLoader
+from utils.report_helper import ReportHelper
+from utils.query_profiler import QueryProfiler
+from src.count_validation import CountValidation
+from src.data_completeness_validation import Validation_SourceToStage, Validation_StageToTarget
+from src.datatype_constraints_Cross_ENV_validation import DC_Validation_SourceToStage, DC_Validation_SourceToTarget
+from src.Datatype_constraint_validation import DataTypeValidation
+from src.date_field_validation import DateFieldValidation
+from src.duplicate_validation import DuplicateValidation
+from src.garbage_value_validation import GarbageValueValidation
+from src.null_validation import NullValidation
+from src.other_validation import OtherValidation
+from src.scd_metadata_field_validation import SCDAuditValidation
+from src.scd_validation_cross_env import SCD_Validation_SourceToStage, SCD_Validation_StageToTarget
+from src.transformation_validation import TransformationValidation
+from src.Referential_Integrity_validation import ReferentialIntegrity_Validation
+from src.Check_column_order import ColumnNameValidation
+from src.data_precision_validation import DataPrecisionValidation
+from src.exclusion_etl_batch_columns_in_views import ExclusionETLBatchColumnsInViews
+from src.ETL_log_table_validations import ETLLog_Validation
+from src.ETLProcess_vs_Details_log_validation import Process_vs_Detail_log_Validation
+from src.deleted_vs_source_validation import DeletedVsSource_Validation
+from src.deleted_vs_target_validation import DeletedVsTarget_Validation
+from src.readd_record_validation import ReAddedRecords_Validation
+from benchmarks.etl_simulator import ETLSimulator, DEFAULT_RATES, classify
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+log = logging.getLogger(__name__)
+
+CONFIG_PATH = os.path.join("benchmarks", "benchmark_config.ini")
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+# First caller fixes the profiler settings for the whole process
+QueryProfiler.get(CONFIG_PATH)
+
+SECTION_DATABASES = {"SOURCEDB": "SOURCE_DB", "STAGEDB": "STAGE_DB", "TARGETDB": "TARGET_DB"}
+
+# Smoke-suite name → (factory(config_loader), sections it can run on)
+LOADER_VALIDATORS = {
+    "count_validation": (CountValidation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "datatype_constraints_validation": (DataTypeValidation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "Referential_Integrity_validation": (ReferentialIntegrity_Validation, ("STAGEDB", "TARGETDB")),
+    "date_field_validation": (DateFieldValidation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "duplicate_validation": (lambda cl: DuplicateValidation(cl, cl.section_name), ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "garbage_value_validation": (GarbageValueValidation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "null_validation": (NullValidation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "other_validation": (OtherValidation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "scd_metadata_field_validation": (SCDAuditValidation, ("STAGEDB", "TARGETDB")),
+    "Data_Precision_validation": (DataPrecisionValidation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "ETL_Batch_Column_Exclusion_validation": (ExclusionETLBatchColumnsInViews, ("STAGEDB", "TARGETDB")),
+    "ETL_Log_Table_validation": (ETLLog_Validation, ("STAGEDB", "TARGETDB")),
+    "ETL_Process_VS_Details_validation": (Process_vs_Detail_log_Validation, ("STAGEDB", "TARGETDB")),
+    "DeletedVsTarget_validation": (DeletedVsTarget_Validation, ("STAGEDB", "TARGETDB")),
+    "DeletedVsSource_validation": (DeletedVsSource_Validation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+    "Readd_Record_validation": (ReAddedRecords_Validation, ("SOURCEDB", "STAGEDB", "TARGETDB")),
+}
+
+# Smoke-suite name → (class(config_path), left section, right section)
+CROSS_ENV_VALIDATORS = {
+    "data_completeness_validation_SourceToStage": (Validation_SourceToStage, "SOURCEDB", "STAGEDB"),
+    "data_completeness_validation_StageToTarget": (Validation_StageToTarget, "STAGEDB", "TARGETDB"),
+    "datatype_constraints_Cross_ENV_validation_SourceToStage": (DC_Validation_SourceToStage, "SOURCEDB", "STAGEDB"),
+    "datatype_constraints_Cross_ENV_validation_SourceToTarget": (DC_Validation_SourceToTarget, "SOURCEDB", "TARGETDB"),
+    "scd_validation_cross_env_SourceToStage": (SCD_Validation_SourceToStage, "SOURCEDB", "STAGEDB"),
+    "scd_validation_cross_env_StageToTarget": (SCD_Validation_StageToTarget, "STAGEDB", "TARGETDB"),
+    "transformation_validation": (TransformationValidation, "SOURCEDB", "TARGETDB"),
+    "Check_Column_order": (ColumnNameValidation, "SOURCEDB", "TARGETDB"),
+}
+
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+        dirty = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], text=True).strip()
+        return commit + ("-dirty" if dirty else "")
+    except Exception:
+        return "unknown"
+
+
+def _measure(name, sections, rows_scanned, fn, track_memory):
+    """Run one validator and return its benchmark record."""
+    profiler = QueryProfiler.get()
+    mark = profiler.begin_check(name)
+    status, error = "PASS", None
+
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        fn()
+    except AssertionError as e:
+        status, error = "FAIL", str(e)[:500]    # injected defects found
+    except Exception as e:
+        status, error = "ERROR", f"{type(e).__name__}: {e}"[:500]
+    seconds = time.perf_counter() - start
+    peak = None
+    if track_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    records = profiler.since(mark)
+    result = {
+        "validator": name,
+        "sections": sections,
+        "status": status,
+        "seconds": round(seconds, 4),
+        "rows_scanned": rows_scanned,
+        "rows_per_sec": round(rows_scanned / seconds, 1) if seconds > 0 else None,
+        "peak_memory_mb": round(peak / 1024 / 1024, 2) if peak is not None else None,
+        "queries": len(records),
+        "rows_fetched": sum(r["rows"] for r in records),
+        "sql_ms": round(sum(r["wall_ms"] for r in records), 2),
+        "error": error,
+    }
+    log.info(f"⏱️ {name} [{'/'.join(sections)}] {status} in {result['seconds']} s, "
+             f"{result['rows_per_sec']} rows/s, peak {result['peak_memory_mb']} MB")
+    return result
+
+
+def run(sections, only=None, track_memory=True):
+    """
+    Time every validator against the simulated databases and score each run against the
+    ground truth (TP / FP / FN / TN). Returns the list of records.
+    """
+    with open(os.path.join("benchmarks", "data", "ground_truth.json"), encoding="utf-8") as f:
+        truth = json.load(f)
+    table_rows = truth["table_rows"]
+
+    def scanned(*secs):
+        return sum(sum(table_rows.get(SECTION_DATABASES[s], {}).values()) for s in secs)
+
+    results = []
+
+    for section in sections:
+        loader = ConfigLoader(CONFIG_PATH, section_name=section)
+        for name, (factory, allowed) in LOADER_VALIDATORS.items():
+            if section not in allowed or (only and name not in only):
+                continue
+            results.append(_measure(name, [section], scanned(section),
+                                    lambda: factory(loader).run(), track_memory))
+        loader.db.close()
+
+    dbs = {}
+    for name, (cls, left, right) in CROSS_ENV_VALIDATORS.items():
+        if only and name not in only:
+            continue
+        for s in (left, right):
+            if s not in dbs:
+                dbs[s] = DBHelper.from_config_section(CONFIG_PATH, s)
+                dbs[s].connect()
+        report_helper = ReportHelper(CONFIG_PATH)
+        results.append(_measure(name, [left, right], scanned(left, right),
+                                lambda: cls(CONFIG_PATH).run(dbs[left], dbs[right], report_helper),
+                                track_memory))
+    for db in dbs.values():
+        db.close()
+    return [classify(r, truth) for r in results]
+
+
+def detection_summary(results):
+    """Print the validators whose outcome disagrees with the ground truth."""
+    counts = {}
+    for r in results:
+        counts[r["outcome"]] = counts.get(r["outcome"], 0) + 1
+        if r["outcome"] in ("FP", "FN", "ERROR"):
+            expected = ", ".join(r["expected_defects"]) or "none"
+            print(f"{r['outcome']:<6} {r['validator']} [{'/'.join(r['sections'])}] expected: {expected}")
+    print("Detection: " + ", ".join(f"{k}={counts.get(k, 0)}" for k in ("TP", "TN", "FP", "FN", "ERROR")))
+    return counts
+
+
+def save(results, metadata):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    commit = git_commit()
+    payload = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "simulation": {k: metadata[k] for k in ("rows", "seed", "rates", "soft_delete_rate", "defects")},
+        "results": results,
+    }
+    path = os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{commit[:12]}_{metadata['rows']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, default=str)
+    log.info(f"💾 Benchmark results saved to {path}")
+    return path
+
+
+def compare(baseline_path, current_path, threshold_pct=10.0, min_seconds=0.05):
+    """
+    Print per-validator deltas; returns the validators slower by more than threshold_pct.
+    Runs shorter than min_seconds are reported but never flagged (timer noise).
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(current_path, encoding="utf-8") as f:
+        current = json.load(f)
+
+    def key(r):
+        return f"{r['validator']} [{'/'.join(r['sections'])}]"
+
+    before = {key(r): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'Validator':<75} {'Base s':>9} {'Now s':>9} {'Δ %':>8} {'Peak MB':>9}")
+    for r in current["results"]:
+        old = before.get(key(r))
+        if old is None or not old["seconds"]:
+            print(f"{key(r):<75} {'-':>9} {r['seconds']:>9} {'new':>8} {r['peak_memory_mb'] or '-':>9}")
+            continue
+        delta = (r["seconds"] - old["seconds"]) / old["seconds"] * 100
+        flag = ""
+        if delta > threshold_pct and r["seconds"] >= min_seconds:
+            regressions.append({"validator": key(r), "baseline_s": old["seconds"],
+                                "current_s": r["seconds"], "delta_pct": round(delta, 1)})
+            flag = "  ❌"
+        print(f"{key(r):<75} {old['seconds']:>9} {r['seconds']:>9} {delta:>7.1f}% "
+              f"{r['peak_memory_mb'] or '-':>9}{flag}")
+    print(f"\nBaseline {baseline['commit'][:12]} vs current {current['commit'][:12]}: "
+          f"{len(regressions)} regression(s) above {threshold_pct}%")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every validator against local DuckDB databases")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000],
+                        help="patient rows to simulate, one run per size (10000 .. 10000000)")
+    parser.add_argument("--defect-rate", type=float, help="same rate for every defect kind")
+    parser.add_argument("--rate", nargs=2, action="append", metavar=("DEFECT", "RATE"), default=[],
+                        help=f"override one rate; defects: {', '.join(DEFAULT_RATES)}")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default="SOURCEDB,STAGEDB,TARGETDB",
+                        help="sections for the single-database validators")
+    parser.add_argument("--only", nargs="*", help="smoke-suite names of the validators to run")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no peak memory)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--baseline", help="result file to compare this run against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="ignore regressions on faster runs")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold, args.min_seconds) else 0)
+
+    sections = [s.strip().upper() for s in args.db.split(",") if s.strip()]
+    rates = {k: args.defect_rate for k in DEFAULT_RATES} if args.defect_rate is not None else {}
+    rates.update({k: float(v) for k, v in args.rate})
+    regressed = False
+    for rows in args.rows:
+        from utils import duckdb_engine
+        duckdb_engine.reset()
+        metadata = ETLSimulator(rows, os.path.join("benchmarks", "data"), rates, seed=args.seed).build()
+        results = run(sections, args.only, not args.no_memory)
+        detection_summary(results)
+        path = save(results, metadata)
+        if args.baseline:
+            regressed |= bool(compare(args.baseline, path, args.threshold, args.min_seconds))
+    sys.exit(1 if regressed else 0)
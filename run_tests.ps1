@@ -1,5 +1,5 @@
 param(
-    [string]$db = "SOURCEDB"   # default DB if not provided
+    [string]$db = "SOURCEDB"   # default DB if not provided; "all" or "SOURCEDB,STAGEDB" for several in one run
 )
 
 # ==============================
@@ -1,5 +1,6 @@
 import logging
 import pandas as pd
+from utils.workbook_cache import read_sheet
 import configparser
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -12,7 +13,7 @@ class ColumnNameValidation:
         self.excel_path = self.config.get("PATHS", "excel_file_path")
 
     def run(self, source_db, target_db, report_helper, schema="dbo"):
-        df = pd.read_excel(self.excel_path, sheet_name="Table_Mapping")
+        df = read_sheet(self.excel_path, sheet_name="Table_Mapping")
 
         results = []
         failed_checks = []
@@ -26,7 +27,7 @@ class ColumnNameValidation:
                 continue
 
             # Fetch columns from Source
-            src_cols = source_db.execute_query(f"""
+            src_cols = source_db.execute_cached(f"""
                 SELECT COLUMN_NAME
                 FROM INFORMATION_SCHEMA.COLUMNS
                 WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{source_table}'
@@ -34,7 +35,7 @@ class ColumnNameValidation:
             """)
 
             # Fetch columns from Target
-            tgt_cols = target_db.execute_query(f"""
+            tgt_cols = target_db.execute_cached(f"""
                 SELECT COLUMN_NAME
                 FROM INFORMATION_SCHEMA.COLUMNS
                 WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{target_table}'
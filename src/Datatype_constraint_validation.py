@@ -89,14 +89,13 @@ class DataTypeValidation:
         return metadata
 
     def run(self):
-        df = self.df.copy()
-        
         results = []
+        db_columns = {}   # table → {column: metadata}, one metadata query per table
 
-        for _, row in df.iterrows():
-            table = row["table_name"]
-            column = row["column_name"]
-            expected_dtype = str(row["Data_Type"]).strip().upper()
+        for rule in self.config_loader.rules.rules:
+            table = rule.table
+            column = rule.column
+            expected_dtype = rule.data_type
             # expected_constraint = str(row["Constraints"]).strip().upper()
             
             # ✅ Handle NaN or blank constraint values as NULL
@@ -107,12 +106,13 @@ class DataTypeValidation:
             #     expected_constraint = str(expected_constraint).strip().upper()
         #___________________________________________________________________________    
             # 🔹 Normalize Excel constraints (covers blank, single, multiple)
-            expected_constraints = self._normalize_constraints(row.get("Constraints"), source="Excel")
+            expected_constraints = self._normalize_constraints(rule.constraints, source="Excel")
 
         #___________________________________________________________________________
 
-            db_meta = self.get_db_metadata(table)
-            db_cols = [col["COLUMN_NAME"] for col in db_meta]
+            if table not in db_columns:
+                db_columns[table] = {col["COLUMN_NAME"]: col for col in self.get_db_metadata(table)}
+            db_cols = db_columns[table]
 
             if column not in db_cols:
                 results.append({
@@ -127,7 +127,7 @@ class DataTypeValidation:
                 continue
 
             # get db column details
-            db_col = next(c for c in db_meta if c["COLUMN_NAME"] == column)
+            db_col = db_cols[column]
             db_dtype = db_col["DATA_TYPE"].upper()
             # db_constraint = db_col["CONSTRAINTS"].upper() if db_col["CONSTRAINTS"] else "NULL"
             db_constraints = self._normalize_constraints(db_col.get("CONSTRAINTS"), source="DB")
@@ -1,6 +1,8 @@
 import logging
 import pandas as pd
+from utils.workbook_cache import read_sheet
 import time
+from utils.etl_audit_snapshot import ETLAuditSnapshot
 
 class Process_vs_Detail_log_Validation:
     def __init__(self, config_loader):
@@ -11,7 +13,7 @@ class Process_vs_Detail_log_Validation:
         # Get excel_file_path from config.ini via config_loader
         try:
             excel_file_path = config_loader.config.get("PATHS", "excel_file_path")
-            self.excel_df = pd.read_excel(
+            self.excel_df = read_sheet(
                 excel_file_path,
                 sheet_name="Audit_tables",
                 engine="openpyxl"
@@ -27,31 +29,17 @@ class Process_vs_Detail_log_Validation:
         start_time = time.time()
 
         for _, row in self.excel_df.iterrows():
-            ETL_Process_Log = str(row["Audit_table_1"]).strip()
-            ETL_Detail_Process_Log = str(row["Audit_table_2"]).strip()
-            Common_Cols = [col.strip() for col in str(row["Common_Column"]).split(",") if col.strip()]
-
-            if len(Common_Cols) < 2:
-                logging.error(f"❌ Common_Column must have at least 2 columns (ProcessLogId, ComponentName). Got: {Common_Cols}")
+            try:
+                # 1️⃣ Latest ETL_Process_Log entry per component + detail counts, in one query
+                # (shared with ETLLog_Validation when both run against the same tables)
+                snapshot = ETLAuditSnapshot.for_audit_row(self.db, row)
+            except ValueError as e:
+                logging.error(f"❌ {e}")
                 continue
 
-            processlog_id_col = Common_Cols[0]  # ProcessLogId
-            group_by_col = Common_Cols[1]      # ComponentName
-
             try:
-                # 1️⃣ Get latest entry from ETL_Process_Log grouped by component
-                process_log_query = f"""
-                    SELECT T.*
-                    FROM {ETL_Process_Log} T
-                    WHERE {processlog_id_col} IN (
-                        SELECT MAX({processlog_id_col})
-                        FROM {ETL_Process_Log}
-                        GROUP BY {group_by_col}
-                    )
-                """
-
-                process_df = pd.read_sql(process_log_query, self.db.conn)
-                process_log_dfs[ETL_Process_Log] = process_df.copy()
+                process_df = snapshot.process_rows()
+                process_log_dfs[snapshot.process_log] = process_df.copy()
 
                 if process_df.empty:
                     results.append({
@@ -65,42 +53,29 @@ class Process_vs_Detail_log_Validation:
                     })
                     continue
 
-                for _, prow in process_df.iterrows():
-                    row_dict = prow.to_dict()
-                    process_id = row_dict.get(processlog_id_col)
-                    component_name = row_dict.get(group_by_col)
+                # First detail row of every latest process (one query, only needed for FAILED runs)
+                first_details = {}
+                if (process_df.get("Status", pd.Series(dtype=str)).astype(str).str.upper() == "FAILED").any():
+                    first_details, detail_df = snapshot.first_rows("detail")
+                    detail_log_dfs[snapshot.detail_log] = detail_df.copy()
+
+                for row_dict in process_df.to_dict("records"):
+                    process_id = row_dict.get(snapshot.id_col)
+                    component_name = row_dict.get(snapshot.component_col)
                     log_status = str(row_dict.get("Status", "")).upper()
+                    detail_count = row_dict.get("Detail_Count", 0)
 
                     detail_present, detail_info = None, None
 
                     # 2️⃣ SUCCESS → detail log should exist (NO missing details)
                     if log_status == "SUCCESS":
-                        detail_log_query = f"""
-                            SELECT *
-                            FROM {ETL_Detail_Process_Log}
-                            WHERE {processlog_id_col} = ?
-                              AND {group_by_col} = ?
-                        """
-                        detail_df = pd.read_sql(detail_log_query, self.db.conn, params=[process_id, component_name])
-                        detail_log_dfs[ETL_Detail_Process_Log] = detail_df.copy()
-
-                        detail_present = "YES" if not detail_df.empty else "NO"
+                        detail_present = "YES" if detail_count > 0 else "NO"
 
                     # 3️⃣ FAILED → detail log must also have error details
                     elif log_status == "FAILED":
-                        detail_log_query = f"""
-                            SELECT *
-                            FROM {ETL_Detail_Process_Log}
-                            WHERE {processlog_id_col} = ?
-                              AND {group_by_col} = ?
-                            ORDER BY {processlog_id_col} DESC
-                        """
-                        detail_df = pd.read_sql(detail_log_query, self.db.conn, params=[process_id, component_name])
-                        detail_log_dfs[ETL_Detail_Process_Log] = detail_df.copy()
-
-                        if not detail_df.empty:
+                        if detail_count > 0:
                             detail_present = "YES"
-                            first_row = detail_df.iloc[0].to_dict()
+                            first_row = first_details.get((process_id, component_name), {})
                             detail_info = f"DetailID={first_row.get('DetailID')}, Message={first_row.get('DetailMessage')}"
                         else:
                             detail_present = "NO"
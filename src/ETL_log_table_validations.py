@@ -1,6 +1,8 @@
 import logging
 import pandas as pd
+from utils.workbook_cache import read_sheet
 import time
+from utils.etl_audit_snapshot import ETLAuditSnapshot
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -13,7 +15,7 @@ class ETLLog_Validation:
         # Get excel_file_path from config.ini via config_loader
         try:
             excel_file_path = config_loader.config.get("PATHS", "excel_file_path")
-            self.excel_df = pd.read_excel(
+            self.excel_df = read_sheet(
                 excel_file_path,
                 sheet_name="Audit_tables",
                 engine="openpyxl"
@@ -29,33 +31,16 @@ class ETLLog_Validation:
         start_time = time.time()
 
         for _, row in self.excel_df.iterrows():
-            ETL_Process_Log = str(row["Audit_table_1"]).strip()
-            ETL_Error_Log = str(row["Audit_table_3"]).strip()
-            
-            # Split Common_Column
-            Common_Cols = [col.strip() for col in str(row["Common_Column"]).split(",") if col.strip()]
-
-            if len(Common_Cols) < 2:
-                logging.error(f"❌ Common_Column must have at least 2 columns (ProcessLogId, ComponentName). Got: {Common_Cols}")
+            try:
+                # 1️⃣ Latest ETL_Process_Log entry per component + error counts, in one query
+                snapshot = ETLAuditSnapshot.for_audit_row(self.db, row)
+            except ValueError as e:
+                logging.error(f"❌ {e}")
                 continue
 
-            processlog_id_col = Common_Cols[0]  # ProcessLogId
-            group_by_col = Common_Cols[1]      # ComponentName
-
             try:
-                # 1️⃣ Get latest entry from ETL_Process_Log grouped by component
-                process_log_query = f"""
-                    SELECT T.*
-                    FROM {ETL_Process_Log} T
-                    WHERE {processlog_id_col} IN (
-                        SELECT MAX({processlog_id_col})
-                        FROM {ETL_Process_Log}
-                        GROUP BY {group_by_col}
-                    )
-                """
-
-                process_df = pd.read_sql(process_log_query, self.db.conn)
-                process_log_dfs[ETL_Process_Log] = process_df.copy()
+                process_df = snapshot.process_rows()
+                process_log_dfs[snapshot.process_log] = process_df.copy()
 
                 if process_df.empty:
                     results.append({
@@ -69,43 +54,29 @@ class ETLLog_Validation:
                     })
                     continue
 
-                # Process each row separately
-                for _, prow in process_df.iterrows():
-                    row_dict = prow.to_dict()
-                    process_id = row_dict.get(processlog_id_col)
-                    component_name = row_dict.get(group_by_col)
+                # First error row of every latest process (one query, only needed for FAILED runs)
+                first_errors = {}
+                if (process_df.get("Status", pd.Series(dtype=str)).astype(str).str.upper() == "FAILED").any():
+                    first_errors, error_df = snapshot.first_rows("error")
+                    error_log_dfs[snapshot.error_log] = error_df.copy()
+
+                for row_dict in process_df.to_dict("records"):
+                    process_id = row_dict.get(snapshot.id_col)
+                    component_name = row_dict.get(snapshot.component_col)
                     log_status = str(row_dict.get("Status", "")).upper()
+                    error_count = row_dict.get("Error_Count", 0)
 
                     error_present, error_details = None, None
 
                     # 2️⃣ Case 1: SUCCESS → error log must be empty
                     if log_status == "SUCCESS":
-                        error_log_query = f"""
-                            SELECT *
-                            FROM {ETL_Error_Log}
-                            WHERE {processlog_id_col} = ?
-                            AND {group_by_col} = ?
-                        """
-                        error_df = pd.read_sql(error_log_query, self.db.conn, params=[process_id, component_name])
-                        error_log_dfs[ETL_Error_Log] = error_df.copy()
-
-                        error_present = "YES" if not error_df.empty else "NO"
+                        error_present = "YES" if error_count > 0 else "NO"
 
                     # 3️⃣ Case 2: FAILED → error log must contain at least one entry
                     elif log_status == "FAILED":
-                        error_log_query = f"""
-                            SELECT *
-                            FROM {ETL_Error_Log}
-                            WHERE {processlog_id_col} = ?
-                            AND {group_by_col} = ?
-                            ORDER BY {processlog_id_col} DESC
-                        """
-                        error_df = pd.read_sql(error_log_query, self.db.conn, params=[process_id, component_name])
-                        error_log_dfs[ETL_Error_Log] = error_df.copy()
-
-                        if not error_df.empty:
+                        if error_count > 0:
                             error_present = "YES"
-                            first_row = error_df.iloc[0].to_dict()
+                            first_row = first_errors.get((process_id, component_name), {})
                             error_details = f"ErrorID={first_row.get('ErrorID')}, Message={first_row.get('ErrorMessage')}"
                         else:
                             error_present = "NO"
@@ -1,5 +1,8 @@
 import logging
 import pandas as pd
+from utils.workbook_cache import read_sheet
+from utils.violation_budget import ViolationBudget
+from utils.query_timeout import QueryTimeoutError
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -8,11 +11,12 @@ class ReferentialIntegrity_Validation:
         self.config_loader = config_loader
         self.db = config_loader.db     # ✅ Only check in Target DB
         self.report_helper = config_loader.report_helper
+        self.violation_budget = ViolationBudget(config_loader.config_path)
 
         # Get excel_file_path from config.ini via config_loader
         try:
             excel_file_path = config_loader.config.get("PATHS", "excel_file_path")
-            self.excel_df = pd.read_excel(
+            self.excel_df = read_sheet(
                 excel_file_path,
                 sheet_name="Referential Integrity Check",
                 engine="openpyxl"
@@ -52,14 +56,27 @@ class ReferentialIntegrity_Validation:
               AND a.{child_column} IS NOT NULL;
             """
 
-            cursor = self.db.conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            columns = [col[0] for col in cursor.description]
-            cursor.close()
-
-            invalid_rows = [dict(zip(columns, r)) for r in rows]
-            invalid_count = len(invalid_rows)
+            # ⏱️ Orphans are collected up to the row's Violation_Budget when [VIOLATION_BUDGET] is enabled
+            budget = self.violation_budget.budget(row)
+            try:
+                # Exact count + bounded sample of the orphans ([DETAILS]), optionally all of them in Parquet
+                details, invalid_count, reached, exact = self.violation_budget.fetch(
+                    self.db, query, budget, name=f"RI_{child_table}_{child_column}")
+            except QueryTimeoutError as e:
+                # ⏱️ Cancelled by [TIMEOUTS]: record it and move on to the next relationship
+                results.append({
+                    "Database": self.db.database,
+                    "Parent_Table": parent_table,
+                    "Parent_Column": parent_column,
+                    "Child_Table": child_table,
+                    "Child_Column": child_column,
+                    "Invalid_Count": None,
+                    "IsCheckPassed": "TIMEOUT",
+                    "Count_Exact": f"TIMEOUT after {e.seconds:g}s",
+                    "Details_Captured": None,
+                    "Details": None
+                })
+                continue
 
             results.append({
                 "Database": self.db.database,
@@ -69,7 +86,9 @@ class ReferentialIntegrity_Validation:
                 "Child_Column": child_column,
                 "Invalid_Count": invalid_count,
                 "IsCheckPassed": "PASS" if invalid_count == 0 else "FAIL",
-                "Details": invalid_rows if invalid_count > 0 else None
+                "Count_Exact": self.violation_budget.label(budget, reached, exact),
+                "Details_Captured": details.summary(),
+                "Details": details if invalid_count > 0 else None
             })
 
             logging.info(f"RI Check: {child_table}.{child_column} → {parent_table}.{parent_column} | Invalid = {invalid_count}")
@@ -83,8 +102,8 @@ class ReferentialIntegrity_Validation:
             summary_df.drop(columns=["Details"], errors="ignore").to_excel(writer, sheet_name="Summary", index=False)
 
             for r in results:
-                if r.get("Invalid_Count", 0) > 0 and r.get("Details") is not None:
-                    details_df = pd.DataFrame(r["Details"])
+                if (r.get("Invalid_Count") or 0) > 0 and r.get("Details") is not None:
+                    details_df = r["Details"].frame()
                     if not details_df.empty:
                         sheet_name = f"{r['Child_Table']}_FKCheck"[:31]
                         details_df.to_excel(writer, sheet_name=sheet_name, index=False)
@@ -1,5 +1,6 @@
 import logging
 import pandas as pd
+from utils.workbook_cache import read_sheet
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -16,7 +17,7 @@ class CountValidation:
         # Load Excel sheet from config
         try:
             excel_file_path = config_loader.config.get("PATHS", "excel_file_path")
-            self.excel_df = pd.read_excel(
+            self.excel_df = read_sheet(
                 excel_file_path,
                 sheet_name="Table_Mapping",   # ✅ Count check sheet
                 engine="openpyxl"
@@ -1,6 +1,10 @@
 import logging
-import pandas as pd
+from utils.workbook_cache import read_sheet
 import configparser
+from utils.result_cache import ResultCache
+from utils.violation_budget import ViolationBudget
+from utils.query_timeout import QueryTimeoutError
+from utils.checksum_gate import ChecksumGate
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -12,10 +16,13 @@ class Validation_SourceToStage:
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
         self.excel_path = self.config.get("PATHS", "excel_file_path")
+        self.result_cache = ResultCache(config_path)
+        self.violation_budget = ViolationBudget(config_path)
+        self.checksum_gate = ChecksumGate(config_path)
 
     def get_common_columns(self, source_db, stage_db, source_table, stage_table):
         """Get common column names between source and stage tables."""
-        src_cols = source_db.execute_query(    
+        src_cols = source_db.execute_cached(    
             f"""
             SELECT COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
@@ -25,7 +32,7 @@ class Validation_SourceToStage:
         logging.info(f"Source columns for {source_table}: {src_cols}")
         src_cols = [col[0] for col in src_cols]      
 
-        stg_cols = stage_db.execute_query(    
+        stg_cols = stage_db.execute_cached(    
             f"""
             SELECT COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
@@ -41,8 +48,9 @@ class Validation_SourceToStage:
         
         return ", ".join(common_quoted)
 
-    def run(self, source_db, stage_db, report_helper):
-        df = pd.read_excel(self.excel_path, sheet_name="Table_Mapping")
+    def run(self, source_db, stage_db, report_helper, mapping_df=None):
+        # mapping_df: subset of Table_Mapping (e.g. one ETL component's tables in watch mode)
+        df = mapping_df if mapping_df is not None else read_sheet(self.excel_path, sheet_name="Table_Mapping")
         
         results = []
         failed_checks = []  # track failures
@@ -57,21 +65,52 @@ class Validation_SourceToStage:
             # ✅ Assertion: must have common columns
             assert common_columns, f"❌ No common columns found for {source_table} ↔ {stage_table}"
 
-            completeness_query = f"""
-                SELECT COUNT(*) AS Missing_Count
-                FROM (
+            # Rows of source missing in stage (counted exactly, or up to the row's Violation_Budget)
+            missing_rows_query = f"""
                     SELECT {common_columns} 
                     FROM {self.config.get("SOURCEDB", "database")}.dbo.{source_table}
                     EXCEPT
                     SELECT {common_columns} 
                     FROM {self.config.get("STAGEDB", "database")}.dbo.{stage_table}
-                ) AS diff
             """
                 
-            logging.info(f"Running completeness check: {source_table} → {stage_table}")
-            raw_result = source_db.execute_query(completeness_query)
+            # ♻️ Reuse last verdict if neither table has changed (column order is not stable, so sort it)
+            rule = sorted(common_columns.split(", "))
+            sources = [(source_db, source_table), (stage_db, stage_table)]
+            cached = self.result_cache.lookup("Data_Completeness_Source_to_Stage", rule, sources)
+            if cached is not None:
+                results.append(cached)
+                if not cached["IsCheckPassed"]:
+                    failed_checks.append(f"❌ Data completeness check failed for {source_table} ↔ {stage_table}. Missing rows = {cached['Data_Missing_Count']} (cached)")
+                continue
 
-            missing_count = raw_result[0][0] if raw_result else 0
+            logging.info(f"Running completeness check: {source_table} → {stage_table}")
+            # ⏱️ TOP (n) probe when [VIOLATION_BUDGET] is enabled: stops at the first n missing rows
+            budget = self.violation_budget.budget(row)
+            try:
+                # ⚡ Equal fingerprints (count + checksums, one scan per side) → PASS without the EXCEPT
+                gate = self.checksum_gate.compare_tables(
+                    (source_db, self.config.get("SOURCEDB", "database"), source_table, ""),
+                    (stage_db, self.config.get("STAGEDB", "database"), stage_table, ""), common_columns)
+                if gate == "MATCH":
+                    missing_count, reached, exact = 0, False, True
+                else:
+                    missing_count, reached, exact = self.violation_budget.count(source_db, missing_rows_query, budget)
+            except QueryTimeoutError as e:
+                # ⏱️ Cancelled by [TIMEOUTS]: record it (not cached) and move on to the next mapping
+                results.append({
+                    "Source_DB": self.config.get("SOURCEDB", "database"),
+                    "Source_Table": source_table,
+                    "Stage_DB": self.config.get("STAGEDB", "database"),
+                    "Stage_Table": stage_table,
+                    "Common_Columns": common_columns,
+                    "Data_Missing_Count": "TIMEOUT",
+                    "IsCheckPassed": False,
+                    "Count_Exact": f"TIMEOUT after {e.seconds:g}s",
+                    "Cached": "NO"
+                })
+                failed_checks.append(f"❌ Data completeness check timed out for {source_table} ↔ {stage_table} after {e.seconds:g}s")
+                continue
 
             # ✅ Assertion: missing count should be 0
             # assert missing_count == 0, (
@@ -88,8 +127,12 @@ class Validation_SourceToStage:
                 "Stage_Table": stage_table,
                 "Common_Columns": common_columns,
                 "Data_Missing_Count": missing_count,
-                "IsCheckPassed": is_check_passed
+                "IsCheckPassed": is_check_passed,
+                "Count_Exact": self.violation_budget.label(budget, reached, exact),
+                "Checksum_Gate": gate,
+                "Cached": "NO"
             })
+            self.result_cache.store("Data_Completeness_Source_to_Stage", rule, sources, results[-1])
 
             if not is_check_passed:
                 failed_checks.append(f"❌ Data completeness check failed for {source_table} ↔ {stage_table}. Missing rows = {missing_count}")
@@ -97,6 +140,7 @@ class Validation_SourceToStage:
             # assert is_check_passed, f"❌ Data completeness check failed for {source_table} ↔ {stage_table}"
 
         # ✅ Save & print report
+        self.result_cache.flush()
         report_helper.save_report(results, test_type="Data_Completeness_Source_to_Stage")
         # report_helper.print_validation_report_Source_to_Stage(results)
 
@@ -113,10 +157,13 @@ class Validation_StageToTarget:
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
         self.excel_path = self.config.get("PATHS", "excel_file_path")
+        self.result_cache = ResultCache(config_path)
+        self.violation_budget = ViolationBudget(config_path)
+        self.checksum_gate = ChecksumGate(config_path)
 
     def get_common_columns(self,stage_db, target_db, stage_table, target_table):
         """Get common column names between source and stage tables."""
-        stg_cols = stage_db.execute_query(
+        stg_cols = stage_db.execute_cached(
             f"""
             SELECT COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
@@ -126,7 +173,7 @@ class Validation_StageToTarget:
         logging.info(f"Stage columns for {stage_table}: {stg_cols}")
         stg_cols = [col[0] for col in stg_cols]      
         
-        trg_cols = target_db.execute_query(
+        trg_cols = target_db.execute_cached(
             f"""
             SELECT COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
@@ -144,8 +191,9 @@ class Validation_StageToTarget:
         
         return ", ".join(common_quoted)
 
-    def run(self, stage_db, target_db, report_helper):
-        df = pd.read_excel(self.excel_path, sheet_name="Table_Mapping")
+    def run(self, stage_db, target_db, report_helper, mapping_df=None):
+        # mapping_df: subset of Table_Mapping (e.g. one ETL component's tables in watch mode)
+        df = mapping_df if mapping_df is not None else read_sheet(self.excel_path, sheet_name="Table_Mapping")
 
         results = []
         failed_checks = []  # track failures
@@ -164,20 +212,51 @@ class Validation_StageToTarget:
 
             assert common_columns, f"❌ No common columns found for {stage_table} ↔ {target_table}"
 
-            completeness_query = f"""
-                SELECT COUNT(*) AS Missing_Count
-                FROM (
+            # Rows of stage missing in target (counted exactly, or up to the row's Violation_Budget)
+            missing_rows_query = f"""
                     SELECT {common_columns} FROM {self.config.get("STAGEDB", "database")}.dbo.{stage_table}
                     EXCEPT
                     SELECT {common_columns} FROM {self.config.get("TARGETDB", "database")}.dbo.{target_table}
-                ) AS diff
             """
                 
 
-            logging.info(f"Running completeness check: {stage_table} → {target_table}")
-            raw_result = stage_db.execute_query(completeness_query)
+            # ♻️ Reuse last verdict if neither table has changed (column order is not stable, so sort it)
+            rule = sorted(common_columns.split(", "))
+            sources = [(stage_db, stage_table), (target_db, target_table)]
+            cached = self.result_cache.lookup("Data_Completeness_Stage_to_Target", rule, sources)
+            if cached is not None:
+                results.append(cached)
+                if not cached["IsCheckPassed"]:
+                    failed_checks.append(f"❌ Data completeness check failed for {stage_table} ↔ {target_table}. Missing rows = {cached['Data_Missing_Count']} (cached)")
+                continue
 
-            missing_count = raw_result[0][0] if raw_result else 0
+            logging.info(f"Running completeness check: {stage_table} → {target_table}")
+            # ⏱️ TOP (n) probe when [VIOLATION_BUDGET] is enabled: stops at the first n missing rows
+            budget = self.violation_budget.budget(row)
+            try:
+                # ⚡ Equal fingerprints (count + checksums, one scan per side) → PASS without the EXCEPT
+                gate = self.checksum_gate.compare_tables(
+                    (stage_db, self.config.get("STAGEDB", "database"), stage_table, ""),
+                    (target_db, self.config.get("TARGETDB", "database"), target_table, ""), common_columns)
+                if gate == "MATCH":
+                    missing_count, reached, exact = 0, False, True
+                else:
+                    missing_count, reached, exact = self.violation_budget.count(stage_db, missing_rows_query, budget)
+            except QueryTimeoutError as e:
+                # ⏱️ Cancelled by [TIMEOUTS]: record it (not cached) and move on to the next mapping
+                results.append({
+                    "Stage_DB": self.config.get("STAGEDB", "database"),
+                    "Stage_Table": stage_table,
+                    "Target_DB": self.config.get("TARGETDB", "database"),
+                    "Target_Table": target_table,
+                    "Common_Columns": common_columns,
+                    "Data_Missing_Count": "TIMEOUT",
+                    "IsCheckPassed": False,
+                    "Count_Exact": f"TIMEOUT after {e.seconds:g}s",
+                    "Cached": "NO"
+                })
+                failed_checks.append(f"❌ Data completeness check timed out for {stage_table} ↔ {target_table} after {e.seconds:g}s")
+                continue
 
             # assert missing_count == 0, (
             #     f"❌ Data completeness check failed for {stage_table} ↔ {target_table}. "
@@ -193,8 +272,12 @@ class Validation_StageToTarget:
                 "Target_Table": target_table,
                 "Common_Columns": common_columns,
                 "Data_Missing_Count": missing_count,
-                "IsCheckPassed": is_check_passed
+                "IsCheckPassed": is_check_passed,
+                "Count_Exact": self.violation_budget.label(budget, reached, exact),
+                "Checksum_Gate": gate,
+                "Cached": "NO"
             })
+            self.result_cache.store("Data_Completeness_Stage_to_Target", rule, sources, results[-1])
 
             if not is_check_passed:
                 failed_checks.append(f"❌ Data completeness check failed for {stage_table} ↔ {target_table}. Missing rows = {missing_count}")
@@ -202,6 +285,7 @@ class Validation_StageToTarget:
             # assert is_check_passed, f"❌ Data completeness check failed for {stage_table} ↔ {target_table}"
 
         # ✅ Save & print report
+        self.result_cache.flush()
         report_helper.save_report(results, test_type="Data_Completeness_Stage_to_Target")
         # self.report_helper.print_validation_report_Stage_to_Target(results)
 
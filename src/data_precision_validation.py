@@ -42,16 +42,17 @@ class DataPrecisionValidation:
         return metadata
 
     def run(self):
-        df = self.df.copy()
         results = []
+        db_columns = {}   # table → {column: metadata}, one metadata query per table
 
-        for _, row in df.iterrows():
-            table = row["table_name"]
-            column = row["column_name"]
-            expected_dtype = str(row["Data_Type"]).strip().upper()
+        for rule in self.config_loader.rules.rules:
+            table = rule.table
+            column = rule.column
+            expected_dtype = rule.data_type
 
-            db_meta = self.get_db_metadata(table)
-            db_cols = [col["COLUMN_NAME"] for col in db_meta]
+            if table not in db_columns:
+                db_columns[table] = {col["COLUMN_NAME"]: col for col in self.get_db_metadata(table)}
+            db_cols = db_columns[table]
 
             if column not in db_cols:
                 results.append({
@@ -63,7 +64,7 @@ class DataPrecisionValidation:
                 })
                 continue
 
-            db_col = next(c for c in db_meta if c["COLUMN_NAME"] == column)
+            db_col = db_cols[column]
             db_dtype = db_col["DATA_TYPE"].upper()
             db_precision = db_col.get("PRECISION")
             db_maxlen = db_col.get("MAX_LENGTH")
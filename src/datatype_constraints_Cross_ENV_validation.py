@@ -1,5 +1,5 @@
 import logging
-import pandas as pd
+from utils.workbook_cache import read_sheet
 import configparser
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -14,7 +14,7 @@ class DC_Validation_SourceToStage:
 
     # def run(self, source_db, stage_db, source_table, stage_table, report_helper):
     def run(self, source_db, stage_db, report_helper):    
-        df = pd.read_excel(self.excel_path, sheet_name="Table_Mapping")
+        df = read_sheet(self.excel_path, sheet_name="Table_Mapping")
         
         results = []
         failed_checks = []  # track failures
@@ -24,13 +24,13 @@ class DC_Validation_SourceToStage:
             stage_table = row["stage_table"]
 
             # Fetch metadata from Source & Stage
-            src_meta = source_db.execute_query(f"""
+            src_meta = source_db.execute_cached(f"""
                 SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE
                 FROM INFORMATION_SCHEMA.COLUMNS
                 WHERE TABLE_NAME = '{source_table}'
             """)
 
-            stg_meta = stage_db.execute_query(f"""
+            stg_meta = stage_db.execute_cached(f"""
                 SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE
                 FROM INFORMATION_SCHEMA.COLUMNS
                 WHERE TABLE_NAME = '{stage_table}'
@@ -86,7 +86,7 @@ class DC_Validation_SourceToTarget:
 
     # def run(self, source_db, target_db, source_table, target_table, report_helper):
     def run(self, source_db, target_db, report_helper):
-        df = pd.read_excel(self.excel_path, sheet_name="Table_Mapping")
+        df = read_sheet(self.excel_path, sheet_name="Table_Mapping")
         
         results = []
         failed_checks = []  # track failures
@@ -96,13 +96,13 @@ class DC_Validation_SourceToTarget:
             target_table = row["target_table"]
 
             # Fetch metadata from Source & Target
-            src_meta = source_db.execute_query(f"""
+            src_meta = source_db.execute_cached(f"""
                 SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE
                 FROM INFORMATION_SCHEMA.COLUMNS
                 WHERE TABLE_NAME = '{source_table}'
             """)
 
-            tgt_meta = target_db.execute_query(f"""
+            tgt_meta = target_db.execute_cached(f"""
                 SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE
                 FROM INFORMATION_SCHEMA.COLUMNS
                 WHERE TABLE_NAME = '{target_table}'
@@ -1,6 +1,7 @@
 import logging
 import pandas as pd
 from datetime import datetime
+from utils.sampling_helper import SamplingHelper
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -10,6 +11,8 @@ class DateFieldValidation:
         self.db = config_loader.db
         self.df = config_loader.df
         self.report_helper = config_loader.report_helper
+        self.result_cache = config_loader.result_cache
+        self.sampling = SamplingHelper(config_loader.config_path)
 
     def get_date_columns(self, table_name, schema="dbo"):
         """Fetch all date/datetime/datetime2 columns for a given table."""
@@ -66,9 +69,9 @@ class DateFieldValidation:
 
         failed_checks = []
 
-        # ✅ If user didn't pass tables, fallback to Excel sheet (self.df)
-        if tables is None and "table_name" in self.df.columns:
-            tables = self.df["table_name"].dropna().tolist()
+        # ✅ If user didn't pass tables, fallback to the tables of the Excel sheet (once each)
+        if tables is None:
+            tables = self.config_loader.rules.tables
 
         for table in tables:
             date_columns = self.get_date_columns(table, schema)
@@ -76,18 +79,49 @@ class DateFieldValidation:
                 logging.info(f"ℹ No date columns found in {schema}.{table}")
                 continue
 
+            plan = self.sampling.plan_for_table(self.db, self.config_loader.rules.frame(table), table)
+
             for col in date_columns:
                 query = f"SELECT {col} FROM {schema}.{table}"
-                values = [v[0] for v in self.db.execute_query(query) if v[0] is not None]
-                invalid_dates = [v for v in values if not self.validate_date(v)]
+                rule = [query, plan.label if plan else None]
+
+                # ♻️ Reuse last verdict if the table has not changed
+                cached = self.result_cache.lookup("Date_Field_Check", rule, [(self.db, f"{schema}.{table}")])
+                if cached is not None:
+                    results.append(cached)
+                    if not cached["IsCheckPassed"]:
+                        failed_checks.append(f"❌ Date field check failed for {table}.{col} → Invalid count: {cached['Invalid_Count']} (cached)")
+                    continue
+
+                # 🎯 Validate a sample first; escalate to the full column when it finds bad dates
+                sample = None
+                if plan is not None:
+                    source, predicate = self.sampling.sampled_from(plan)
+                    sample_query = f"SELECT {col} FROM {schema}.{source}" + (f" WHERE {predicate}" if predicate else "")
+                    logging.info(f"Sampling {schema}.{table}.{col} → {plan.label}")
+                    values = [v[0] for v in self.db.execute_query(sample_query) if v[0] is not None]
+                    invalid_dates = [v for v in values if not self.validate_date(v)]
+                    sample = (len(values), len(invalid_dates))
+
+                if sample is None or (sample[1] > 0 and self.sampling.escalate):
+                    values = [v[0] for v in self.db.execute_query(query) if v[0] is not None]
+                    invalid_dates = [v for v in values if not self.validate_date(v)]
 
                 results.append({
                     "Database": self.db.database,
                     "Table": f"{schema}.{table}",
                     "Column": col,
                     "Invalid_Count": len(invalid_dates),
-                    "IsCheckPassed": (len(invalid_dates) == 0)
+                    "IsCheckPassed": (len(invalid_dates) == 0),
+                    "Cached": "NO"
                 })
+                if sample is None:
+                    self.sampling.not_sampled(results[-1])
+                else:
+                    self.sampling.annotate(results[-1], plan, sample[1], sample[0])
+                    if sample[1] > 0 and self.sampling.escalate:
+                        self.sampling.escalated(results[-1])
+                self.result_cache.store("Date_Field_Check", rule, [(self.db, f"{schema}.{table}")], results[-1])
 
                 logging.info(f"{schema}.{table}.{col} → Invalid Count: {len(invalid_dates)}")
 
@@ -95,6 +129,7 @@ class DateFieldValidation:
                     failed_checks.append(f"❌ Date field check failed for {table}.{col} → Invalid count: {len(invalid_dates)}")
 
         # Save + print reports
+        self.result_cache.flush()
         self.report_helper.save_report(results, test_type="Date_Field_Check")
 
         # ✅ Fail test only at the end (after report generation)
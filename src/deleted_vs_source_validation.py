@@ -1,5 +1,6 @@
 import logging
 import pandas as pd
+from utils.deleted_record_lifecycle import DeletedRecordLifecycle
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 log = logging.getLogger(__name__)
@@ -10,85 +11,46 @@ class DeletedVsSource_Validation:
         self.db = config_loader.db
         self.report_helper = config_loader.report_helper
 
+        # Deleted keys are classified once per deleted_table (shared with DeletedVsTarget / ReAdded)
+        self.lifecycle = DeletedRecordLifecycle(self.db, config_loader.config_path)
         try:
-            excel_file_path = config_loader.config.get("PATHS", "excel_file_path")
-            self.mapping_df = pd.read_excel(
-                excel_file_path, sheet_name="Table_Mapping", engine="openpyxl"
-            )
-            self.source_db_df = pd.read_excel(
-                excel_file_path, sheet_name="SOURCEDB", engine="openpyxl"
-            )
+            self.tables = self.lifecycle.tables()
         except Exception as e:
             logging.error(f"❌ Could not load mapping sheets: {e}")
-            self.mapping_df = pd.DataFrame()
-            self.source_db_df = pd.DataFrame()
-
-
-    def get_composite_keys(self, table_name: str) -> list:
-        try:
-            keys = (
-                self.source_db_df[
-                    (self.source_db_df["table_name"] == table_name)
-                    & (self.source_db_df["Constraints"].str.contains("COMPOSITE KEY", case=False, na=False))
-                ]["column_name"]
-                .tolist()
-            )
-
-            if not keys:
-                logging.warning(f"⚠️ No composite keys found for {table_name}")
-            else:
-                logging.info(f"✅ Composite keys for {table_name}: {keys}")
-
-            return keys
-
-        except Exception as e:
-            logging.error(f"❌ Could not fetch composite keys for {table_name}: {e}")
-            return []
+            self.tables = []
 
 
     def run(self):
         results = []
+        details_dict = {}
 
-        for _, row in self.mapping_df.iterrows():
-            source_table = str(row["source_table"]).strip()
-
-            deleted_table = row.get("deleted_table", "")
-            if pd.isna(deleted_table) or str(deleted_table).strip() == "":
-                continue  # skip if no deleted table
-            deleted_table = str(deleted_table).strip()
-
-
-            keys = self.get_composite_keys(source_table)
+        for entry in self.tables:
+            source_table = entry["source_table"]
+            deleted_table = entry["deleted_table"]
+            keys = entry["source_keys"]
             if not keys:
                 logging.warning(f"⚠️ No composite keys found for {source_table}")
                 continue
 
             try:
-                # Build join condition dynamically
-                src_condition = " AND ".join([f"S.{k}=D.{k}" for k in keys])
+                # 2️⃣ Deleted keys still present in source
+                scan = self.lifecycle.scan(entry)
+                mismatches = scan["counts"]["In_Source"]
 
-
-                # 2️⃣ Deleted vs Source Validation
-                deleted_vs_source = f"""
-                    SELECT D.*
-                    FROM TARGET_DB.dbo.{deleted_table} D
-                    INNER JOIN {source_table} S
-                      ON {src_condition}
-                """
-                source_mismatch = pd.read_sql(deleted_vs_source, self.db.conn)
-
-                status = "PASS"
                 error = None
-                if source_mismatch.empty:
+                if mismatches == 0:
                     status = "PASS"
-                elif not source_mismatch.empty:
+                else:
                     status = "FAIL"
                     error = "Source mismatch: Deleted record still active"
+                    details_dict[f"{source_table}_Mismatches"] = self.lifecycle.samples(scan, "In_Source")
 
                 results.append({
                     "Source_Table": source_table,
                     "Deleted_Table": deleted_table,
                     "Composite_Keys": ",".join(keys),
+                    "Deleted_Keys": scan["counts"]["Deleted_Keys"],
+                    "Mismatch_Count": mismatches,
                     "Validation_Status": status,
                     "Error": error
                 })
@@ -99,11 +61,19 @@ class DeletedVsSource_Validation:
                     "Source_Table": source_table,
                     "Deleted_Table": deleted_table,
                     "Composite_Keys": ",".join(keys),
+                    "Deleted_Keys": None,
+                    "Mismatch_Count": None,
                     "Validation_Status": "ERROR",
                     "Error": str(ex)
                 })
 
         # Save report
-        self.report_helper.save_report(results, test_type="Deleted_Vs_Source_Validation")
+        report_file = self.report_helper.save_report(results, test_type="Deleted_Vs_Source_Validation")
+
+        # Sample keys (at most [DELETED_LIFECYCLE] sample_rows) in separate sheets
+        if details_dict:
+            with pd.ExcelWriter(report_file, mode="a", if_sheet_exists="replace", engine="openpyxl") as writer:
+                for tbl, df in details_dict.items():
+                    df.to_excel(writer, sheet_name=f"{tbl[:25]}", index=False)
 
-        assert results, "❌ Validation returned no results — check Excel sheet or DB connection."
\ No newline at end of file
+        assert results, "❌ Validation returned no results — check Excel sheet or DB connection."
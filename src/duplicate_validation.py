@@ -1,5 +1,7 @@
 import logging
 import pandas as pd
+from utils.violation_budget import ViolationBudget
+from utils.query_timeout import QueryTimeoutError
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -9,28 +11,22 @@ class DuplicateValidation:
         self.db = config_loader.db
         self.df = config_loader.df
         self.report_helper = config_loader.report_helper
+        self.result_cache = config_loader.result_cache
+        self.violation_budget = ViolationBudget(config_loader.config_path)
 
         self.db_name = db_name.upper()
 
     def run(self):
-        df = self.df.copy()
-
         # Filter only Business Key = Y
         # df = df[df["Business Key"].str.upper() == "Y"]
 
-         # ✅ Keep only rows where constraints contain "Composite Key"
-        df["Constraints"] = df["Constraints"].fillna("").str.lower()
-        df = df[df["Constraints"].str.contains("composite key")]
-
-        # Group by table and merge all Y columns into a list
-        grouped = df.groupby("table_name")["column_name"].apply(list).reset_index()
+        # ✅ Composite Key columns per table, prebuilt by ConfigLoader.rules
+        composite_keys = self.config_loader.rules.composite_keys()
         
         results = []
         failed_checks = []
 
-        for _, row in grouped.iterrows():
-            table = row["table_name"]
-            columns = row["column_name"]  
+        for table, columns in composite_keys.items():
             composite_key = ", ".join(columns)
             print("DEBUG composite_key:", composite_key, type(composite_key))
 
@@ -62,12 +58,36 @@ class DuplicateValidation:
                 """
                 # print("DEBUG duplicate_query:", duplicate_query)
 
+            # ♻️ Reuse last verdict if the table has not changed
+            cached = self.result_cache.lookup("Duplicate_Check", duplicate_query, [(self.db, table)])
+            if cached is not None:
+                results.append(cached)
+                if not cached["IsCheckPassed"]:
+                    failed_checks.append(f"{table}.{composite_key} → Duplicate count: {cached['DUPLICATE_Count']} (cached)")
+                continue
+
             logging.info(f"Running query for {table} with key [{composite_key}]")
-            raw_result = self.db.execute_query(duplicate_query)
-            logging.debug(f"Raw DB result for {table}.{composite_key}: {raw_result!r}")
+            # ⏱️ Stops at the first Violation_Budget duplicate groups when [VIOLATION_BUDGET] is enabled
+            budget = self.violation_budget.budget(self.config_loader.rules.frame(table))
+            try:
+                details, duplicate_count, reached, exact = self.violation_budget.fetch(
+                    self.db, duplicate_query, budget, name=f"Duplicate_{table}")
+            except QueryTimeoutError as e:
+                # ⏱️ Cancelled by [TIMEOUTS]: record it and move on to the next table
+                results.append({
+                    "Database": self.db.database,
+                    "Table_name": table,
+                    "Column_names": composite_key,
+                    "DUPLICATE_Count": "TIMEOUT",
+                    "IsCheckPassed": False,
+                    "Count_Exact": f"TIMEOUT after {e.seconds:g}s",
+                    "Cached": "NO"
+                })
+                failed_checks.append(f"{table}.{composite_key} → TIMEOUT after {e.seconds:g}s")
+                continue
+            logging.debug(f"Duplicate groups for {table}.{composite_key}: {details.summary()}")
 
             # ✅ FIX: count duplicate groups correctly
-            duplicate_count = len(raw_result) if raw_result else 0
             is_check_passed = (duplicate_count == 0)
 
             results.append({
@@ -75,8 +95,11 @@ class DuplicateValidation:
                 "Table_name": table,
                 "Column_names": composite_key,   # string, not list
                 "DUPLICATE_Count": duplicate_count,
-                "IsCheckPassed": is_check_passed
+                "IsCheckPassed": is_check_passed,
+                "Count_Exact": self.violation_budget.label(budget, reached, exact),
+                "Cached": "NO"
             })
+            self.result_cache.store("Duplicate_Check", duplicate_query, [(self.db, table)], results[-1])
 
             if not is_check_passed:
                 failed_checks.append(f"{table}.{composite_key} → Duplicate count: {duplicate_count}")
@@ -85,6 +108,7 @@ class DuplicateValidation:
             print(f"{table}.{composite_key} → Duplicate Count:", duplicate_count)
 
         # Save + print reports
+        self.result_cache.flush()
         self.report_helper.save_report(results, test_type="Duplicate_Check")
         # self.report_helper.print_validation_report_Duplicate(results, check_type="Duplicate")
 
@@ -0,0 +1,219 @@
+import time
+import logging
+import argparse
+import configparser
+from datetime import datetime
+import pandas as pd
+from utils.workbook_cache import read_sheet
+from utils.db_helper import DBHelper
+from utils.extract_cache import ExtractCache
+from utils.config_loader import ConfigLoader
+from utils.etl_audit_snapshot import ETLAuditSnapshot
+from src.count_validation import CountValidation
+from src.data_completeness_validation import Validation_SourceToStage, Validation_StageToTarget
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+class ETLAuditWatch:
+    """
+    Long-running watch over ETL_Process_Log (Audit_table_1 of the Audit_tables sheet).
+
+    Each poll reads only rows above the ProcessLogId high-water mark plus the ids still
+    running, so the log is never rescanned. When a component reaches SUCCESS or FAILED:
+      - error / detail log rules (as ETLLog_Validation / Process_vs_Detail_log_Validation)
+      - on SUCCESS, count and completeness checks for the Table_Mapping rows whose optional
+        Component_Name column names the component (comma-separated names allowed)
+    Settings come from the [ETL_AUDIT] section of config.ini.
+    """
+
+    TERMINAL = ("SUCCESS", "FAILED")
+
+    def __init__(self, config_path="config.ini", section_name="TARGETDB"):
+        self.config_path = config_path
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.poll_seconds = config.getfloat("ETL_AUDIT", "watch_poll_seconds", fallback=15)
+        # Startup window (in ids below the current maximum) searched once for runs still in progress
+        self.lookback_ids = config.getint("ETL_AUDIT", "watch_lookback_ids", fallback=1000)
+
+        self.config_loader = ConfigLoader(config_path, section_name=section_name)
+        self.db = self.config_loader.db
+        self.report_helper = self.config_loader.report_helper
+        excel_path = self.config_loader.config.get("PATHS", "excel_file_path")
+
+        self.audits = []
+        for _, row in read_sheet(excel_path, sheet_name="Audit_tables", engine="openpyxl").iterrows():
+            try:
+                self.audits.append(ETLAuditSnapshot.parse_audit_row(row))
+            except ValueError as e:
+                logging.error(f"❌ {e}")
+
+        # Component → Table_Mapping rows it loads
+        self.mapping = read_sheet(excel_path, sheet_name="Table_Mapping", engine="openpyxl")
+        if "Component_Name" not in self.mapping.columns:
+            logging.warning("⚠️ Table_Mapping has no Component_Name column: only error / detail log checks will run")
+
+        self.high_water = {}   # process log table → last ProcessLogId read
+        self.running = {}      # process log table → ids not finished yet
+        self._validators = None
+        self._dbs = {}
+
+    # ------------------------------------------------------------------
+    def _start(self):
+        """High-water mark = current maximum; runs still in progress within the lookback are tracked."""
+        for process_log, _, _, id_col, _ in self.audits:
+            max_id = self.db.execute_query(f"SELECT MAX({id_col}) FROM {process_log}")[0][0] or 0
+            in_progress = self.db.execute_query(
+                f"SELECT {id_col} FROM {process_log} WHERE {id_col} > ? AND UPPER(Status) NOT IN ('SUCCESS', 'FAILED')",
+                max_id - self.lookback_ids
+            ) or []
+            self.high_water[process_log] = max_id
+            self.running[process_log] = {r[0] for r in in_progress}
+            logging.info(f"👀 Watching {process_log} from {id_col} > {max_id} "
+                         f"({len(self.running[process_log])} run(s) in progress)")
+
+    def poll_once(self):
+        """Read new / still-running process rows; returns the rows that just finished."""
+        finished = []
+        for audit in self.audits:
+            process_log, _, _, id_col, _ = audit
+            running = sorted(self.running[process_log])
+            running_filter = f" OR {id_col} IN ({', '.join('?' for _ in running)})" if running else ""
+            df = pd.read_sql(
+                f"SELECT * FROM {process_log} WHERE {id_col} > ?{running_filter} ORDER BY {id_col}",
+                self.db.conn, params=[self.high_water[process_log]] + running
+            )
+            for row in df.to_dict("records"):
+                process_id = row[id_col]
+                self.high_water[process_log] = max(self.high_water[process_log], process_id)
+                if str(row.get("Status", "")).upper() in self.TERMINAL:
+                    self.running[process_log].discard(process_id)
+                    finished.append((audit, row))
+                else:
+                    self.running[process_log].add(process_id)
+        return finished
+
+    # ------------------------------------------------------------------
+    def _log_checks(self, audit, row):
+        """Error / detail log rules for one finished process row (two COUNT queries)."""
+        _, detail_log, error_log, id_col, component_col = audit
+        status = str(row.get("Status", "")).upper()
+        key = (row[id_col], row[component_col])
+        where = f"WHERE {id_col} = ? AND {component_col} = ?"
+        errors = self.db.execute_query(f"SELECT COUNT(*) FROM {error_log} {where}", *key)[0][0]
+        details = self.db.execute_query(f"SELECT COUNT(*) FROM {detail_log} {where}", *key)[0][0]
+
+        error_ok = errors == 0 if status == "SUCCESS" else errors > 0
+        return [
+            ("Error_Log", error_log, error_ok, f"{errors} error row(s) for a {status} run"),
+            ("Detail_Log", detail_log, details > 0, f"{details} detail row(s)"),
+        ]
+
+    def _component_mapping(self, component):
+        if "Component_Name" not in self.mapping.columns:
+            return self.mapping.iloc[0:0]
+        names = self.mapping["Component_Name"].fillna("").astype(str).str.split(",")
+        mask = names.apply(lambda values: component.lower() in [v.strip().lower() for v in values])
+        return self.mapping[mask]
+
+    def _db(self, section):
+        if section not in self._dbs:
+            self._dbs[section] = DBHelper.from_config_section(self.config_path, section)
+            self._dbs[section].connect()
+        return self._dbs[section]
+
+    def _data_checks(self, mapping):
+        """Count and completeness checks limited to the component's tables."""
+        if self._validators is None:
+            self._validators = (CountValidation(self.config_loader),
+                                Validation_SourceToStage(self.config_path),
+                                Validation_StageToTarget(self.config_path))
+        count, source_to_stage, stage_to_target = self._validators
+        tables = ", ".join(mapping["target_table"].astype(str))
+
+        def run(check, fn):
+            try:
+                fn()
+                return (check, tables, True, None)
+            except AssertionError as e:
+                return (check, tables, False, str(e)[:500])
+
+        count.excel_df = mapping
+        checks = [run("Count", count.run)]
+        staged = mapping[mapping["stage_table"].notna() & (mapping["stage_table"].astype(str).str.strip() != "")]
+        if not staged.empty:
+            checks.append(run("Completeness_Source_to_Stage", lambda: source_to_stage.run(
+                self._db("SOURCEDB"), self._db("STAGEDB"), self.report_helper, mapping_df=staged)))
+            checks.append(run("Completeness_Stage_to_Target", lambda: stage_to_target.run(
+                self._db("STAGEDB"), self._db("TARGETDB"), self.report_helper, mapping_df=staged)))
+        return checks
+
+    def check(self, audit, row):
+        """All checks for one finished component; returns report rows."""
+        _, _, _, id_col, component_col = audit
+        status = str(row.get("Status", "")).upper()
+        component = str(row[component_col])
+        checks = []
+        try:
+            checks += self._log_checks(audit, row)
+            mapping = self._component_mapping(component)
+            # A failed load is expected to be incomplete: data checks only after SUCCESS
+            if status == "SUCCESS" and not mapping.empty:
+                checks += self._data_checks(mapping)
+        except Exception as e:
+            logging.error(f"❌ Watch checks failed for {component}: {e}")
+            checks.append(("Watch", None, None, str(e)[:500]))
+
+        results = []
+        for check_name, tables, passed, details in checks:
+            result = "ERROR" if passed is None else ("PASS" if passed else "FAIL")
+            results.append({
+                "Checked_At": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "ProcessLogID": row[id_col],
+                "Component_Name": component,
+                "ETL_Log_Status": status,
+                "Check": check_name,
+                "Tables": tables,
+                "Status": result,
+                "Details": details,
+            })
+            icon = "✅" if result == "PASS" else "❌"
+            logging.info(f"{icon} {component} ({status}) {check_name}: {result} {details or ''}")
+        return results
+
+    def run(self, max_polls=None):
+        """Poll until interrupted (or max_polls); one report per poll that saw finished components."""
+        self._start()
+        polls, all_results = 0, []
+        try:
+            while max_polls is None or polls < max_polls:
+                started = time.time()
+                # Each poll checks tables the ETL has written since: nothing from the last poll is reused
+                ExtractCache.get().clear()
+                results = []
+                for audit, row in self.poll_once():
+                    results += self.check(audit, row)
+                if results:
+                    self.report_helper.save_report(results, test_type="ETL_Audit_Watch")
+                    all_results += results
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(max(0.0, self.poll_seconds - (time.time() - started)))
+        except KeyboardInterrupt:
+            logging.info("🛑 ETL audit watch stopped")
+        finally:
+            ExtractCache.get().clear()
+            for db in self._dbs.values():
+                db.close()
+        return all_results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate ETL components as they finish (ETL_Process_Log watch)")
+    parser.add_argument("--db", default="TARGETDB", help="config.ini section holding the audit tables")
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument("--max-polls", type=int, default=None, help="stop after N polls (default: run until Ctrl+C)")
+    args = parser.parse_args()
+
+    ETLAuditWatch(args.config, args.db.upper()).run(args.max_polls)
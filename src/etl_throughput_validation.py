@@ -0,0 +1,235 @@
+import logging
+import configparser
+import numpy as np
+import pandas as pd
+from utils.workbook_cache import read_sheet
+from utils.etl_audit_snapshot import ETLAuditSnapshot
+from utils.sql_agent_jobs import AgentJob, run_duration_seconds
+
+
+class ETLThroughputValidation:
+    """
+    Did the ETL itself get slower? Compares the latest successful run of every ETL component
+    (Audit_tables logs) and SQL Agent job step (TARGETDW sheet jobs) with the median of its
+    earlier runs, over the last [PERFORMANCE] history_runs runs.
+
+      - duration from the process log start / end columns, rows from the detail log rows column
+      - rows per second, change vs baseline (%) and trend (least-squares slope, % of mean per run)
+      - REGRESSION when the latest run is slower, or processes fewer rows/s, by more than regression_pct
+    Every run read goes to a Performance sheet of the report.
+    """
+
+    def __init__(self, config_loader):
+        self.config_loader = config_loader
+        self.db = config_loader.db
+        self.report_helper = config_loader.report_helper
+
+        config = configparser.ConfigParser()
+        config.read(config_loader.config_path)
+        self.history_runs = config.getint("PERFORMANCE", "history_runs", fallback=10)
+        self.regression_pct = config.getfloat("PERFORMANCE", "regression_pct", fallback=25)
+        self.min_history_runs = config.getint("PERFORMANCE", "min_history_runs", fallback=3)
+        self.start_col = config.get("PERFORMANCE", "start_column", fallback="StartTime")
+        self.end_col = config.get("PERFORMANCE", "end_column", fallback="EndTime")
+        self.rows_col = config.get("PERFORMANCE", "rows_column", fallback="RowsProcessed")
+        self.include_job_steps = config.getboolean("PERFORMANCE", "include_job_steps", fallback=True)
+
+        excel_file_path = config_loader.config.get("PATHS", "excel_file_path")
+        self.audit_error = None   # reported as an ERROR row: the check must not pass on nothing
+        try:
+            self.audit_df = read_sheet(excel_file_path, sheet_name="Audit_tables", engine="openpyxl")
+        except Exception as e:
+            logging.error(f"❌ Could not load 'Audit_tables' sheet: {e}")
+            self.audit_df = pd.DataFrame()
+            self.audit_error = f"Could not load 'Audit_tables' sheet: {e}"
+        try:
+            self.jobs_df = read_sheet(excel_file_path, sheet_name="TARGETDW", engine="openpyxl")
+        except Exception as e:
+            logging.warning(f"⚠️ Could not load 'TARGETDW' sheet, job steps skipped: {e}")
+            self.jobs_df = pd.DataFrame()
+
+    # ------------------------------------------------------------------
+    def _columns(self, table):
+        return set(pd.read_sql(f"SELECT * FROM {table} WHERE 1 = 0", self.db.conn).columns)
+
+    def _component_runs(self, audit):
+        """Last history_runs successful runs per component, with the detail log row total (one query)."""
+        process_log, detail_log, _, id_col, component_col = audit
+        rows_sql, rows_join = "CAST(NULL AS BIGINT)", ""
+        if self.rows_col in self._columns(detail_log):
+            rows_sql = "D.Rows_Processed"
+            rows_join = f"""
+                LEFT JOIN (
+                    SELECT {id_col}, {component_col}, SUM({self.rows_col}) AS Rows_Processed
+                    FROM {detail_log}
+                    GROUP BY {id_col}, {component_col}
+                ) D ON D.{id_col} = P.{id_col} AND D.{component_col} = P.{component_col}"""
+        else:
+            logging.warning(f"⚠️ {detail_log} has no {self.rows_col} column: rows/s not computed")
+
+        query = f"""
+            SELECT *
+            FROM (
+                SELECT P.{id_col} AS Run_Id,
+                       P.{component_col} AS Component,
+                       P.{self.start_col} AS Started_At,
+                       P.{self.end_col} AS Finished_At,
+                       {rows_sql} AS Rows_Processed,
+                       ROW_NUMBER() OVER (PARTITION BY P.{component_col} ORDER BY P.{id_col} DESC) AS Run_Rank
+                FROM {process_log} P
+                {rows_join}
+                WHERE UPPER(P.Status) = 'SUCCESS'
+            ) R
+            WHERE R.Run_Rank <= {self.history_runs}
+        """
+        df = pd.read_sql(query, self.db.conn)
+        started = pd.to_datetime(df["Started_At"])
+        finished = pd.to_datetime(df["Finished_At"])
+        df["Duration_s"] = (finished - started).dt.total_seconds()
+        df.insert(0, "Source", process_log)
+        df.insert(2, "Step", None)
+        return df
+
+    def _job_step_runs(self):
+        """Last history_runs successful runs of every step of the TARGETDW sheet jobs (one msdb query)."""
+        if not self.include_job_steps or self.jobs_df.empty:
+            return pd.DataFrame()
+        names = sorted({
+            AgentJob(str(r.get("Job_Name", "")).strip(), str(r.get("Job_Command", "")).strip(), None).agent_name
+            for _, r in self.jobs_df.iterrows()
+            if str(r.get("Job_Name", "")).strip()
+        })
+        if not names:
+            return pd.DataFrame()
+
+        query = f"""
+            SELECT *
+            FROM (
+                SELECT j.name AS Component,
+                       h.instance_id AS Run_Id,
+                       CAST(h.step_id AS VARCHAR(10)) + ' - ' + h.step_name AS Step,
+                       msdb.dbo.agent_datetime(h.run_date, h.run_time) AS Started_At,
+                       h.run_duration,
+                       ROW_NUMBER() OVER (PARTITION BY j.job_id, h.step_id ORDER BY h.instance_id DESC) AS Run_Rank
+                FROM msdb.dbo.sysjobhistory h
+                JOIN msdb.dbo.sysjobs j ON j.job_id = h.job_id
+                WHERE h.step_id > 0
+                  AND h.run_status = 1
+                  AND j.name IN ({", ".join("?" for _ in names)})
+            ) R
+            WHERE R.Run_Rank <= {self.history_runs}
+        """
+        df = pd.read_sql(query, self.db.conn, params=names)
+        df["Duration_s"] = df.pop("run_duration").apply(run_duration_seconds)
+        df["Finished_At"] = pd.to_datetime(df["Started_At"]) + pd.to_timedelta(df["Duration_s"], unit="s")
+        df["Rows_Processed"] = np.nan
+        df.insert(0, "Source", "msdb.dbo.sysjobhistory")
+        return df
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _change_pct(latest, baseline):
+        if latest is None or baseline is None or pd.isna(latest) or pd.isna(baseline) or baseline == 0:
+            return None
+        return round((latest - baseline) / baseline * 100, 2)
+
+    @staticmethod
+    def _trend_pct(durations):
+        """Least-squares slope of the durations (oldest → latest) as % of their mean per run."""
+        values = np.asarray(durations, dtype=float)
+        if len(values) < 2 or values.mean() == 0:
+            return None
+        slope = np.polyfit(np.arange(len(values)), values, 1)[0]
+        return round(slope / values.mean() * 100, 2)
+
+    def _analyse(self, runs):
+        """One result row per (source, component, step) from its runs (latest first)."""
+        results = []
+        for (source, component, step), group in runs.groupby(["Source", "Component", "Step"], dropna=False):
+            group = group.sort_values("Run_Rank")
+            latest, earlier = group.iloc[0], group.iloc[1:]
+            durations = group["Duration_s"].dropna()
+
+            baseline_duration = earlier["Duration_s"].median() if not earlier.empty else None
+            latest_rps = latest["Rows_Processed"] / latest["Duration_s"] \
+                if pd.notna(latest["Rows_Processed"]) and latest["Duration_s"] else None
+            earlier_rps = (earlier["Rows_Processed"] / earlier["Duration_s"].replace(0, np.nan)).dropna()
+            baseline_rps = earlier_rps.median() if not earlier_rps.empty else None
+
+            duration_change = self._change_pct(latest["Duration_s"], baseline_duration)
+            throughput_change = self._change_pct(latest_rps, baseline_rps)
+
+            if len(earlier) < self.min_history_runs:
+                status = "INSUFFICIENT_HISTORY"
+            elif (duration_change is not None and duration_change > self.regression_pct) or \
+                    (throughput_change is not None and -throughput_change > self.regression_pct):
+                status = "REGRESSION"
+            else:
+                status = "PASS"
+
+            results.append({
+                "Source": source,
+                "Component": component,
+                "Step": None if pd.isna(step) else step,
+                "Runs": len(group),
+                "Latest_Run_Id": latest["Run_Id"],
+                "Latest_Started_At": latest["Started_At"],
+                "Latest_Duration_s": latest["Duration_s"],
+                "Baseline_Duration_s": baseline_duration,
+                "Duration_Change_%": duration_change,
+                "Latest_Rows": latest["Rows_Processed"],
+                "Latest_Rows_per_s": None if latest_rps is None else round(latest_rps, 2),
+                "Baseline_Rows_per_s": None if baseline_rps is None else round(baseline_rps, 2),
+                "Throughput_Change_%": throughput_change,
+                "Trend_%_per_Run": self._trend_pct(durations.iloc[::-1]),
+                "Status": status,
+            })
+            icon = "❌" if status == "REGRESSION" else "✅"
+            logging.info(f"{icon} {component} {'' if pd.isna(step) else step}: {status} "
+                         f"(duration {duration_change}%, rows/s {throughput_change}%)")
+        return results
+
+    @staticmethod
+    def _error_row(source, error):
+        return {"Source": source, "Component": None, "Step": None, "Status": "ERROR", "Error": error}
+
+    def run(self):
+        frames, errors = [], []
+        if self.audit_error:
+            errors.append(self._error_row("Audit_tables", self.audit_error))
+        for _, row in self.audit_df.iterrows():
+            try:
+                frames.append(self._component_runs(ETLAuditSnapshot.parse_audit_row(row)))
+            except Exception as e:
+                # e.g. a wrong [PERFORMANCE] start_column / end_column
+                logging.error(f"❌ Could not read ETL run history for {row.get('Audit_table_1')}: {e}")
+                errors.append(self._error_row(str(row.get("Audit_table_1")), str(e)))
+        try:
+            frames.append(self._job_step_runs())
+        except Exception as e:
+            logging.error(f"❌ Could not read msdb job step history: {e}")
+            errors.append(self._error_row("msdb.dbo.sysjobhistory", str(e)))
+        frames = [f for f in frames if not f.empty]
+        runs = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if not runs.empty:
+            runs["Rows_Processed"] = pd.to_numeric(runs["Rows_Processed"], errors="coerce")
+
+        results = (self._analyse(runs) if not runs.empty else []) + errors
+        assert results, "❌ No successful ETL runs found to analyse — check Audit_tables sheet or DB connection."
+
+        report_file = self.report_helper.save_report(results, test_type="ETL_Throughput_Validation")
+
+        # Every run read, latest first per component / step
+        if not runs.empty:
+            runs = runs.sort_values(["Source", "Component", "Step", "Run_Rank"], na_position="first")
+            runs["Rows_per_s"] = (runs["Rows_Processed"] / runs["Duration_s"].replace(0, np.nan)).round(2)
+            with pd.ExcelWriter(report_file, mode="a", if_sheet_exists="replace", engine="openpyxl") as writer:
+                runs.drop(columns=["Run_Rank"]).to_excel(writer, sheet_name="Performance", index=False)
+
+        unreadable = [f"{r['Source']}: {r['Error']}" for r in errors]
+        assert not unreadable, f"❌ ETL run history could not be read: {'; '.join(unreadable)}"
+
+        regressions = [f"{r['Component']} {r['Step'] or ''}".strip() for r in results if r["Status"] == "REGRESSION"]
+        assert not regressions, (
+            f"❌ ETL slower than baseline by more than {self.regression_pct:g}%: {', '.join(regressions)}"
+        )
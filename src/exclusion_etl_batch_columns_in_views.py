@@ -1,5 +1,6 @@
 import logging
 import pandas as pd
+from utils.workbook_cache import read_sheet
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -18,7 +19,7 @@ class ExclusionETLBatchColumnsInViews:
         # Get Excel file path from config.ini via config_loader
         try:
             excel_file_path = config_loader.config.get("PATHS", "excel_file_path")
-            self.excel_df = pd.read_excel(
+            self.excel_df = read_sheet(
                 excel_file_path,
                 sheet_name="Table_Mapping",
                 engine="openpyxl"
@@ -1,5 +1,6 @@
 import logging
 import pandas as pd
+from utils.sampling_helper import SamplingHelper
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -9,31 +10,59 @@ class GarbageValueValidation:
         self.db = config_loader.db
         self.df = config_loader.df
         self.report_helper = config_loader.report_helper
+        self.result_cache = config_loader.result_cache
+        self.sampling = SamplingHelper(config_loader.config_path)
 
     def run(self):
         # df = ExcelHelper.read_test_cases(self.excel_path)
-        df = self.df.copy()
+        rules = self.config_loader.rules   # DB sheet compiled once
         
         results = []
         failed_checks = []
+        plans = {}   # table → SamplingPlan (None = exact check)
         
-        for _, row in df.iterrows():
-            table = row["table_name"]
-            column = row["column_name"]
+        for rule_row in rules.rules:
+            table = rule_row.table
+            column = rule_row.column
 
             # Custom SQL from Excel or default regex query to find garbage values
-            garbage_check_sql = row.get("Garbage_Check_SQL_query", "").strip()
+            garbage_check_sql = rule_row.query("Garbage_Check_SQL_query")
+            garbage_predicate = None
 
             if not garbage_check_sql:
+                garbage_predicate = f"{column} LIKE '%[^a-zA-Z0-9@. -]%'"
                 # This SQL uses SQL Server syntax with NOT LIKE and a pattern for allowed chars (alphanumeric)
                 # It counts rows where the column contains any character NOT a-z, A-Z, or 0-9
                 garbage_check_sql = f"""
                     SELECT COUNT(*) FROM {table}
-                    WHERE {column} LIKE '%[^a-zA-Z0-9@. -]%'
+                    WHERE {garbage_predicate}
                 """
 
-            logging.info(f"Running Garbage Value Check query for {table}.{column}")
-            garbage_count = self.db.execute_query(garbage_check_sql)
+            # Only the default pattern can be sampled; custom SQL always runs exactly
+            if table not in plans:
+                plans[table] = self.sampling.plan_for_table(self.db, rules.frame(table), table)
+            plan = plans[table] if garbage_predicate else None
+            rule = [garbage_check_sql, plan.label if plan else None]
+
+            # ♻️ Reuse last verdict if the table has not changed
+            cached = self.result_cache.lookup("Garbage_Value_Check", rule, [(self.db, table)])
+            if cached is not None:
+                results.append(cached)
+                if cached["Status"] == "FAIL":
+                    failed_checks.append(f"{table}.{column} → Garbage value count: {cached['GARBAGE_VALUE_Count']} (cached)")
+                continue
+
+            # 🎯 Sampled scan first; escalate to the exact query when it finds garbage
+            sample = None
+            if plan is not None:
+                logging.info(f"Running sampled Garbage Value Check for {table}.{column} → {plan.label}")
+                sample = self.sampling.sampled_violation_count(self.db, plan, garbage_predicate)
+
+            if sample is not None and (sample[1] == 0 or not self.sampling.escalate):
+                garbage_count = sample[1]
+            else:
+                logging.info(f"Running Garbage Value Check query for {table}.{column}")
+                garbage_count = self.db.execute_query(garbage_check_sql)
 
             if isinstance(garbage_count, list) and len(garbage_count) > 0:
                 garbage_count = garbage_count[0][0]
@@ -45,16 +74,25 @@ class GarbageValueValidation:
                 "Table": table,
                 "Column": column,
                 "GARBAGE_VALUE_Count": garbage_count,
-                "Status": status
+                "Status": status,
+                "Cached": "NO"
             })
+            if sample is None:
+                self.sampling.not_sampled(results[-1])
+            else:
+                self.sampling.annotate(results[-1], plan, sample[1], sample[0])
+                if sample[1] > 0 and self.sampling.escalate:
+                    self.sampling.escalated(results[-1])
+            self.result_cache.store("Garbage_Value_Check", rule, [(self.db, table)], results[-1])
 
-            if not status:
-                failed_checks.append(f"{table}.{column} → Duplicate count: {garbage_count}")
+            if status == "FAIL":
+                failed_checks.append(f"{table}.{column} → Garbage value count: {garbage_count}")
 
             logging.info(f"{table}.{column} → Garbage Value Count: {garbage_count}")
             print(f"{table}.{column} → Garbage Value Count:", garbage_count)
 
         # Save results to Excel and PDF
+        self.result_cache.flush()
         self.report_helper.save_report(results, test_type="Garbage_Value_Check")
         # self.report_helper.print_validation_report_GarbageVlueValidation(results, check_type="Garbage_Value_Check")
         # self.db.close()
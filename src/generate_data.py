@@ -1,78 +1,194 @@
+import os
+import argparse
+import time
+from datetime import date
+from multiprocessing import Pool
+
+import numpy as np
 import pandas as pd
 from faker import Faker
-import random
-
-# Initialize Faker instance
-fake = Faker()
-
-# Function to generate dummy data for the source_doctors table
-def generate_doctors_data(num_records):
-    doctors_data = []
-    
-    for i in range(1, num_records + 1):
-        # Generate the doctor_id with an incremented prefix
-        prefix = f"B{i-1}"  # Prefix will start at "B0", "B1", "B2", ...
-        doctor_id = f"{prefix}-{i:03d}"  # e.g., B0-001, B1-002, ...
-        
-        first_name = fake.first_name()
-        last_name = fake.last_name()
-        specialty = random.choice(['Cardiology', 'Neurology', 'Orthopedics', 'Pediatrics', 'General Surgery'])
-        phone_number = fake.phone_number()
-        email = fake.email()
-        
-        doctors_data.append({
-            'doctor_id': doctor_id,
-            'first_name': first_name,
-            'last_name': last_name,
-            'specialty': specialty,
-            'phone_number': phone_number,
-            'email': email
-        })
-    
-    return pd.DataFrame(doctors_data)
-
-# Function to generate dummy data for the source_patients table
-def generate_patients_data(num_records):
-    patients_data = []
-    
-    for i in range(1, num_records + 1):
-        # patient_id = fake.uuid4()  # UUID for patient_id
-        prefix = f"P{i-1}"  # Prefix will start at "B0", "B1", "B2", ...
-        patient_id = f"{prefix}-{i:03d}"  # e.g., B0-001, B1-002, ...
-        first_name = fake.first_name()
-        last_name = fake.last_name()
-        date_of_birth = fake.date_of_birth(minimum_age=18, maximum_age=90)
-        gender = random.choice(['Male', 'Female', 'Other'])
-        address = fake.address().replace("\n", ", ")
-        phone_number = fake.phone_number()
-        email = fake.email()
-        primary_doctor_id = f"B{random.randint(0, num_records-1)}-{random.randint(1, num_records):03d}"  # Random doctor ID
-        
-        patients_data.append({
-            'patient_id': patient_id,
-            'first_name': first_name,
-            'last_name': last_name,
-            'date_of_birth': date_of_birth,
-            'gender': gender,
-            'address': address,
-            'phone_number': phone_number,
-            'email': email,
-            'primary_doctor_id': primary_doctor_id
-        })
-    
-    return pd.DataFrame(patients_data)
-
-# Generate 10 dummy records for each table
-num_records = 1000000
-doctors_df = generate_doctors_data(num_records)
-patients_df = generate_patients_data(num_records)
-
-# Display the dummy data
-# print("Doctors Table:")
-print(doctors_df)
-# print("\nPatients Table:")
-print(patients_df)
-
-# Optionally, save the data to CSV
-doctors_df.to_csv('doctors_data.csv', index=False)
-patients_df.to_csv('patients_data.csv', index=False)
+
+SPECIALTIES = np.array(['Cardiology', 'Neurology', 'Orthopedics', 'Pediatrics', 'General Surgery'])
+GENDERS = np.array(['Male', 'Female', 'Other'])
+EMAIL_DOMAINS = np.array(['example.com', 'example.org', 'example.net', 'mail.com', 'test.com'])
+
+# Per-table stream ids, so doctors and patients never share random numbers
+DOCTORS, PATIENTS = 1, 2
+
+
+def build_pools(seed, size=2000):
+    """Faker is only used once, to build vocabulary pools that batches sample by index."""
+    Faker.seed(seed)
+    fake = Faker()
+    return {
+        'first_name': np.array([fake.first_name() for _ in range(size)]),
+        'last_name': np.array([fake.last_name() for _ in range(size)]),
+        'street': np.array([fake.street_name() for _ in range(size)]),
+        'city': np.array([fake.city() for _ in range(size)]),
+        'state': np.array([fake.state_abbr() for _ in range(size)]),
+    }
+
+
+def _rng(seed, table, start):
+    """Random stream of one batch: depends on seed / table / first row only (not on process count)."""
+    return np.random.default_rng([seed, table, start])
+
+
+def format_ids(prefix, numbers):
+    """Vectorized B{i-1}-{i:03d} style ids (same format as before, e.g. B0-001, B1-002)."""
+    numbers = pd.Series(numbers)
+    return prefix + (numbers - 1).astype(str) + '-' + numbers.astype(str).str.zfill(3)
+
+
+def _phone_numbers(rng, n):
+    area = pd.Series(rng.integers(200, 1000, n)).astype(str)
+    line = pd.Series(rng.integers(0, 10000, n)).astype(str).str.zfill(4)
+    return area + '-555-' + line
+
+
+# Function to generate dummy data for the source_doctors table (rows start..stop-1, 1-based)
+def generate_doctors_data(start, stop, pools, seed=42):
+    rng = _rng(seed, DOCTORS, start)
+    n = stop - start
+    numbers = np.arange(start, stop)
+    first_name = pools['first_name'][rng.integers(0, len(pools['first_name']), n)]
+    last_name = pools['last_name'][rng.integers(0, len(pools['last_name']), n)]
+
+    return pd.DataFrame({
+        'doctor_id': format_ids('B', numbers),
+        'first_name': first_name,
+        'last_name': last_name,
+        'specialty': SPECIALTIES[rng.integers(0, len(SPECIALTIES), n)],
+        'phone_number': _phone_numbers(rng, n),
+        'email': (pd.Series(first_name).str.lower() + '.' + pd.Series(last_name).str.lower()
+                  + pd.Series(numbers).astype(str) + '@'
+                  + EMAIL_DOMAINS[rng.integers(0, len(EMAIL_DOMAINS), n)]),
+    })
+
+
+# Function to generate dummy data for the source_patients table (rows start..stop-1, 1-based)
+def generate_patients_data(start, stop, pools, num_doctors, seed=42, as_of=date(2025, 6, 6)):
+    rng = _rng(seed, PATIENTS, start)
+    n = stop - start
+    numbers = np.arange(start, stop)
+    first_name = pools['first_name'][rng.integers(0, len(pools['first_name']), n)]
+    last_name = pools['last_name'][rng.integers(0, len(pools['last_name']), n)]
+
+    # Age 18..90 at as_of (fixed date keeps the output reproducible)
+    as_of = np.datetime64(as_of, 'D')
+    date_of_birth = as_of - rng.integers(18 * 365, 90 * 365, n).astype('timedelta64[D]')
+
+    address = (pd.Series(rng.integers(1, 10000, n)).astype(str) + ' '
+               + pools['street'][rng.integers(0, len(pools['street']), n)] + ', '
+               + pools['city'][rng.integers(0, len(pools['city']), n)] + ', '
+               + pools['state'][rng.integers(0, len(pools['state']), n)] + ' '
+               + pd.Series(rng.integers(0, 100000, n)).astype(str).str.zfill(5))
+
+    return pd.DataFrame({
+        'patient_id': format_ids('P', numbers),
+        'first_name': first_name,
+        'last_name': last_name,
+        'date_of_birth': pd.Series(date_of_birth).dt.date,
+        'gender': GENDERS[rng.integers(0, len(GENDERS), n)],
+        'address': address,
+        'phone_number': _phone_numbers(rng, n),
+        'email': (pd.Series(first_name).str.lower() + '.' + pd.Series(last_name).str.lower()
+                  + pd.Series(numbers).astype(str) + '@'
+                  + EMAIL_DOMAINS[rng.integers(0, len(EMAIL_DOMAINS), n)]),
+        # Always an existing doctor_id, so the referential integrity checks see real data
+        'primary_doctor_id': format_ids('B', rng.integers(1, num_doctors + 1, n)),
+    })
+
+
+# --- Batch / process plumbing ----------------------------------------------------
+
+_POOLS = None
+
+
+def _init_worker(pools):
+    global _POOLS
+    _POOLS = pools
+
+
+def _generate_batch(task):
+    table, start, stop, num_doctors, seed = task
+    if table == DOCTORS:
+        return generate_doctors_data(start, stop, _POOLS, seed)
+    return generate_patients_data(start, stop, _POOLS, num_doctors, seed)
+
+
+class _ChunkWriter:
+    """Appends DataFrame chunks to one CSV or Parquet file."""
+
+    def __init__(self, path, file_format):
+        self.path = path
+        self.file_format = file_format
+        self.rows = 0
+        self._parquet = None
+
+    def write(self, df):
+        if self.file_format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def generate(num_doctors, num_patients, output_dir='.', file_format='csv',
+             batch_size=100000, processes=None, seed=42):
+    """
+    Generate doctors / patients in batches across processes and stream them to
+    <output_dir>/doctors_data.<ext> and patients_data.<ext>. Output is identical for a
+    given seed and batch_size whatever the number of processes.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    pools = build_pools(seed)
+    ext = 'parquet' if file_format == 'parquet' else 'csv'
+    outputs = {}
+
+    with Pool(processes=processes, initializer=_init_worker, initargs=(pools,)) as pool:
+        for table, name, total in ((DOCTORS, 'doctors', num_doctors), (PATIENTS, 'patients', num_patients)):
+            start_time = time.time()
+            tasks = [
+                (table, start, min(start + batch_size, total + 1), num_doctors, seed)
+                for start in range(1, total + 1, batch_size)
+            ]
+            path = os.path.join(output_dir, f'{name}_data.{ext}')
+            writer = _ChunkWriter(path, ext)
+            try:
+                # imap keeps batch order, so chunks are written in id order as they complete
+                for df in pool.imap(_generate_batch, tasks):
+                    writer.write(df)
+            finally:
+                writer.close()
+
+            elapsed = time.time() - start_time
+            print(f"{name}: {writer.rows:,} rows → {path} in {elapsed:.1f}s "
+                  f"({writer.rows / elapsed if elapsed else 0:,.0f} rows/s)")
+            outputs[name] = path
+    return outputs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate dummy doctors / patients source data')
+    parser.add_argument('--doctors', type=int, default=1000000)
+    parser.add_argument('--patients', type=int, default=1000000)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--batch-size', type=int, default=100000)
+    parser.add_argument('--processes', type=int, default=None, help='default: number of CPUs')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generate(args.doctors, args.patients, args.output_dir, args.format,
+             args.batch_size, args.processes, args.seed)
@@ -1,5 +1,6 @@
 import logging
 import pandas as pd
+from utils.sampling_helper import SamplingHelper
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -9,22 +10,20 @@ class NullValidation:
         self.db = config_loader.db
         self.df = config_loader.df
         self.report_helper = config_loader.report_helper
+        self.result_cache = config_loader.result_cache
+        self.sampling = SamplingHelper(config_loader.config_path)
         # self.report_helper = report_helper
 
  
 
     def run(self):
 
-        # Use the sheet loaded in __init__ based on selected DB
-        df = self.df.copy()
+        # DB sheet compiled once (ConfigLoader.rules)
+        rules = self.config_loader.rules
 
         # # Filter only Business Key = Y
         # df = df[df["Business Key"].str.upper() == "Y"]
 
-        # ✅ Keep only rows where constraints contain "Composite Key"
-        df["Constraints"] = df["Constraints"].fillna("").str.lower()
-        df = df[df["Constraints"].str.contains("composite key")]
-
 
         def get_scalar(result):
             """Extract scalar from DBHelper.execute_query result"""
@@ -33,11 +32,13 @@ class NullValidation:
        
         results = []
         failed_checks = []
+        plans = {}   # table → SamplingPlan (None = exact check)
 
         # for _, row in grouped.iterrows():
-        for _, row in df.iterrows():    
-            table = row["table_name"]
-            column = row["column_name"]
+        # ✅ Keep only rows where constraints contain "Composite Key"
+        for rule_row in (r for r in rules.rules if r.is_composite_key):
+            table = rule_row.table
+            column = rule_row.column
 
             # # Get null query from excel (specific to both table & column)
             # null_query_excel = df.loc[
@@ -51,8 +52,30 @@ class NullValidation:
             #     # Default dynamic null check query
             null_query = f"SELECT COUNT(*) as nullcount FROM {table} WHERE {column} IS NULL"
 
-            logging.info(f"Running query for {table}.{column}")
-            raw_result = self.db.execute_query(null_query)
+            if table not in plans:
+                plans[table] = self.sampling.plan_for_table(self.db, rules.frame(table), table)
+            plan = plans[table]
+            rule = [null_query, plan.label if plan else None]
+
+            # ♻️ Reuse last verdict if the table has not changed
+            cached = self.result_cache.lookup("Null_Check", rule, [(self.db, table)])
+            if cached is not None:
+                results.append(cached)
+                if not cached["IsCheckPassed"]:
+                    failed_checks.append(f"{table}.{column} → Null count: {cached['Null_Count']} (cached)")
+                continue
+
+            # 🎯 Sampled scan first; escalate to the exact query when it finds NULLs
+            sample = None
+            if plan is not None:
+                logging.info(f"Running sampled query for {table}.{column} → {plan.label}")
+                sample = self.sampling.sampled_violation_count(self.db, plan, f"{column} IS NULL")
+
+            if sample is not None and (sample[1] == 0 or not self.sampling.escalate):
+                raw_result = [(sample[1],)]
+            else:
+                logging.info(f"Running query for {table}.{column}")
+                raw_result = self.db.execute_query(null_query)
             
             null_count = get_scalar(raw_result) or 0
             
@@ -78,8 +101,16 @@ class NullValidation:
                 "Table_name": table,
                 "Column_names": column,
                 "Null_Count": null_count,
-                "IsCheckPassed": is_check_passed
+                "IsCheckPassed": is_check_passed,
+                "Cached": "NO"
             })
+            if sample is None:
+                self.sampling.not_sampled(results[-1])
+            else:
+                self.sampling.annotate(results[-1], plan, sample[1], sample[0])
+                if sample[1] > 0 and self.sampling.escalate:
+                    self.sampling.escalated(results[-1])
+            self.result_cache.store("Null_Check", rule, [(self.db, table)], results[-1])
 
             if not is_check_passed:
                 failed_checks.append(f"{table}.{column} → Null count: {null_count}")
@@ -87,6 +118,7 @@ class NullValidation:
             logging.info(f"{table}.{column} → Null count: {null_count} → {'PASS' if is_check_passed else 'FAIL'}")
             print(f"{table}.{column} → Null Count:", null_count)
 
+        self.result_cache.flush()
         self.report_helper.save_report(results,test_type="Null_Check")
         # self.report_helper.print_validation_report_Null(results, check_type="Null_Check")
 
@@ -12,8 +12,8 @@ class OtherValidation:
 
     def run(self):
 
-        # Use the sheet loaded in __init__ based on selected DB
-        df = self.df.copy()
+        # DB sheet compiled once: custom SQL looked up per table.column in O(1)
+        rules = self.config_loader.rules
 
 
         def get_scalar(result):
@@ -23,23 +23,17 @@ class OtherValidation:
        
         results = []
         failed_checks = []
-        # for _, row in grouped.iterrows():
-        for _, row in df.iterrows():    
-            table = row["table_name"]
-            column = row["column_name"]
+        for rule in rules.rules:
+            table = rule.table
+            column = rule.column
 
-            # Get SQL query from excel (specific to both table & column)
-            other_query_excel = df.loc[
-                    (df["table_name"] == table) & (df["column_name"] == column),
-                    "Other_SQL_query"
-                ].dropna().unique()
+            # Get SQL query from excel (specific to both table & column, first one if multiple)
+            executed_query = rules.custom_sql(table, column, "Other_SQL_query")
             
             issue_count = 0
-            executed_query = None
             
 
-            if other_query_excel.size > 0:
-                executed_query = other_query_excel[0]   # take the first query if multiple
+            if executed_query:
                 logging.info(f"Running query for {table}.{column}")
                 raw_result = self.db.execute_query(executed_query)
                 issue_count = get_scalar(raw_result) or 0
@@ -49,7 +43,7 @@ class OtherValidation:
                 logging.info(f"✅ No custom SQL query found for {table}.{column}, skipping check.")
                 # issue_count = 0
        
-            logging.debug(f"Raw DB result for {table}.{column}: {other_query_excel!r}")
+            logging.debug(f"Raw DB result for {table}.{column}: {executed_query!r}")
                       
             # is_check_passed = (other_query_excel == 0)
             is_check_passed = (issue_count == 0)
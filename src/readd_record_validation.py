@@ -1,6 +1,6 @@
 import logging
 import pandas as pd
-import datetime
+from utils.deleted_record_lifecycle import DeletedRecordLifecycle
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 log = logging.getLogger(__name__)
@@ -11,89 +11,47 @@ class ReAddedRecords_Validation:
         self.db = config_loader.db
         self.report_helper = config_loader.report_helper
 
+        # Deleted keys are classified once per deleted_table (shared with DeletedVsTarget / DeletedVsSource)
+        self.lifecycle = DeletedRecordLifecycle(self.db, config_loader.config_path)
         try:
-            excel_file_path = config_loader.config.get("PATHS", "excel_file_path")
-            self.mapping_df = pd.read_excel(
-                excel_file_path, sheet_name="Table_Mapping", engine="openpyxl"
-            )
-            self.target_db_df = pd.read_excel(
-                excel_file_path, sheet_name="TARGETDB", engine="openpyxl"
-            )
+            self.tables = self.lifecycle.tables()
         except Exception as e:
             log.error(f"❌ Could not load mapping sheets: {e}")
-            self.mapping_df = pd.DataFrame()
-            self.target_db_df = pd.DataFrame()
-
-    def get_composite_keys(self, table_name: str) -> list:
-        try:
-            keys = (
-                self.target_db_df[
-                    (self.target_db_df["table_name"] == table_name)
-                    & (self.target_db_df["Constraints"].str.contains("COMPOSITE KEY", case=False, na=False))
-                ]["column_name"]
-                .tolist()
-            )
-            if not keys:
-                log.warning(f"⚠️ No composite keys found for {table_name}")
-            else:
-                log.info(f"✅ Composite keys for {table_name}: {keys}")
-            return keys
-        except Exception as e:
-            log.error(f"❌ Could not fetch composite keys for {table_name}: {e}")
-            return []
+            self.tables = []
 
     def run(self):
         results = []
         details_dict = {}
 
-        today = datetime.date.today().strftime("%Y-%m-%d")
-
-        for _, row in self.mapping_df.iterrows():
-            source_table = str(row["source_table"]).strip()
-            target_table = str(row["target_table"]).strip()
-            deleted_table = row.get("deleted_table", "")
-
-            if pd.isna(deleted_table) or str(deleted_table).strip() == "":
-                continue
-            deleted_table = str(deleted_table).strip()
-
-            keys = self.get_composite_keys(target_table)
+        for entry in self.tables:
+            source_table = entry["source_table"]
+            target_table = entry["target_table"]
+            deleted_table = entry["deleted_table"]
+            keys = entry["target_keys"]
             if not keys:
                 continue
 
             try:
-                # Build join condition
-                join_condition = " AND ".join([f"T.{k}=D.{k}" for k in keys])
-                src_condition = " AND ".join([f"S.{k}=D.{k}" for k in keys])
-
-                # Re-added Validation
-                readded_query = f"""
-                    SELECT D.*, S.*, T.Is_Current, T.Version_Begin_Date, T.Version_End_Date
-                    FROM {deleted_table} D
-                    INNER JOIN SOURCE_db.dbo.{source_table} S
-                      ON {src_condition}
-                    INNER JOIN {target_table} T
-                      ON {join_condition}
-                    WHERE (CAST(T.Is_Current AS VARCHAR) = '1' OR CAST(T.Is_Current AS VARCHAR) = 'TRUE'  )
-                       AND (CAST(T.Version_Begin_Date AS DATE) <> CAST(GETDATE() AS DATE))
-                       AND (T.Version_End_Date NOT IN ('3000-12-31') AND T.Version_End_Date IS NOT NULL)
-                """
-
-                mismatches = pd.read_sql(readded_query, self.db.conn)
+                # Re-added keys: back in source with a current target version, which must be a
+                # new version (begun today, open-ended)
+                scan = self.lifecycle.scan(entry)
+                mismatches = scan["counts"]["Readd_Rule_Broken"]
 
-                if mismatches.empty:
+                if mismatches == 0:
                     status = "PASS"
                     error = None
                 else:
                     status = "FAIL"
                     error = "Re-added record does not satisfy business rules"
-                    details_dict[f"{target_table}_Readded_Mismatches"] = mismatches
+                    details_dict[f"{target_table}_Readded_Mismatches"] = self.lifecycle.samples(scan, "Readd_Rule_Broken")
 
                 results.append({
                     "Source_Table": source_table,
                     "Target_Table": target_table,
                     "Deleted_Table": deleted_table,
                     "Composite_Keys": ",".join(keys),
+                    "Re_Added_Keys": scan["counts"]["Re_Added"],
+                    "Mismatch_Count": mismatches,
                     "Validation_Status": status,
                     "Error": error
                 })
@@ -105,6 +63,8 @@ class ReAddedRecords_Validation:
                     "Target_Table": target_table,
                     "Deleted_Table": deleted_table,
                     "Composite_Keys": ",".join(keys),
+                    "Re_Added_Keys": None,
+                    "Mismatch_Count": None,
                     "Validation_Status": "ERROR",
                     "Error": str(ex)
                 })
@@ -1,5 +1,7 @@
 import logging
 import pandas as pd
+from utils.violation_budget import ViolationBudget
+from utils.query_timeout import QueryTimeoutError
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -9,6 +11,7 @@ class SCDAuditValidation:
         self.db = config_loader.db
         self.df = config_loader.df   # Excel metadata (table_name, column_name, Business Key, etc.)
         self.report_helper = config_loader.report_helper
+        self.violation_budget = ViolationBudget(config_loader.config_path)
 
     # def get_business_keys(self, table_name):
     #     if self.df is None or self.df.empty:
@@ -26,18 +29,8 @@ class SCDAuditValidation:
         if self.df is None or self.df.empty:
             return []
 
-        df = self.df.copy()
-        df["Constraints"] = df["Constraints"].fillna("").str.lower()
-        # df = df[df["Constraints"].str.contains("composite key")]
-
-        # Pick columns where constraints mention primary key OR composite key
-        keys = (
-            df[
-                (df["table_name"].str.lower() == table_name.lower()) &
-                (df["Constraints"].str.contains("composite key", na=False))
-            ]["column_name"]
-            .tolist()
-        )
+        # Composite key columns, prebuilt per table (case-insensitive) by ConfigLoader.rules
+        keys = list(self.config_loader.rules.composite_keys(table_name))
         print("DEBUG business keys:", keys, type(keys))
         return keys    
 
@@ -99,19 +92,21 @@ class SCDAuditValidation:
                 WHERE Is_Current = 0
                   AND Version_Begin_Date >= Version_End_Date;
             """,
+            # Derived tables rather than a CTE, so the violation budget can wrap it in SELECT TOP (n)
             "Overlapping Versions Check": f"""
-                WITH VersionedData AS (
-                    SELECT 
-                        {bk_expr} AS BusinessKey,
-                        Version_Begin_Date,
-                        ISNULL(Version_End_Date, '9999-12-31') AS Version_End_Date
-                    FROM {table_name}
-                )
                 SELECT a.BusinessKey, 
                        a.Version_Begin_Date AS Begin_A, a.Version_End_Date AS End_A,
                        b.Version_Begin_Date AS Begin_B, b.Version_End_Date AS End_B
-                FROM VersionedData a
-                JOIN VersionedData b 
+                FROM (
+                    SELECT {bk_expr} AS BusinessKey, Version_Begin_Date,
+                           ISNULL(Version_End_Date, '9999-12-31') AS Version_End_Date
+                    FROM {table_name}
+                ) a
+                JOIN (
+                    SELECT {bk_expr} AS BusinessKey, Version_Begin_Date,
+                           ISNULL(Version_End_Date, '9999-12-31') AS Version_End_Date
+                    FROM {table_name}
+                ) b
                   ON a.BusinessKey = b.BusinessKey
                  AND a.Version_Begin_Date < b.Version_End_Date
                  AND b.Version_Begin_Date < a.Version_End_Date
@@ -119,20 +114,31 @@ class SCDAuditValidation:
             """
         }
 
+        # ⏱️ Each check stops at the table's Violation_Budget rows when [VIOLATION_BUDGET] is enabled
+        budget = self.violation_budget.budget(self.config_loader.rules.frame(table_name))
+
         results = []
         for check_name, query in queries.items():
             logging.info(f"Running check: {check_name} on {table_name}")
 
-            # ✅ Use raw connection cursor to get column names
-            cursor = self.db.conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            columns = [col[0] for col in cursor.description]
-            cursor.close()
-            raw_result = [dict(zip(columns, row)) for row in rows]  # convert into dicts
-
-            # raw_result = self.db.execute_query(query)
-            row_count = len(raw_result) #if raw_result else 0
+            # ✅ Rows as dicts with the DB column names
+            try:
+                # Exact count + bounded sample of the rows ([DETAILS]), optionally all of them in Parquet
+                details, row_count, reached, exact = self.violation_budget.fetch(
+                    self.db, query, budget, name=f"SCD_{table_name}_{check_name}")
+            except QueryTimeoutError as e:
+                # ⏱️ Cancelled by [TIMEOUTS] (e.g. the overlap self-join): record it and run the next check
+                results.append({
+                    "Database": self.db.database,
+                    "Table_name": table_name,
+                    "Check_name": check_name,
+                    "Issue_Count": None,
+                    "IsCheckPassed": "TIMEOUT",
+                    "Count_Exact": f"TIMEOUT after {e.seconds:g}s",
+                    "Details_Captured": None,
+                    "Details": None
+                })
+                continue
             is_check_passed = (row_count == 0)
 
             results.append({
@@ -141,7 +147,9 @@ class SCDAuditValidation:
                 "Check_name": check_name,
                 "Issue_Count": row_count,
                 "IsCheckPassed": "PASS" if is_check_passed else "FAIL",
-                "Details": raw_result if not is_check_passed else None  # ✅ add raw rows
+                "Count_Exact": self.violation_budget.label(budget, reached, exact),
+                "Details_Captured": details.summary(),
+                "Details": details if not is_check_passed else None  # ✅ sampled rows
             })
 
             logging.info(f"{check_name} → Issues: {row_count} → {'PASS' if is_check_passed else 'FAIL'}")
@@ -154,7 +162,7 @@ class SCDAuditValidation:
             return
 
         results = []
-        unique_tables = self.df["table_name"].dropna().unique()
+        unique_tables = self.config_loader.rules.tables
 
         for table in unique_tables:
             logging.info(f"🔍 Starting SCD checks for table: {table}")
@@ -179,8 +187,8 @@ class SCDAuditValidation:
 
                 # Write details per failed check with proper columns
                 for r in results:
-                    if r.get("Issue_Count", 0) > 0 and r.get("Details") is not None:
-                        details_df = pd.DataFrame(r["Details"])   # ✅ now includes DB column names
+                    if (r.get("Issue_Count") or 0) > 0 and r.get("Details") is not None:
+                        details_df = r["Details"].frame()   # ✅ sample, with the DB column names
                         if not details_df.empty:
                             sheet_name = f"{r['Table_name']}_{r['Check_name']}"[:31]
                             details_df.to_excel(writer, sheet_name=sheet_name, index=False)
@@ -1,6 +1,7 @@
 import logging
-import pandas as pd
+from utils.workbook_cache import read_sheet
 import configparser
+from utils.checksum_gate import ChecksumGate
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -10,10 +11,11 @@ class SCD_Validation_SourceToStage:
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
         self.excel_path = self.config.get("PATHS", "excel_file_path")
+        self.checksum_gate = ChecksumGate(config_path)
  
     def get_common_columns(self, source_db, stage_db, source_table, stage_table):
         """Get common column names between source and stage tables, excluding specific columns."""
-        src_cols = source_db.execute_query(
+        src_cols = source_db.execute_cached(
             f"""
             SELECT COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
@@ -22,7 +24,7 @@ class SCD_Validation_SourceToStage:
         )
         src_cols = [col[0] for col in src_cols]
  
-        stg_cols = stage_db.execute_query(
+        stg_cols = stage_db.execute_cached(
             f"""
             SELECT COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
@@ -44,7 +46,7 @@ class SCD_Validation_SourceToStage:
         return ", ".join(common_quoted)
  
     def run(self, source_db, stage_db, report_helper):
-        df = pd.read_excel(self.excel_path, sheet_name="Table_Mapping")
+        df = read_sheet(self.excel_path, sheet_name="Table_Mapping")
  
         results = []
         failed_checks = []  # track failures
@@ -74,9 +76,16 @@ class SCD_Validation_SourceToStage:
             """
  
             logging.info(f"Running SCD check: {source_table} → {stage_table}")
-            raw_result = source_db.execute_query(SCD_query)
- 
-            missing_count = raw_result[0][0] if raw_result else 0
+            # ⚡ Equal fingerprints of the (current) rows on both sides → PASS without the EXCEPT
+            current = "Is_Current='TRUE' OR Is_Current='1'"
+            gate = self.checksum_gate.compare_tables(
+                (source_db, self.config.get("SOURCEDB", "database"), source_table, ""),
+                (stage_db, self.config.get("STAGEDB", "database"), stage_table, current), common_columns)
+            if gate == "MATCH":
+                missing_count = 0
+            else:
+                raw_result = source_db.execute_query(SCD_query)
+                missing_count = raw_result[0][0] if raw_result else 0
             is_check_passed = missing_count == 0
  
             results.append({
@@ -86,7 +95,8 @@ class SCD_Validation_SourceToStage:
                 "Stage_Table": stage_table,
                 "Common_Columns": common_columns,
                 "Data_Missing_Count": missing_count,
-                "IsCheckPassed": is_check_passed
+                "IsCheckPassed": is_check_passed,
+                "Checksum_Gate": gate
             })
 
             if not is_check_passed:
@@ -108,10 +118,11 @@ class SCD_Validation_StageToTarget:
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
         self.excel_path = self.config.get("PATHS", "excel_file_path")
+        self.checksum_gate = ChecksumGate(config_path)
   
     def get_common_columns(self,stage_db, target_db, stage_table, target_table):
         """Get common column names between stage and target tables, excluding specific columns."""
-        stg_cols = stage_db.execute_query(
+        stg_cols = stage_db.execute_cached(
             f"""
             SELECT COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
@@ -120,7 +131,7 @@ class SCD_Validation_StageToTarget:
         )
         stg_cols = [col[0] for col in stg_cols]
  
-        trg_cols = target_db.execute_query(
+        trg_cols = target_db.execute_cached(
             f"""
             SELECT COLUMN_NAME
             FROM INFORMATION_SCHEMA.COLUMNS
@@ -142,7 +153,7 @@ class SCD_Validation_StageToTarget:
         return ", ".join(common_quoted)
  
     def run(self,stage_db, target_db, report_helper):
-        df = pd.read_excel(self.excel_path, sheet_name="Table_Mapping")
+        df = read_sheet(self.excel_path, sheet_name="Table_Mapping")
  
         results = []
         failed_checks = []  # track failures
@@ -173,9 +184,16 @@ class SCD_Validation_StageToTarget:
             """
  
             logging.info(f"Running SCD check: {stage_table} → {target_table}")
-            raw_result = stage_db.execute_query(SCD_query)
- 
-            missing_count = raw_result[0][0] if raw_result else 0
+            # ⚡ Equal fingerprints of the (current) rows on both sides → PASS without the EXCEPT
+            current = "Is_Current='TRUE' OR Is_Current='1'"
+            gate = self.checksum_gate.compare_tables(
+                (stage_db, self.config.get("STAGEDB", "database"), stage_table, current),
+                (target_db, self.config.get("TARGETDB", "database"), target_table, current), common_columns)
+            if gate == "MATCH":
+                missing_count = 0
+            else:
+                raw_result = stage_db.execute_query(SCD_query)
+                missing_count = raw_result[0][0] if raw_result else 0
             is_check_passed = missing_count == 0
  
             results.append({
@@ -185,7 +203,8 @@ class SCD_Validation_StageToTarget:
                 "Target_Table": target_table,
                 "Common_Columns": common_columns,
                 "Data_Missing_Count": missing_count,
-                "IsCheckPassed": is_check_passed
+                "IsCheckPassed": is_check_passed,
+                "Checksum_Gate": gate
             })
 
             if not is_check_passed:
@@ -1,6 +1,9 @@
 import logging
 import pandas as pd
+from utils.workbook_cache import read_sheet
 import configparser
+from utils.sampling_helper import SamplingHelper
+from utils.checksum_gate import ChecksumGate
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -10,11 +13,45 @@ class TransformationValidation:
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
         self.excel_path = self.config.get("PATHS", "excel_file_path")
+        self.sampling = SamplingHelper(config_path)
+        self.checksum_gate = ChecksumGate(config_path)
+
+    def compare(self, columns, source_data, target_data):
+        """Row-by-row key/value comparison. Returns (mismatches, mismatch_records)."""
+        # Convert to dict for row-by-row comparison
+        source_dict = {row[0]: row[1] for row in source_data if row[0] is not None}
+        target_dict = {row[0]: row[1] for row in target_data if row[0] is not None}
+
+        mismatches = []
+        mismatch_records = []
+        for key, src_val in source_dict.items():
+            tgt_val = target_dict.get(key)
+            if tgt_val is None:
+                mismatches.append({"Key": key, "Source_Value": src_val, "Target_Value": "MISSING"})
+                mismatch_records.append({
+                    "Transformation Name": f"{columns}_Transformation",
+                    "Column_Name": columns,
+                    # "Key": key,
+                    "Patient_ID": key,
+                    "Source_Value": src_val,
+                    "Target_Value": "MISSING"
+                })
+            elif src_val != tgt_val:
+                mismatches.append({"Key": key, "Source_Value": src_val, "Target_Value": tgt_val})
+                mismatch_records.append({
+                    "Transformation Name": f"{columns}_Transformation",
+                    "Column_Name": columns,
+                    # "Key": key,
+                    "Patient_ID": key,
+                    "Source_Value": src_val,
+                    "Target_Value": tgt_val
+                })
+        return mismatches, mismatch_records
 
 
     def run(self, source_db, target_db, report_helper):
         # Read queries from SOURCEDB sheet
-        df = pd.read_excel(self.excel_path, sheet_name="TRANSFORMATION", engine="openpyxl")
+        df = read_sheet(self.excel_path, sheet_name="TRANSFORMATION", engine="openpyxl")
 
         # Filter only Is_Transformation = Y
         df = df[df["Is_Transformation"].str.upper() == "Y"]
@@ -29,37 +66,29 @@ class TransformationValidation:
             target_query = row.get("Target_Query")
             print(f"Executing Target Query: {target_query}")
 
-            source_data = source_db.execute_query(source_query)
-            target_data = target_db.execute_query(target_query)
-
-            # Convert to dict for row-by-row comparison
-            source_dict = {row[0]: row[1] for row in source_data if row[0] is not None}
-            target_dict = {row[0]: row[1] for row in target_data if row[0] is not None}
-
-
-            mismatches = []
-            for key, src_val in source_dict.items():
-                tgt_val = target_dict.get(key)
-                if tgt_val is None:
-                    mismatches.append({"Key": key, "Source_Value": src_val, "Target_Value": "MISSING"})
-                    mismatch_records.append({
-                        "Transformation Name": f"{columns}_Transformation",
-                        "Column_Name": columns,
-                        # "Key": key,
-                        "Patient_ID": key,
-                        "Source_Value": src_val,
-                        "Target_Value": "MISSING"
-                    })
-                elif src_val != tgt_val:
-                    mismatches.append({"Key": key, "Source_Value": src_val, "Target_Value": tgt_val})
-                    mismatch_records.append({
-                        "Transformation Name": f"{columns}_Transformation",
-                        "Column_Name": columns,
-                        # "Key": key,
-                        "Patient_ID": key,
-                        "Source_Value": src_val,
-                        "Target_Value": tgt_val
-                    })
+            # ⚡ Equal fingerprints of both (key, value) results → PASS without fetching them
+            gate = self.checksum_gate.compare_queries(source_db, source_query, target_db, target_query)
+            if gate == "MATCH":
+                mismatches, row_mismatches = [], []
+
+            # 🎯 Compare a hash-sampled key set first; escalate to the full comparison on mismatches
+            plan = self.sampling.plan_for_row(row, "Sample_Key") if gate != "MATCH" else None
+            sample = None
+            if plan is not None:
+                logging.info(f"Sampling transformation {columns} → {plan.label}")
+                source_data = source_db.execute_cached(
+                    self.sampling.sample_query(plan, source_query, "Sample_Key", "Sample_Value"))
+                target_data = target_db.execute_cached(
+                    self.sampling.sample_query(plan, target_query, "Sample_Key", "Sample_Value"))
+                mismatches, row_mismatches = self.compare(columns, source_data, target_data)
+                sample = (len(source_data), len(mismatches))
+
+            if gate != "MATCH" and (sample is None or (sample[1] > 0 and self.sampling.escalate)):
+                source_data = source_db.execute_cached(source_query)
+                target_data = target_db.execute_cached(target_query)
+                mismatches, row_mismatches = self.compare(columns, source_data, target_data)
+
+            mismatch_records.extend(row_mismatches)
             status = "PASS" if not mismatches else "FAIL"
 
             results.append({
@@ -67,8 +96,15 @@ class TransformationValidation:
                 "Transformation Name": f"{columns}_Transformation",  # ✅ added transformation name
                 "Column_Name": columns,   # <-- keep column name in report
                 "Mismatches": "Mismatch" if mismatches else "Matched",
-                "Status": status
+                "Status": status,
+                "Checksum_Gate": gate
             })
+            if sample is None:
+                self.sampling.not_sampled(results[-1])
+            else:
+                self.sampling.annotate(results[-1], plan, sample[1], sample[0])
+                if sample[1] > 0 and self.sampling.escalate:
+                    self.sampling.escalated(results[-1])
 
             if status == "PASS":
                 logging.info(f"✅ Transformation check passed for {columns}. No mismatches found.")
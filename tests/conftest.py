@@ -1,4 +1,6 @@
 import pytest
+import os
+import re
 import configparser
 import allure
 from datetime import datetime
@@ -6,35 +8,96 @@ from utils.db_helper import DBHelper
 from utils.config_loader import ConfigLoader
 from utils.report_helper import ReportHelper
 from utils.attach_excel_report_helper import ExcelReportHelper
+from utils.query_profiler import QueryProfiler
+from utils.run_history import RunHistory
+from utils.query_timeout import QueryTimeoutError
+from utils.extract_cache import ExtractCache
 
 
 def pytest_addoption(parser):
     parser.addoption(
         "--db", action="store", default=None,
-        help="Database section name from config.ini (e.g., SOURCEDB, STAGEDB, TARGETDB)"
+        help="Database section name from config.ini (e.g., SOURCEDB, STAGEDB, TARGETDB), "
+             "a comma list (SOURCEDB,STAGEDB) or 'all' (every section with a database)"
     )
+
+# --db sections of this run; more than one → per-database tests are parametrized per section
+_DB_SECTIONS = []
+
+def _db_sections(value, config_path="config.ini"):
+    """Expand --db: one section (as given), a comma list, or 'all'."""
+    if not value or ("," not in value and value.strip().lower() != "all"):
+        return [value]
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    if value.strip().lower() == "all":
+        return [s for s in config.sections() if config.has_option(s, "database")]
+    sections_lower = {s.lower(): s for s in config.sections()}
+    sections = []
+    for name in (n.strip() for n in value.split(",") if n.strip()):
+        if name.lower() not in sections_lower:
+            raise pytest.UsageError(f"--db: section '{name}' not found in {config_path}")
+        sections.append(sections_lower[name.lower()])
+    return list(dict.fromkeys(sections))
+
+def _multi_env():
+    return len(_DB_SECTIONS) > 1
+
+def _section_of(item):
+    """--db section a collected test runs against."""
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None and "config_loader" in callspec.params:
+        return callspec.params["config_loader"]
+    return None if _multi_env() else (_DB_SECTIONS or [None])[0]
+
+def pytest_configure(config):
+    _DB_SECTIONS[:] = _db_sections(config.getoption("--db"))
+    # pytest-xdist: one run id for the whole run, and a per-worker id for each worker's files
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        QueryProfiler.shared_run_id = workerinput.get("etl_run_id")
+        QueryProfiler.worker_id = workerinput.get("workerid")
+    else:
+        QueryProfiler.shared_run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if _multi_env():
+        print(f"🌐 Multi-environment run: {', '.join(_DB_SECTIONS)}")
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    # pytest-xdist controller → worker
+    node.workerinput["etl_run_id"] = QueryProfiler.shared_run_id
+
+def pytest_generate_tests(metafunc):
+    # 🌐 One session-scoped ConfigLoader (connection + DB sheet) per section; pytest groups tests by section
+    if _multi_env() and "config_loader" in metafunc.fixturenames:
+        metafunc.parametrize("config_loader", _DB_SECTIONS, indirect=True, scope="session", ids=_DB_SECTIONS)
 #---------------------------------------------------------------------------------------------
 def pytest_collection_modifyitems(config, items):
-    db = config.getoption("--db")
-    if db and db.upper() == "SOURCEDB":
-        skip_marker = pytest.mark.skip(reason="Not applicable for Source DB")
-        for item in items:
-            if "not_for_source" in item.keywords:
-                item.add_marker(skip_marker)
+    skip_marker = pytest.mark.skip(reason="Not applicable for Source DB")
+    for item in items:
+        section = _section_of(item)
+        if section and section.upper() == "SOURCEDB" and "not_for_source" in item.keywords:
+            item.add_marker(skip_marker)
+        # pytest -n <workers> --dist loadgroup (pytest-xdist) runs each environment on its own worker
+        if _multi_env() and section:
+            item.add_marker(pytest.mark.xdist_group(section))
 
 #---------------------------------------------------------------------------------------------
 
 @pytest.fixture()
 def db_name(request):
-    return request.config.getoption("--db").upper()
+    return (_section_of(request.node) or request.config.getoption("--db")).upper()
 
 #---------------------------------------------------------------------------------------------
 
 @pytest.fixture(scope="session")
 def config_loader(request):
-    """Fixture to load config once per test session"""
-    db_name = request.config.getoption("--db")   # e.g. SOURCEDB
-    return ConfigLoader("config.ini", section_name=db_name)
+    """Fixture to load config once per test session (once per section with --db all / a list)"""
+    db_name = getattr(request, "param", None) or request.config.getoption("--db")   # e.g. SOURCEDB
+    loader = ConfigLoader("config.ini", section_name=db_name)
+    if _multi_env():
+        loader.report_helper.environment = loader.section_name
+    return loader
 
 
 #---------------------------------------------------------------------------------------------
@@ -100,35 +163,128 @@ def report_helper():
 #---------------------------------------------------------------------------------------------
 
 
+# One helper for the whole run: its content-addressed store links each distinct workbook once
+_EXCEL_HELPER = ExcelReportHelper()
+
 @pytest.fixture()
 def excel_helper():
-    return ExcelReportHelper()
+    return _EXCEL_HELPER
 
-def _get_excel_path():
-    config = configparser.ConfigParser()
-    config.read("config.ini")
-    try:
-        return config.get("PATHS", "excel_file_path")
-    except Exception:
-        return None
+# Tests stopped by a [TIMEOUTS] limit, written to a Query_Timeouts report at the end of the run
+_QUERY_TIMEOUTS = []
+
+# One row per test and environment for the consolidated Multi_Environment_Summary report
+_ENV_RESULTS = []
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    # Remember where this test's queries and reports start
+    item._profile_mark = QueryProfiler.get().begin_check(item.nodeid)
+    item._report_mark = len(ReportHelper.saved_reports)
+    # Run: every --db section (expanded); check and its result rows: the section this test runs against
+    RunHistory.get().begin_check(item.nodeid, db_section=",".join(s for s in _DB_SECTIONS if s) or None,
+                                 environment=_section_of(item))
+
+def _attach_query_profile(item):
+    """Add a Query_Profile sheet to the test's reports and the slowest statements to Allure."""
+    profiler = QueryProfiler.get()
+    records = profiler.since(getattr(item, "_profile_mark", len(profiler.records)))
+    if not records:
+        return
+    for report_file in ReportHelper.saved_reports[getattr(item, "_report_mark", 0):]:
+        ReportHelper.append_query_profile(report_file, records)
+    allure.attach(
+        profiler.slowest_html(records),
+        name=f"Slowest {profiler.slowest_n} Queries",
+        attachment_type=allure.attachment_type.HTML
+    )
+    for record in records:
+        if record.get("plan_file") and os.path.exists(record["plan_file"]):
+            allure.attach.file(
+                record["plan_file"],
+                name=f"Plan {record['validator'] or ''} {record['table'] or ''} ({record['wall_ms']} ms)",
+                extension="sqlplan"
+            )
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
 
-    # 🔹 Attach Excel for both pass & fail, but only once (after "call" phase)
     if rep.when == "call":
-        excel_path = _get_excel_path()
-        if excel_path:
-            excel_helper = item.funcargs.get("excel_helper", None)
-            if excel_helper:
-                try:
-                    # Build readable link name per test
-                    test_name = item.originalname or item.name
-                    pretty_name = test_name.replace("_", " ").title()
-                    link_name = f"{pretty_name} Excel"
-
-                    excel_helper.attach_excel(excel_path, link_name=link_name)
-                except Exception as e:
-                    print(f"⚠️ Could not attach Excel for {item.name}: {e}")
\ No newline at end of file
+        # ⏱️ A statement cancelled by [TIMEOUTS] fails only this test; the suite moves on
+        timeout = QueryTimeoutError.find(call.excinfo.value) if call.excinfo else None
+        if timeout is not None:
+            # Collected from the report (pytest_runtest_logreport), so the xdist controller sees it too
+            rep.user_properties.append(("query_timeout", {
+                "Test": item.nodeid,
+                "Validator": timeout.validator,
+                "Timeout_Seconds": timeout.seconds,
+                "Statement": timeout.statement[:4000],
+                "Status": "TIMEOUT",
+            }))
+        records = QueryProfiler.get().since(getattr(item, "_profile_mark", 0))
+        RunHistory.get().end_check(item.nodeid, "TIMEOUT" if timeout else rep.outcome, rep.duration,
+                                   queries=len(records),
+                                   query_ms=round(sum(r["wall_ms"] for r in records), 1))
+        try:
+            _attach_query_profile(item)
+        except Exception as e:
+            print(f"⚠️ Could not attach query profile for {item.name}: {e}")
+
+    # 🌐 Travels with the report (also to the pytest-xdist controller) for the consolidated summary
+    if rep.when == "call" or rep.outcome != "passed":
+        rep.user_properties.append(("environment", _section_of(item) or "-"))
+        rep.user_properties.append(("reports", "; ".join(
+            os.path.basename(f) for f in ReportHelper.saved_reports[getattr(item, "_report_mark", 0):])))
+
+    # 🔹 Attach the test's result workbooks for both pass & fail, only once (after "call" phase)
+    if rep.when == "call":
+        report_files = ReportHelper.saved_reports[getattr(item, "_report_mark", 0):]
+        if report_files:
+            try:
+                # Build readable link name per test
+                test_name = item.originalname or item.name
+                pretty_name = test_name.replace("_", " ").title()
+                _EXCEL_HELPER.attach_reports(report_files, link_name=f"{pretty_name} Excel")
+            except Exception as e:
+                print(f"⚠️ Could not attach Excel for {item.name}: {e}")
+
+def pytest_runtest_logreport(report):
+    properties = dict(report.user_properties)
+    if "query_timeout" in properties:
+        _QUERY_TIMEOUTS.append(properties["query_timeout"])
+    if not _multi_env() or (report.when != "call" and report.outcome == "passed") or report.when == "teardown":
+        return
+    _ENV_RESULTS.append({
+        "Environment": properties.get("environment", "-"),
+        "Check": re.sub(r"\[[^\]]*\]$", "", report.nodeid),
+        "Test": report.nodeid,
+        "Outcome": ("ERROR" if report.when == "setup" and report.failed else report.outcome.upper()),
+        "Duration_s": round(report.duration, 2),
+        "Reports": properties.get("reports", ""),
+    })
+
+def pytest_sessionfinish(session, exitstatus):
+    # 🌐 Workers (pytest-xdist) leave the consolidated reports to the controller
+    is_worker = hasattr(session.config, "workerinput")
+    if _ENV_RESULTS and not is_worker:
+        try:
+            ReportHelper(config_path="config.ini").save_environment_summary(_ENV_RESULTS)
+        except Exception as e:
+            print(f"⚠️ Could not save the multi-environment summary: {e}")
+    if _QUERY_TIMEOUTS and not is_worker:
+        try:
+            ReportHelper(config_path="config.ini").save_report(_QUERY_TIMEOUTS, test_type="Query_Timeouts")
+        except Exception as e:
+            print(f"⚠️ Could not save the query timeout report: {e}")
+    RunHistory.get().end_run(int(exitstatus))
+    # 🗃️ Extracts reused across checks; spill files are only valid for this run
+    extract_cache = ExtractCache.get()
+    if extract_cache.hits or extract_cache.misses:
+        print(f"🗃️ Extract cache: {extract_cache.summary()}")
+    extract_cache.clear()
+    # ✅ PDF reports render in the background; make sure they are written before exit
+    pdfs = ReportHelper.wait_for_pdf_reports()
+    if pdfs:
+        print(f"📄 {len(pdfs)} PDF report(s) written")
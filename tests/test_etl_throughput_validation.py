@@ -0,0 +1,5 @@
+from src.etl_throughput_validation import ETLThroughputValidation
+
+def test_ETL_Throughput_validation(config_loader):
+    validator = ETLThroughputValidation(config_loader)
+    validator.run()
@@ -26,6 +26,7 @@ from src.ETLProcess_vs_Details_log_validation import Process_vs_Detail_log_Valid
 from src.deleted_vs_source_validation import DeletedVsSource_Validation
 from src.deleted_vs_target_validation import DeletedVsTarget_Validation
 from src.readd_record_validation import ReAddedRecords_Validation
+from src.etl_throughput_validation import ETLThroughputValidation
 
 log = logging.getLogger(__name__)
 
@@ -188,6 +189,12 @@ def test_ETLProcess_vs_Details_log_validation(config_loader):
     validator = Process_vs_Detail_log_Validation(config_loader)
     validator.run()
 
+@pytest.mark.skipif(not should_run("ETL_Throughput_validation"), reason="Marked N in Excel")
+@pytest.mark.not_for_source
+def test_ETL_Throughput_validation(config_loader):
+    validator = ETLThroughputValidation(config_loader)
+    validator.run()
+
 @pytest.mark.skipif(not should_run("DeletedVsTarget_validation"), reason="Marked N in Excel")
 @pytest.mark.not_for_source
 def test_deletedVsTarget_validation(config_loader):
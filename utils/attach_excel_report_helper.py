@@ -1,26 +1,62 @@
 import os
 import shutil
+import hashlib
+import logging
 import allure
 
 class ExcelReportHelper:
+    # Content-addressed store shared by every helper of the run:
+    # (abs path, size, mtime_ns, store dir) → link, and (store dir, sha256) → link
+    _stored = {}
+    _by_digest = {}
+
     def __init__(self, allure_report_dir="Reports/allure-report"):
         self.allure_report_dir = allure_report_dir
         self.excel_dir = os.path.join(allure_report_dir, "excel")
         os.makedirs(self.excel_dir, exist_ok=True)
 
-    def attach_excel(self, excel_path, link_name="Excel Report"):
+    @staticmethod
+    def _sha256(path, chunk_size=1024 * 1024):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def store(self, file_path):
         """
-        Copy Excel to allure-report/excel/ and attach a clickable link.
+        Put file_path into allure-report/excel/ once per distinct content and return its
+        relative link. Hardlinks when source and report share a filesystem, copies otherwise.
         """
-        if not os.path.exists(excel_path):
-            raise FileNotFoundError(f"Excel file not found: {excel_path}")
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Excel file not found: {file_path}")
+
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, os.path.abspath(self.excel_dir))
+        if key in ExcelReportHelper._stored:
+            return ExcelReportHelper._stored[key]
+
+        digest = self._sha256(file_path)
+        relative_path = ExcelReportHelper._by_digest.get((key[3], digest))
+        if relative_path is None:
+            name = f"{digest[:12]}_{os.path.basename(file_path)}"
+            dest_path = os.path.join(self.excel_dir, name)
+            if not os.path.exists(dest_path):   # stored by an earlier run into the same folder
+                try:
+                    os.link(file_path, dest_path)
+                except OSError:
+                    shutil.copy2(file_path, dest_path)
+            relative_path = f"excel/{name}"
+            ExcelReportHelper._by_digest[(key[3], digest)] = relative_path
 
-        # Copy Excel file to allure-report/excel
-        dest_path = os.path.join(self.excel_dir, os.path.basename(excel_path))
-        shutil.copy(excel_path, dest_path)
+        ExcelReportHelper._stored[key] = relative_path
+        return relative_path
 
-        # Create relative path for link
-        relative_path = f"excel/{os.path.basename(excel_path)}"
+    def attach_excel(self, excel_path, link_name="Excel Report"):
+        """
+        Store Excel in allure-report/excel/ (once per content) and attach a clickable link.
+        """
+        relative_path = self.store(excel_path)
         link_html = f'<a href="{relative_path}" target="_blank">{link_name}</a>'
 
         # Attach clickable link to Allure
@@ -28,4 +64,21 @@ class ExcelReportHelper:
             link_html,
             name=link_name,
             attachment_type=allure.attachment_type.HTML
-        )
\ No newline at end of file
+        )
+        return relative_path
+
+    def attach_reports(self, report_paths, link_name="Result Workbooks"):
+        """Attach one HTML list linking every result workbook a test produced."""
+        links = []
+        for path in report_paths:
+            try:
+                links.append(f'<li><a href="{self.store(path)}" target="_blank">{os.path.basename(path)}</a></li>')
+            except Exception as e:
+                logging.warning(f"⚠️ Could not store {path} for Allure: {e}")
+        if links:
+            allure.attach(
+                f"<ul>{''.join(links)}</ul>",
+                name=link_name,
+                attachment_type=allure.attachment_type.HTML
+            )
+        return len(links)
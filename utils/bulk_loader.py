@@ -0,0 +1,135 @@
+import os
+import time
+import logging
+import argparse
+import configparser
+import pandas as pd
+from utils.db_helper import DBHelper
+
+
+class BulkLoader:
+    """
+    Streams CSV / Parquet files into a SQL Server table through a DBHelper connection.
+
+    Rows are sent in batches with pyodbc fast_executemany (one round trip per batch) or,
+    when a table type is configured, as a table-valued parameter. INSERT ... WITH (TABLOCK)
+    allows minimal logging on heaps / empty tables under SIMPLE or BULK_LOGGED recovery.
+    Settings come from the [BULK_LOAD] section of config.ini.
+    """
+
+    def __init__(self, db, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.db = db
+        self.batch_size = config.getint("BULK_LOAD", "batch_size", fallback=50000)
+        self.method = config.get("BULK_LOAD", "method", fallback="fast_executemany").strip().lower()
+        self.tablock = config.getboolean("BULK_LOAD", "tablock", fallback=True)
+        # Table type for method = tvp, e.g. dbo.PatientsRowType (must match the file columns)
+        self.tvp_type = config.get("BULK_LOAD", "tvp_type", fallback="").strip()
+
+    # ------------------------------------------------------------------
+    def iter_chunks(self, path, columns=None):
+        """Yield DataFrames of batch_size rows from a CSV or Parquet file."""
+        if path.lower().endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.batch_size, columns=columns):
+                yield batch.to_pandas()
+        else:
+            # Read everything as text: ids / phone numbers keep their leading zeros, SQL Server converts
+            yield from pd.read_csv(path, chunksize=self.batch_size, dtype=str,
+                                   usecols=columns, keep_default_na=False, na_values=[""])
+
+    @staticmethod
+    def _rows(df):
+        """DataFrame → list of tuples with NaN / NaT as None."""
+        return list(df.astype(object).where(pd.notna(df), None).itertuples(index=False, name=None))
+
+    def _insert_sql(self, table, columns):
+        hint = " WITH (TABLOCK)" if self.tablock else ""
+        col_list = ", ".join(f"[{c}]" for c in columns)
+        if self.method == "tvp":
+            return f"INSERT INTO {table}{hint} ({col_list}) SELECT {col_list} FROM ?"
+        return f"INSERT INTO {table}{hint} ({col_list}) VALUES ({', '.join('?' for _ in columns)})"
+
+    def _tvp_param(self, rows):
+        schema, _, type_name = self.tvp_type.rpartition(".")
+        return [[type_name, schema or "dbo"] + rows]
+
+    # ------------------------------------------------------------------
+    def load(self, path, table, columns=None, truncate=False):
+        """Load one file into table; returns rows / seconds / rows_per_sec."""
+        if self.method == "tvp" and not self.tvp_type:
+            raise ValueError("❌ [BULK_LOAD] method = tvp needs tvp_type (e.g. dbo.PatientsRowType)")
+
+        # Raw pyodbc connection: fast_executemany must be set on the real cursor, and per-batch
+        # profiling records would only add overhead here
+        conn = getattr(self.db.conn, "raw", self.db.conn)
+        cursor = conn.cursor()
+        total_rows, batches = 0, 0
+        start_time = time.time()
+        try:
+            if truncate:
+                cursor.execute(f"TRUNCATE TABLE {table}")
+                conn.commit()
+
+            if hasattr(cursor, "fast_executemany"):   # pyodbc
+                cursor.fast_executemany = True
+            sql = None
+            for df in self.iter_chunks(path, columns):
+                if df.empty:
+                    continue
+                if sql is None:
+                    sql = self._insert_sql(table, list(df.columns))
+                rows = self._rows(df)
+                if self.method == "tvp":
+                    cursor.execute(sql, self._tvp_param(rows))
+                else:
+                    cursor.executemany(sql, rows)
+                conn.commit()
+
+                total_rows += len(rows)
+                batches += 1
+                elapsed = time.time() - start_time
+                logging.info(f"📦 {table}: {total_rows:,} rows ({total_rows / elapsed:,.0f} rows/s)")
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"❌ Bulk load of {path} into {table} failed after {total_rows:,} rows: {e}")
+            raise
+        finally:
+            cursor.close()
+
+        elapsed = time.time() - start_time
+        result = {
+            "File": os.path.basename(path),
+            "Table": table,
+            "Method": self.method,
+            "Batch_Size": self.batch_size,
+            "Batches": batches,
+            "Rows": total_rows,
+            "Seconds": round(elapsed, 2),
+            "Rows_Per_Sec": round(total_rows / elapsed) if elapsed else None,
+        }
+        logging.info(f"✅ Loaded {total_rows:,} rows into {table} in {result['Seconds']} s "
+                     f"({result['Rows_Per_Sec'] or 0:,} rows/s)")
+        return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Bulk load CSV / Parquet files into a database from config.ini")
+    parser.add_argument("--db", required=True, help="config.ini section, e.g. SOURCEDB")
+    parser.add_argument("--load", nargs=2, action="append", metavar=("FILE", "TABLE"), required=True,
+                        help="file and target table; repeat for several files")
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument("--truncate", action="store_true", help="TRUNCATE the table before loading")
+    args = parser.parse_args()
+
+    db = DBHelper.from_config_section(args.config, args.db.upper())
+    db.connect()
+    try:
+        loader = BulkLoader(db, args.config)
+        for file_path, table_name in args.load:
+            loader.load(file_path, table_name, truncate=args.truncate)
+    finally:
+        db.close()
@@ -0,0 +1,106 @@
+import logging
+import configparser
+from utils.query_timeout import QueryTimeoutError
+
+
+class ChecksumGate:
+    """
+    Cheap pre-check before a full row comparison (EXCEPT / key-value compare).
+
+    Each side is reduced in one scan to a fingerprint:
+        COUNT_BIG(*), CHECKSUM_AGG(BINARY_CHECKSUM(cols)), SUM(CAST(BINARY_CHECKSUM(cols) AS BIGINT))
+    (the SUM does not cancel out pairs of identical rows the way the XOR-based CHECKSUM_AGG does).
+    Equal fingerprints → the comparison is skipped and the table is marked PASS; any difference,
+    or a failed fingerprint query, falls through to the full comparison.
+
+    BINARY_CHECKSUM ignores text / ntext / image / xml / sql_variant ... columns, so tables
+    comparing such columns are never gated. Settings: [CHECKSUM_GATE] in config.ini.
+    """
+
+    # Types BINARY_CHECKSUM skips: a difference there would go unseen
+    NON_COMPARABLE = {"text", "ntext", "image", "xml", "sql_variant", "cursor", "geography", "geometry", "hierarchyid"}
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.enabled = config.getboolean("CHECKSUM_GATE", "enabled", fallback=False)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def fingerprint_sql(source, columns, where=""):
+        """One-scan fingerprint of columns over source (a table name or '(query) AS q (cols)')."""
+        cols = ", ".join(columns)
+        where = f"WHERE {where}" if where else ""
+        return f"""
+            SELECT COUNT_BIG(*) AS Row_Count,
+                   CHECKSUM_AGG(BINARY_CHECKSUM({cols})) AS Checksum_Agg,
+                   SUM(CAST(BINARY_CHECKSUM({cols}) AS BIGINT)) AS Checksum_Sum
+            FROM {source}
+            {where}
+        """
+
+    def _fingerprint(self, db, source, columns, where=""):
+        raw = db.execute_query(self.fingerprint_sql(source, columns, where))
+        return tuple(raw[0]) if raw else None
+
+    def comparable(self, db, table, columns):
+        """False when one of the compared columns has a type BINARY_CHECKSUM ignores."""
+        names = [c.strip("[]") for c in columns]
+        raw = db.execute_query(
+            f"""
+            SELECT COLUMN_NAME, DATA_TYPE
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_NAME = '{table}'
+            """
+        )
+        skipped = [name for name, data_type in raw if name in names and str(data_type).lower() in self.NON_COMPARABLE]
+        if skipped:
+            logging.info(f"🔎 Checksum gate off for {table}: {', '.join(skipped)} not covered by BINARY_CHECKSUM")
+        return not skipped
+
+    def _verdict(self, left, right, label):
+        if left is None or right is None:
+            return "UNAVAILABLE"
+        if left == right:
+            logging.info(f"⚡ {label}: fingerprints match ({left[0]} rows), full comparison skipped")
+            return "MATCH"
+        logging.info(f"🔎 {label}: fingerprints differ {left} vs {right}, running full comparison")
+        return "DIFFERENT"
+
+    # ------------------------------------------------------------------
+    def compare_tables(self, left, right, columns):
+        """
+        left / right: (db, database, table, where) — where may be '' (e.g. the Is_Current filter).
+        Returns MATCH (skip the comparison, PASS), DIFFERENT, UNAVAILABLE or OFF.
+        """
+        if not self.enabled:
+            return "OFF"
+        columns = [c.strip() for c in columns.split(",")] if isinstance(columns, str) else list(columns)
+        try:
+            if not all(self.comparable(db, table, columns) for db, _, table, _ in (left, right)):
+                return "UNAVAILABLE"
+            prints = [self._fingerprint(db, f"{database}.dbo.{table}", columns, where)
+                      for db, database, table, where in (left, right)]
+        except QueryTimeoutError:
+            raise
+        except Exception as e:
+            logging.warning(f"⚠️ Checksum gate unavailable for {left[2]} ↔ {right[2]}: {e}")
+            return "UNAVAILABLE"
+        return self._verdict(prints[0], prints[1], f"{left[2]} ↔ {right[2]}")
+
+    def compare_queries(self, left_db, left_query, right_db, right_query, columns=("Gate_Key", "Gate_Value")):
+        """Same gate for two (key, value) queries, e.g. a TRANSFORMATION row's Source / Target queries."""
+        if not self.enabled:
+            return "OFF"
+        aliases = ", ".join(columns)
+        try:
+            prints = [
+                self._fingerprint(db, f"({query.strip().rstrip(';')}) AS q ({aliases})", [f"q.{c}" for c in columns])
+                for db, query in ((left_db, left_query), (right_db, right_query))
+            ]
+        except QueryTimeoutError:
+            raise
+        except Exception as e:
+            logging.warning(f"⚠️ Checksum gate unavailable for transformation queries: {e}")
+            return "UNAVAILABLE"
+        return self._verdict(prints[0], prints[1], "transformation queries")
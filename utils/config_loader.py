@@ -1,9 +1,11 @@
 import pytest
 import configparser
-import pandas as pd
 from tkinter import simpledialog, Tk
 from utils.db_helper import DBHelper
 from utils.report_helper import ReportHelper
+from utils.result_cache import ResultCache
+from utils.rule_model import RuleBook
+from utils.workbook_cache import WorkbookCache
 
 
 class ConfigLoader:
@@ -65,7 +67,8 @@ class ConfigLoader:
 
             # Load matching Excel sheet
             try:
-                self.df = pd.read_excel(self.excel_path, sheet_name=self.section_name)
+                # Parsed once per run and shared with the other sections / validators
+                self.df = WorkbookCache.get(config_path).read_sheet(self.excel_path, sheet_name=self.section_name)
                 print(f"Loaded data from Excel sheet: {self.section_name}")
             except ValueError:
                 # root.destroy()
@@ -77,7 +80,15 @@ class ConfigLoader:
             # Create report helper
             self.report_helper = ReportHelper(config_path)
 
+            # Verdict cache for unchanged tables
+            self.result_cache = ResultCache(config_path)
+
         finally:
             # ✅ destroy only if created
             if root is not None:
-                root.destroy()
\ No newline at end of file
+                root.destroy()
+
+    @property
+    def rules(self):
+        """The DB sheet compiled into a RuleBook (table → rules / composite keys / custom SQL)."""
+        return RuleBook.for_sheet(self.excel_path, self.section_name, self.df)
@@ -1,20 +1,63 @@
-import pyodbc
+import os
 import logging
+import importlib
 import configparser
+from utils.query_profiler import QueryProfiler
+from utils.extract_cache import ExtractCache
+
+
+def _sqlserver_connection(helper):
+    """Default engine: SQL Server through pyodbc."""
+    import pyodbc
+
+    if helper.username and helper.password:
+        # SQL Authentication
+        conn_str = (
+            f"DRIVER={helper.driver};"
+            f"SERVER={helper.server};"
+            f"DATABASE={helper.database};"
+            f"UID={helper.username};"
+            f"PWD={helper.password}"
+        )
+    else:
+        # Windows Authentication
+        conn_str = (
+            f"DRIVER={helper.driver};"
+            f"SERVER={helper.server};"
+            f"DATABASE={helper.database};"
+            f"Trusted_Connection=yes;"
+        )
+    conn = pyodbc.connect(conn_str)
+    # ⏱️ Driver-side backstop only when [TIMEOUTS] connection_timeout is set; the check limits are the watchdog's
+    conn.timeout = helper.profiler.timeouts.connection_timeout()
+    return conn
+
 
 class DBHelper:
-    def __init__(self, server, database, driver, username=None, password=None):
+    # engine name → callable(DBHelper) returning a DB-API connection
+    # Other engines live in utils/<engine>_engine.py and register themselves on import
+    CONNECTION_FACTORIES = {"sqlserver": _sqlserver_connection}
+
+    def __init__(self, server, database, driver, username=None, password=None, engine="sqlserver", options=None):
         self.server = server
         self.database = database
         self.driver = driver
         self.username = username
         self.password = password
+        self.engine = engine
+        self.options = options or {}
         self.conn = None
+        self.profiler = QueryProfiler.get()
+
+    @classmethod
+    def register_connection_factory(cls, engine, factory):
+        """Make a new engine available to every DBHelper (engine = <name> in config.ini)."""
+        cls.CONNECTION_FACTORIES[engine.lower()] = factory
 
     @classmethod
     # def from_config(cls, config_path,section_name):
-    def from_config_section(cls, config_path,section_name):    
-        """Load DB config from a config.ini file."""
+    def from_config_section(cls, config_path,section_name, use_snapshot=True):    
+        """Load DB config from a config.ini file ([SNAPSHOT] offline = true → local snapshot engine)."""
         config = configparser.ConfigParser()
         config.read(config_path)
 
@@ -23,45 +66,46 @@ class DBHelper:
         # driver = config.get("SOURCEDB", "driver")
         # username = config.get("SOURCEDB", "username", fallback="").strip() or None
         # password = config.get("SOURCEDB", "password", fallback="").strip() or None
-        server = config.get(section_name, "server")
+        engine = config.get(section_name, "engine", fallback="sqlserver").strip().lower()
+        if engine == "sqlserver":
+            server = config.get(section_name, "server")
+            driver = config.get(section_name, "driver")
+        else:
+            server = config.get(section_name, "server", fallback=engine)
+            driver = config.get(section_name, "driver", fallback=None)
         database = config.get(section_name, "database")
-        driver = config.get(section_name, "driver")
         username = config.get(section_name, "username", fallback="").strip() or None
         password = config.get(section_name, "password", fallback="").strip() or None
 
+        options = dict(config.items(section_name))
+        # 📦 Offline: read the Parquet snapshot of this database (python -m utils.snapshot_store)
+        if use_snapshot and config.getboolean("SNAPSHOT", "offline", fallback=False):
+            engine = "snapshot"
+            options["snapshot_dir"] = config.get("SNAPSHOT", "snapshot_dir", fallback=os.path.join("Reports", "snapshots"))
 
-        return cls(server, database, driver, username, password)
+        QueryProfiler.get(config_path)
+        ExtractCache.get(config_path)
+        return cls(server, database, driver, username, password,
+                   engine=engine, options=options)
 
     def connect(self):
         try:
-            if self.username and self.password:
-                # SQL Authentication
-                conn_str = (
-                    f"DRIVER={self.driver};"
-                    f"SERVER={self.server};"
-                    f"DATABASE={self.database};"
-                    f"UID={self.username};"
-                    f"PWD={self.password}"
-                )
-            else:
-                # Windows Authentication
-                conn_str = (
-                    f"DRIVER={self.driver};"
-                    f"SERVER={self.server};"
-                    f"DATABASE={self.database};"
-                    f"Trusted_Connection=yes;"
-                )
-
-            self.conn = pyodbc.connect(conn_str)
-            logging.info("✅ Database connection established.")
+            factory = self.CONNECTION_FACTORIES.get(self.engine)
+            if factory is None:
+                importlib.import_module(f"utils.{self.engine}_engine")
+                factory = self.CONNECTION_FACTORIES[self.engine]
+
+            # Every cursor (execute_query, conn.cursor(), pd.read_sql) goes through the profiler
+            self.conn = self.profiler.wrap(factory(self))
+            logging.info(f"✅ Database connection established ({self.engine}).")
         except Exception as e:
             logging.error(f"❌ Error connecting to database: {e}")
             raise
 
-    def execute_query(self, query):
+    def execute_query(self, query, *params):
         try:
             cursor = self.conn.cursor()
-            cursor.execute(query)
+            cursor.execute(query, *params)   # ? placeholders, pyodbc style
             # row = cursor.fetchone()
             row = cursor.fetchall()
             # if row:
@@ -70,6 +114,7 @@ class DBHelper:
             #     return None  # Or 0, or raise exception as per your need
             
             result = [tuple(r) for r in row]
+            cursor.close()
             return result
     
             # return row  # return everything
@@ -77,6 +122,37 @@ class DBHelper:
             logging.error(f"❌ Error executing query '{query}': {e}")
             raise
 
+    def execute_cached(self, query, *params):
+        """execute_query through the run's ExtractCache: the same result is fetched once per run."""
+        return ExtractCache.get().fetch(self, query, *params)
+
+    def iter_query(self, query, *params, batch_size=10000, describe=False):
+        """
+        Yield (column names, rows) batches with fetchmany, so large results never sit in memory at once.
+        describe=True yields cursor.description (declared types, precision, scale) instead of the names.
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, *params)
+            if describe:
+                columns = list(cursor.description or [])
+            else:
+                columns = [col[0] for col in cursor.description] if cursor.description else []
+            empty = True
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                empty = False
+                yield columns, rows
+            if empty:
+                yield columns, []   # an empty result still reports its columns
+        except Exception as e:
+            logging.error(f"❌ Error executing query '{query}': {e}")
+            raise
+        finally:
+            cursor.close()
+
     def execute_non_query(self, query):
         """Executes a query that does not return rows (INSERT/UPDATE/EXEC)."""
         cursor = self.conn.cursor()
@@ -85,6 +161,17 @@ class DBHelper:
             self.conn.commit()
         finally:
             cursor.close()
+            # Data may have changed (ETL job, load): everything read before is stale
+            self.data_changed()
+
+    @staticmethod
+    def data_changed():
+        """Forget results read before a write: cached extracts, ETL audit snapshots, deleted-key scans."""
+        from utils.etl_audit_snapshot import ETLAuditSnapshot
+        from utils.deleted_record_lifecycle import DeletedRecordLifecycle
+        ExtractCache.get().clear()
+        ETLAuditSnapshot.clear()
+        DeletedRecordLifecycle.clear()
               
 
     def close(self):
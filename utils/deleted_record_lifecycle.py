@@ -0,0 +1,183 @@
+import os
+import logging
+import configparser
+import pandas as pd
+from utils.workbook_cache import read_sheet
+from utils.rule_model import RuleBook
+
+
+def _qualify(table, database):
+    """Bare table names get the database of their config section (one query spans all three)."""
+    return table if "." in table or not database else f"{database}.dbo.{table}"
+
+
+class DeletedRecordLifecycle:
+    """
+    Lifecycle of every key of a deleted_table, classified with one set-based query:
+
+      - CLOSED          : no longer in source, target version closed at the delete
+      - STILL_ACTIVE    : no longer in source, but still current in target
+      - STILL_IN_SOURCE : deleted, but still present in source (not re-added in target)
+      - RE_ADDED        : back in source with a current target version
+
+    plus the flags the three checks assert on (In_Source, Active_In_Target, Readd_Rule_Broken),
+    their counts and up to sample_rows sample keys per flag ([DELETED_LIFECYCLE], else [DETAILS]).
+    DeletedVsTarget, DeletedVsSource and ReAddedRecords share the scans until the next write
+    through DBHelper (ETL job start, load), so running the three costs one pass per deleted
+    table and no verdict comes from before the ETL.
+    """
+
+    _plans = {}   # (excel path, mtime) → table entries
+    _cache = {}   # (server, deleted, target, source, keys) → scan
+
+    FLAGS = ("In_Source", "Active_In_Target", "Readd_Rule_Broken")
+
+    def __init__(self, db, config_path="config.ini"):
+        self.db = db
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        # Same bound as the other checks' failure rows ([DETAILS]) unless set here
+        self.sample_rows = config.getint("DELETED_LIFECYCLE", "sample_rows",
+                                         fallback=config.getint("DETAILS", "sample_rows", fallback=100))
+        self.source_database = config.get("SOURCEDB", "database", fallback="").strip()
+        self.target_database = config.get("TARGETDB", "database", fallback="").strip()
+        self.excel_path = config.get("PATHS", "excel_file_path", fallback="")
+
+    # ------------------------------------------------------------------
+    def tables(self):
+        """
+        One entry per Table_Mapping row with a deleted_table:
+        dict(source_table, target_table, deleted_table, target_keys, source_keys).
+        Sheets are read once per workbook version.
+        """
+        plan_key = (self.excel_path, os.path.getmtime(self.excel_path))
+        if plan_key in DeletedRecordLifecycle._plans:
+            return DeletedRecordLifecycle._plans[plan_key]
+
+        def sheet(name):
+            try:
+                return read_sheet(self.excel_path, sheet_name=name, engine="openpyxl")
+            except Exception as e:
+                logging.error(f"❌ Could not load '{name}' sheet: {e}")
+                return pd.DataFrame()
+
+        mapping_df = sheet("Table_Mapping")
+        target_keys = RuleBook.for_sheet(self.excel_path, "TARGETDB", sheet("TARGETDB")).composite_keys()
+        source_keys = RuleBook.for_sheet(self.excel_path, "SOURCEDB", sheet("SOURCEDB")).composite_keys()
+
+        entries = []
+        for _, row in mapping_df.iterrows():
+            deleted_table = row.get("deleted_table", "")
+            if pd.isna(deleted_table) or str(deleted_table).strip() == "":
+                continue  # skip if no deleted table
+            source_table = str(row["source_table"]).strip()
+            target_table = str(row["target_table"]).strip()
+            entries.append({
+                "source_table": source_table,
+                "target_table": target_table,
+                "deleted_table": str(deleted_table).strip(),
+                "target_keys": target_keys.get(target_table, []),
+                "source_keys": source_keys.get(source_table, []),
+            })
+            for table, keys in ((target_table, entries[-1]["target_keys"]), (source_table, entries[-1]["source_keys"])):
+                if not keys:
+                    logging.warning(f"⚠️ No composite keys found for {table}")
+
+        DeletedRecordLifecycle._plans = {plan_key: entries}
+        return entries
+
+    # ------------------------------------------------------------------
+    def _query(self, entry):
+        keys = entry["target_keys"]
+        # Source join on the source sheet keys when they line up with the target ones
+        src_keys = entry["source_keys"] if len(entry["source_keys"]) == len(keys) else keys
+        deleted = _qualify(entry["deleted_table"], self.target_database)
+        target = _qualify(entry["target_table"], self.target_database)
+        source = _qualify(entry["source_table"], self.source_database)
+
+        key_cols = ", ".join(f"D.{k}" for k in keys)
+        t_join = " AND ".join(f"T.{k} = D.{k}" for k in keys)
+        s_join = " AND ".join(f"S.{k} = D.{k}" for k in src_keys)
+        s_found = f"S.{src_keys[0]} IS NOT NULL"
+        active = "(UPPER(CAST(T.Is_Current AS VARCHAR)) <> '0' AND UPPER(CAST(T.Is_Current AS VARCHAR)) <> 'FALSE')"
+        current = "(UPPER(CAST(T.Is_Current AS VARCHAR)) = '1' OR UPPER(CAST(T.Is_Current AS VARCHAR)) = 'TRUE')"
+        order = ", ".join(keys)
+        sample = " OR ".join(f"({flag} = 1 AND {flag}_Rank <= {self.sample_rows})" for flag in self.FLAGS)
+
+        return f"""
+            WITH per_key AS (
+                SELECT {key_cols},
+                       MAX(D.CreatedDTM) AS Deleted_At,
+                       MAX(CASE WHEN {s_found} THEN 1 ELSE 0 END) AS In_Source,
+                       MAX(CASE WHEN {active} AND T.Version_End_Date <> D.CreatedDTM
+                                THEN 1 ELSE 0 END) AS Active_In_Target,
+                       MAX(CASE WHEN {s_found} AND {current} THEN 1 ELSE 0 END) AS Re_Added,
+                       MAX(CASE WHEN {s_found} AND {current}
+                                     AND CAST(T.Version_Begin_Date AS DATE) <> CAST(GETDATE() AS DATE)
+                                     AND T.Version_End_Date NOT IN ('3000-12-31') AND T.Version_End_Date IS NOT NULL
+                                THEN 1 ELSE 0 END) AS Readd_Rule_Broken,
+                       MAX(CASE WHEN {current} THEN T.Version_Begin_Date END) AS Current_Version_Begin,
+                       MAX(CASE WHEN {current} THEN T.Version_End_Date END) AS Current_Version_End
+                FROM {deleted} D
+                LEFT JOIN {source} S ON {s_join}
+                LEFT JOIN {target} T ON {t_join}
+                GROUP BY {key_cols}
+            ),
+            ranked AS (
+                SELECT K.*,
+                       CASE WHEN Re_Added = 1 THEN 'RE_ADDED'
+                            WHEN In_Source = 1 THEN 'STILL_IN_SOURCE'
+                            WHEN Active_In_Target = 1 THEN 'STILL_ACTIVE'
+                            ELSE 'CLOSED' END AS Lifecycle,
+                       COUNT(*) OVER () AS Deleted_Keys,
+                       SUM(In_Source) OVER () AS In_Source_Count,
+                       SUM(Active_In_Target) OVER () AS Active_In_Target_Count,
+                       SUM(Readd_Rule_Broken) OVER () AS Readd_Rule_Broken_Count,
+                       SUM(Re_Added) OVER () AS Re_Added_Count,
+                       ROW_NUMBER() OVER (ORDER BY {order}) AS Any_Rank,
+                       ROW_NUMBER() OVER (PARTITION BY In_Source ORDER BY {order}) AS In_Source_Rank,
+                       ROW_NUMBER() OVER (PARTITION BY Active_In_Target ORDER BY {order}) AS Active_In_Target_Rank,
+                       ROW_NUMBER() OVER (PARTITION BY Readd_Rule_Broken ORDER BY {order}) AS Readd_Rule_Broken_Rank
+                FROM per_key K
+            )
+            SELECT *
+            FROM ranked
+            WHERE Any_Rank = 1 OR {sample}
+        """
+
+    def scan(self, entry, refresh=False):
+        """
+        dict(counts=..., samples=DataFrame) for one table entry; counts are per deleted key.
+        Raises ValueError when the target table has no composite keys.
+        """
+        if not entry["target_keys"]:
+            raise ValueError(f"No composite keys found for {entry['target_table']}")
+
+        cache_key = (getattr(self.db, "server", None), entry["deleted_table"], entry["target_table"],
+                     entry["source_table"], tuple(entry["target_keys"]), tuple(entry["source_keys"]))
+        cached = DeletedRecordLifecycle._cache.get(cache_key)
+        if cached is not None and not refresh:
+            return cached
+
+        df = pd.read_sql(self._query(entry), self.db.conn)
+        first = df.iloc[0] if not df.empty else {}
+        counts = {
+            "Deleted_Keys": int(first.get("Deleted_Keys", 0) or 0),
+            **{flag: int(first.get(f"{flag}_Count", 0) or 0) for flag in self.FLAGS + ("Re_Added",)},
+        }
+        rank_cols = [c for c in df.columns if c.endswith("_Rank") or c.endswith("_Count") or c == "Deleted_Keys"]
+        scan = {"counts": counts, "samples": df.drop(columns=rank_cols)}
+        logging.info(f"📋 {entry['deleted_table']}: {counts}")
+
+        DeletedRecordLifecycle._cache[cache_key] = scan
+        return scan
+
+    @classmethod
+    def clear(cls):
+        """Drop every scan (called by DBHelper.data_changed after a write)."""
+        cls._cache.clear()
+
+    def samples(self, scan, flag):
+        """Sample keys with one flag set (at most sample_rows)."""
+        df = scan["samples"]
+        return df[df[flag] == 1] if not df.empty else df
@@ -0,0 +1,141 @@
+import os
+import re
+import math
+import random
+import logging
+import configparser
+import pandas as pd
+from utils.parquet_schema import arrow_schema, arrow_table, describe_rows
+
+
+class DetailCollector:
+    """
+    Bounded capture of the failing rows of one check.
+
+    Rows are streamed in batches (DBHelper.iter_query); the collector keeps the exact count,
+    a uniform reservoir sample of [DETAILS] sample_rows rows (Algorithm L, seeded, so reruns
+    pick the same rows) and, with spill_format = parquet, writes every row to
+    <spill_dir>/<run_id>/<name>.parquet as it arrives. Memory stays at sample_rows rows
+    however many defects the check finds.
+    """
+
+    def __init__(self, config_path="config.ini", name="details"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.sample_rows = max(config.getint("DETAILS", "sample_rows", fallback=1000), 0)
+        self.seed = config.getint("DETAILS", "seed", fallback=42)
+        self.fetch_size = config.getint("DETAILS", "fetch_size", fallback=10000)
+        self.spill_format = config.get("DETAILS", "spill_format", fallback="none").strip().lower()
+        self.spill_dir = config.get("DETAILS", "spill_dir", fallback=os.path.join("Reports", "details"))
+
+        self.name = name
+        self.columns = None
+        self.count = 0
+        self.spill_path = None
+        self.spill_incomplete = False
+        self.description = None
+        self._sample = []            # [(row number, row)]
+        self._rng = random.Random(self.seed)
+        self._w = None               # Algorithm L state once the reservoir is full
+        self._next = None
+        self._writer = None
+        self._schema = None
+
+    # ------------------------------------------------------------------
+    def collect(self, db, query, *params):
+        """Stream every row of query into the collector; returns self."""
+        for description, rows in db.iter_query(query, *params, batch_size=self.fetch_size, describe=True):
+            self.add([d[0] for d in description], rows, description)
+        self.close()   # the result is complete: finish the Parquet file
+        return self
+
+    def add(self, columns, rows, description=None):
+        """Add one batch of row tuples (same columns for every batch; description = cursor.description)."""
+        if self.columns is None:
+            self.columns = list(columns)
+            self.description = description
+        if not rows:
+            return
+        start = self.count
+        self.count += len(rows)
+        if self.spill_format == "parquet":
+            self._spill(rows)
+
+        k = self.sample_rows
+        if k == 0:
+            return
+        # Fill the reservoir with the first k rows
+        i = 0
+        if len(self._sample) < k:
+            i = min(k - len(self._sample), len(rows))
+            self._sample.extend((start + j, tuple(rows[j])) for j in range(i))
+            if len(self._sample) == k:
+                self._w = math.exp(math.log(1 - self._rng.random()) / k)
+                self._next = k - 1 + self._skip()
+        # Then replace a random slot at geometric jumps (O(k log(n/k)) random draws overall)
+        while self._next is not None and self._next < self.count:
+            self._sample[self._rng.randrange(k)] = (self._next, tuple(rows[self._next - start]))
+            self._w *= math.exp(math.log(1 - self._rng.random()) / k)
+            self._next += self._skip()
+
+    def _skip(self):
+        if self._w >= 1:
+            return 1
+        return int(math.floor(math.log(1 - self._rng.random()) / math.log(1 - self._w))) + 1
+
+    # ------------------------------------------------------------------
+    def _spill(self, rows):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            logging.warning("⚠️ pyarrow is not installed: failure rows are not spilled to Parquet")
+            self.spill_format = "none"
+            return
+        try:
+            if self._writer is None:
+                from utils.query_profiler import QueryProfiler
+                folder = os.path.join(self.spill_dir, QueryProfiler.get().run_id)
+                os.makedirs(folder, exist_ok=True)
+                self.spill_path = os.path.join(folder, re.sub(r"[^\w.-]+", "_", self.name) + ".parquet")
+                # Declared column types (cursor.description), so every later batch fits the schema
+                self._schema = arrow_schema(self.description or describe_rows(self.columns, rows))
+                self._writer = pq.ParquetWriter(self.spill_path, self._schema)
+            self._writer.write_table(arrow_table(rows, self._schema))
+        except Exception as e:
+            logging.warning(f"⚠️ Could not spill failure rows of {self.name} to Parquet, file is incomplete: {e}")
+            self.close()
+            self.spill_format = "none"
+            self.spill_incomplete = self.spill_path is not None
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            logging.info(f"📦 {self.count} failure rows of {self.name} written to {self.spill_path}")
+
+    # ------------------------------------------------------------------
+    @property
+    def sampled(self):
+        return len(self._sample)
+
+    def records(self):
+        """Sampled rows as dicts, in the order they were read."""
+        self.close()
+        return [dict(zip(self.columns, row)) for _, row in sorted(self._sample, key=lambda s: s[0])]
+
+    def frame(self):
+        self.close()
+        rows = [row for _, row in sorted(self._sample, key=lambda s: s[0])]
+        return pd.DataFrame.from_records(rows, columns=self.columns or [])
+
+    def __repr__(self):
+        return self.summary() or f"DetailCollector({self.name})"
+
+    def summary(self):
+        """Text for the report's Details column, e.g. '1000 of 2345678 rows (sample)'."""
+        if self.count == 0:
+            return None
+        text = f"{self.sampled} of {self.count} rows" + (" (sample)" if self.sampled < self.count else "")
+        if self.spill_incomplete:
+            return f"{text}; spill incomplete: {self.spill_path}"
+        return f"{text}; all rows: {self.spill_path}" if self.spill_path else text
@@ -0,0 +1,204 @@
+import os
+import re
+import glob
+import logging
+from utils.db_helper import DBHelper
+
+
+class DuckDBCursor:
+    """pyodbc-style cursor over a DuckDB connection (T-SQL is translated on execute)."""
+
+    messages = []
+    rowcount = -1
+
+    def __init__(self, conn, connection):
+        self._conn = conn
+        self.connection = connection
+
+    def execute(self, statement, *params):
+        # pyodbc accepts execute(sql, a, b) and execute(sql, [a, b])
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+        sql = translate(statement)
+        if sql is None:   # session option (SET STATISTICS ...) → no-op
+            return self
+        self._conn.execute(sql, list(params) if params else None)
+        return self
+
+    @property
+    def description(self):
+        return self._conn.description
+
+    def fetchall(self):
+        return self._conn.fetchall()
+
+    def fetchmany(self, size=1):
+        return self._conn.fetchmany(size)
+
+    def fetchone(self):
+        return self._conn.fetchone()
+
+    def nextset(self):
+        return False
+
+    def cancel(self):
+        """pyodbc's cursor.cancel() (used by the [TIMEOUTS] watchdog)."""
+        self._conn.interrupt()
+
+    def close(self):
+        self._conn.close()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
+class DuckDBConnection:
+    """DB-API connection over a shared DuckDB instance, positioned on one attached database."""
+
+    def __init__(self, instance, database):
+        self._instance = instance
+        self.database = database
+
+    def cursor(self):
+        conn = self._instance.cursor()   # own connection per cursor, same catalogs
+        conn.execute(f'USE "{self.database}".dbo')
+        return DuckDBCursor(conn, self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# One in-memory instance per data directory; every *.duckdb file in it is attached
+# under its file name (SOURCE_DB.duckdb → SOURCE_DB), so three-part names keep working.
+_INSTANCES = {}
+
+
+def _instance(path):
+    import duckdb
+
+    path = os.path.abspath(path)
+    if path not in _INSTANCES:
+        instance = duckdb.connect(":memory:")
+        for db_file in sorted(glob.glob(os.path.join(path, "*.duckdb"))):
+            name = os.path.splitext(os.path.basename(db_file))[0]
+            instance.execute(f"ATTACH '{db_file}' AS \"{name}\"")
+        _INSTANCES[path] = instance
+    return _INSTANCES[path]
+
+
+def _duckdb_connection(helper):
+    path = helper.options.get("path", os.path.join("benchmarks", "data"))
+    logging.info(f"🦆 DuckDB engine: {helper.database} from {path}")
+    return DuckDBConnection(_instance(path), helper.database)
+
+
+def reset():
+    """Close cached instances (e.g. after re-seeding the data directory)."""
+    for instance in _INSTANCES.values():
+        instance.close()
+    _INSTANCES.clear()
+
+
+DBHelper.register_connection_factory("duckdb", _duckdb_connection)
+
+
+# --- T-SQL → DuckDB ------------------------------------------------------------
+# Only what the validators actually use; sys.* / msdb / OBJECT_ID queries are left as-is
+# and fail, which the benchmark records as an ERROR for that validator.
+
+_LITERAL = re.compile(r"('(?:[^']|'')*')")
+_LIKE_CLASS = re.compile(r"([\w.\]\[\"]+)\s+(NOT\s+)?LIKE\s+'([^']*\[[^']*)'", re.I)
+_TOP = re.compile(r"^(\s*SELECT\s+(?:DISTINCT\s+)?)TOP\s*\(?\s*(\d+)\s*\)?", re.I)
+_INFO_SCHEMA = re.compile(
+    r"INFORMATION_SCHEMA\.(\w+)(\s+(?:AS\s+)?(?!(?:WHERE|JOIN|ON|LEFT|RIGHT|INNER|GROUP|ORDER)\b)[A-Za-z_]\w*)?",
+    re.I,
+)
+_REPLACEMENTS = [
+    (re.compile(r"\[([^\]]+)\]"), r'"\1"'),
+    (re.compile(r"\bN?VARCHAR\s*\(\s*MAX\s*\)", re.I), "VARCHAR"),
+    (re.compile(r"\bNVARCHAR\b", re.I), "VARCHAR"),
+    (re.compile(r"\bGETDATE\s*\(\s*\)", re.I), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bISNULL\s*\(", re.I), "COALESCE("),
+    (re.compile(r"\bLEN\s*\(", re.I), "LENGTH("),
+    (re.compile(r"\bCOUNT_BIG\s*\(", re.I), "COUNT("),
+    (re.compile(r"\bDATEDIFF\s*\(\s*(\w+)\s*,", re.I), r"DATEDIFF('\1',"),
+]
+
+
+def _like_to_regex(match):
+    column, negate, pattern = match.groups()
+    regex, in_class = "", False
+    for ch in pattern:
+        if in_class:
+            regex += ch
+            in_class = ch != "]"
+        elif ch == "[":
+            regex, in_class = regex + ch, True
+        elif ch == "%":
+            regex += ".*"
+        elif ch == "_":
+            regex += "."
+        else:
+            regex += re.escape(ch)
+    call = f"regexp_matches(CAST({column} AS VARCHAR), '^{regex}$')"
+    return f"NOT {call}" if negate else call
+
+
+# DuckDB type names → the lowercase SQL Server names the validators filter on (DATA_TYPE IN ('date', ...))
+_SQLSERVER_TYPES = {
+    "TIMESTAMP": "datetime2",
+    "TIMESTAMP WITH TIME ZONE": "datetimeoffset",
+    "INTEGER": "int",
+    "BIGINT": "bigint",
+    "SMALLINT": "smallint",
+    "BOOLEAN": "bit",
+    "DOUBLE": "float",
+    "FLOAT": "real",
+    "BLOB": "varbinary",
+}
+
+
+def _info_schema(match):
+    view, alias = match.group(1), match.group(2)
+    columns = "*"
+    if view.lower() == "columns":
+        cases = " ".join(f"WHEN '{k}' THEN '{v}'" for k, v in _SQLSERVER_TYPES.items())
+        columns = (f"* REPLACE (CASE data_type {cases} "
+                   f"ELSE lower(regexp_replace(data_type, '\\(.*$', '')) END AS data_type)")
+    subquery = f"(SELECT {columns} FROM information_schema.{view.lower()} WHERE table_catalog = current_database())"
+    return f"{subquery}{alias}" if alias else f"{subquery} AS {view}"
+
+
+def translate(statement):
+    """Rewrite the T-SQL dialect used by the validators into DuckDB SQL."""
+    sql = str(statement).strip()
+    if re.match(r"^SET\s+(STATISTICS|NOCOUNT|ANSI_\w+|QUOTED_IDENTIFIER)\b", sql, re.I):
+        return None
+
+    sql = _LIKE_CLASS.sub(_like_to_regex, sql)
+
+    # Identifier / function rewrites only outside string literals
+    parts = _LITERAL.split(sql)
+    for i in range(0, len(parts), 2):
+        part = _INFO_SCHEMA.sub(_info_schema, parts[i])
+        for pattern, repl in _REPLACEMENTS:
+            part = pattern.sub(repl, part)
+        # T-SQL string concatenation: a '+' next to a string literal → ||
+        if i + 1 < len(parts):
+            part = re.sub(r"\+\s*$", "|| ", part)
+        if i > 0:
+            part = re.sub(r"^\s*\+", " ||", part)
+        parts[i] = part
+    sql = "".join(parts)
+
+    top = _TOP.match(sql)
+    if top:
+        sql = top.group(1) + sql[top.end():].rstrip().rstrip(";")
+        sql = f"{sql} LIMIT {top.group(2)}"
+    return sql
@@ -0,0 +1,130 @@
+import logging
+import pandas as pd
+
+
+class ETLAuditSnapshot:
+    """
+    Latest ETL_Process_Log row per component, with the matching error / detail log counts,
+    read set-based for one Audit_tables row (process, detail and error log triple).
+
+    One query returns the latest process rows LEFT JOINed to the error and detail counts
+    aggregated by (ProcessLogId, ComponentName); the first error / detail row of each
+    process is read on demand with one ROW_NUMBER query per log table. Snapshots are shared
+    by the audit validators until the next write through DBHelper (ETL job start, load), so
+    running both costs the same handful of queries whatever the number of components, and a
+    check after Job_Run_validation never sees the log of the run before.
+    """
+
+    _cache = {}   # (server, database, tables, columns) → snapshot
+
+    def __init__(self, db, process_log, detail_log, error_log, processlog_id_col, component_col):
+        self.db = db
+        self.process_log = process_log
+        self.detail_log = detail_log
+        self.error_log = error_log
+        self.id_col = processlog_id_col
+        self.component_col = component_col
+        self._process_df = None
+        self._first_rows = {}
+
+    @staticmethod
+    def parse_audit_row(row):
+        """
+        (process_log, detail_log, error_log, processlog_id_col, component_col) of one
+        Audit_tables sheet row; ValueError when Common_Column is incomplete.
+        """
+        common_cols = [col.strip() for col in str(row["Common_Column"]).split(",") if col.strip()]
+        if len(common_cols) < 2:
+            raise ValueError(
+                f"Common_Column must have at least 2 columns (ProcessLogId, ComponentName). Got: {common_cols}"
+            )
+        return (str(row["Audit_table_1"]).strip(), str(row["Audit_table_2"]).strip(),
+                str(row["Audit_table_3"]).strip(), common_cols[0], common_cols[1])
+
+    @classmethod
+    def for_audit_row(cls, db, row, refresh=False):
+        """Snapshot for one Audit_tables sheet row; ValueError when Common_Column is incomplete."""
+        args = cls.parse_audit_row(row)
+
+        key = (getattr(db, "server", None), db.database) + args
+        cached = cls._cache.get(key)
+        if cached is not None and not refresh:
+            cached.db = db   # later lazy reads go through the caller's open connection
+            return cached
+
+        snapshot = cls(db, *args)
+        cls._cache[key] = snapshot
+        return snapshot
+
+    @classmethod
+    def clear(cls):
+        """Drop every snapshot (called by DBHelper.data_changed after a write)."""
+        cls._cache.clear()
+
+    # ------------------------------------------------------------------
+    def _latest_cte(self):
+        return f"""
+            WITH latest AS (
+                SELECT T.*
+                FROM {self.process_log} T
+                WHERE T.{self.id_col} IN (
+                    SELECT MAX({self.id_col})
+                    FROM {self.process_log}
+                    GROUP BY {self.component_col}
+                )
+            )"""
+
+    def _counts_join(self, table, alias, count_col):
+        return f"""
+            LEFT JOIN (
+                SELECT X.{self.id_col}, X.{self.component_col}, COUNT(*) AS {count_col}
+                FROM {table} X
+                INNER JOIN latest L2
+                    ON L2.{self.id_col} = X.{self.id_col} AND L2.{self.component_col} = X.{self.component_col}
+                GROUP BY X.{self.id_col}, X.{self.component_col}
+            ) {alias}
+                ON {alias}.{self.id_col} = L.{self.id_col} AND {alias}.{self.component_col} = L.{self.component_col}"""
+
+    def process_rows(self):
+        """Latest process row per component + Error_Count / Detail_Count columns (one query)."""
+        if self._process_df is None:
+            query = f"""{self._latest_cte()}
+                SELECT L.*,
+                       COALESCE(E.Error_Count, 0) AS Error_Count,
+                       COALESCE(D.Detail_Count, 0) AS Detail_Count
+                FROM latest L
+                {self._counts_join(self.error_log, "E", "Error_Count")}
+                {self._counts_join(self.detail_log, "D", "Detail_Count")}
+            """
+            self._process_df = pd.read_sql(query, self.db.conn)
+            logging.info(f"📋 {self.process_log}: {len(self._process_df)} component(s) in audit snapshot")
+        return self._process_df
+
+    def first_rows(self, kind):
+        """
+        First error (kind='error') or detail (kind='detail') row of every latest process,
+        keyed by (ProcessLogId, ComponentName). Returns (dict, DataFrame); one query per log.
+        """
+        if kind not in self._first_rows:
+            table = self.error_log if kind == "error" else self.detail_log
+            query = f"""{self._latest_cte()}
+                SELECT *
+                FROM (
+                    SELECT X.*,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY X.{self.id_col}, X.{self.component_col}
+                               ORDER BY X.{self.id_col} DESC
+                           ) AS Row_Num
+                    FROM {table} X
+                    INNER JOIN latest L
+                        ON L.{self.id_col} = X.{self.id_col} AND L.{self.component_col} = X.{self.component_col}
+                ) R
+                WHERE R.Row_Num = 1
+            """
+            df = pd.read_sql(query, self.db.conn).drop(columns=["Row_Num"], errors="ignore")
+            by_key = {
+                (r[self.id_col], r[self.component_col]): r
+                for r in df.to_dict("records")
+            }
+            self._first_rows[kind] = (by_key, df)
+        return self._first_rows[kind]
@@ -0,0 +1,152 @@
+import os
+import re
+import sys
+import pickle
+import shutil
+import hashlib
+import logging
+import threading
+import configparser
+from collections import OrderedDict
+
+
+class ExtractCache:
+    """
+    Results fetched in full during a run, kept for the next check that issues the same query.
+
+    Keyed by connection (engine, server, database), whitespace-normalised statement and
+    parameters, so e.g. the INFORMATION_SCHEMA column list of source_patients read by the
+    completeness check is reused by the SCD cross-env check, and a TRANSFORMATION Source_Query
+    is fetched once however many rows / environments use it.
+
+    Bounded by [EXTRACT_CACHE] max_memory_mb (estimated). A first fetch is only kept in memory
+    (no copy, no pickling); when the budget is exceeded the least recently used results are
+    pickled to spill_dir/<run_id>/ only if they are shared (requested more than once) and
+    dropped otherwise, so a large one-off TRANSFORMATION extract never costs a disk write.
+    A result larger than the whole budget is spilled on its second request. Any write through
+    DBHelper.execute_non_query (ETL job start, bulk load) empties the cache.
+    """
+
+    _instance = None
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.enabled = config.getboolean("EXTRACT_CACHE", "enabled", fallback=True)
+        self.max_bytes = int(config.getfloat("EXTRACT_CACHE", "max_memory_mb", fallback=256) * 1024 * 1024)
+        self.spill_dir = config.get("EXTRACT_CACHE", "spill_dir", fallback=os.path.join("Reports", "extract_cache"))
+
+        self._memory = OrderedDict()   # key → [rows, estimated bytes, shared], oldest first
+        self._spilled = {}             # key → pickle file
+        self._fetched = set()          # keys fetched at least once (a second fetch marks them shared)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._folder = None
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0
+
+    @classmethod
+    def get(cls, config_path="config.ini"):
+        """Shared cache for the whole run (first config_path wins)."""
+        if cls._instance is None:
+            cls._instance = cls(config_path)
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def key(db, query, params=()):
+        statement = re.sub(r"\s+", " ", str(query)).strip().rstrip(";").strip()
+        return (db.engine, db.server, db.database, statement, tuple(params))
+
+    @staticmethod
+    def _estimate(rows):
+        """Approximate in-memory size of a row list, from its first 100 rows."""
+        if not rows:
+            return sys.getsizeof(rows)
+        sample = rows[:100]
+        per_row = sum(sys.getsizeof(r) + sum(sys.getsizeof(v) for v in r) for r in sample) / len(sample)
+        return int(sys.getsizeof(rows) + per_row * len(rows))
+
+    def fetch(self, db, query, *params):
+        """db.execute_query(query, *params), served from the cache when the same result was fetched before."""
+        if not self.enabled:
+            return db.execute_query(query, *params)
+        key = self.key(db, query, params)
+        with self._lock:
+            rows = self._lookup(key)
+        if rows is not None:
+            self.hits += 1
+            return list(rows)
+
+        self.misses += 1
+        rows = db.execute_query(query, *params)
+        with self._lock:
+            shared = key in self._fetched
+            self._fetched.add(key)
+            self._store(key, rows, shared)
+        return list(rows)
+
+    def _lookup(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            entry = self._memory[key]
+            entry[2] = True   # reused: worth a spill file when evicted
+            return entry[0]
+        spill_file = self._spilled.get(key)
+        if spill_file:
+            try:
+                with open(spill_file, "rb") as f:
+                    return pickle.load(f)
+            except Exception as e:
+                logging.warning(f"⚠️ Extract cache: could not read {spill_file}, fetching again: {e}")
+                self._spilled.pop(key, None)
+        return None
+
+    def _store(self, key, rows, shared=False):
+        size = self._estimate(rows)
+        if size > self.max_bytes:
+            # Larger than the whole budget: to disk once a second check has asked for it
+            if shared:
+                self._spill(key, rows)
+            else:
+                self.dropped += 1
+            return
+        self._memory[key] = [rows, size, shared]
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._memory:
+            old_key, (old_rows, old_size, old_shared) = self._memory.popitem(last=False)
+            self._bytes -= old_size
+            if old_shared:
+                self._spill(old_key, old_rows)
+            else:
+                self.dropped += 1   # one-off result: a later request fetches it again and marks it shared
+
+    def _spill(self, key, rows):
+        try:
+            if self._folder is None:
+                from utils.query_profiler import QueryProfiler
+                self._folder = os.path.join(self.spill_dir, QueryProfiler.get().run_id)
+                os.makedirs(self._folder, exist_ok=True)
+            spill_file = os.path.join(self._folder, hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ".pkl")
+            with open(spill_file, "wb") as f:
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._spilled[key] = spill_file
+        except Exception as e:
+            logging.warning(f"⚠️ Extract cache: could not spill {key[2]} result to disk: {e}")
+
+    # ------------------------------------------------------------------
+    def clear(self):
+        """Forget every result (the data may have changed); removes this run's spill files."""
+        with self._lock:
+            self._memory.clear()
+            self._spilled.clear()
+            self._fetched.clear()
+            self._bytes = 0
+            if self._folder and os.path.isdir(self._folder):
+                shutil.rmtree(self._folder, ignore_errors=True)
+            self._folder = None
+
+    def summary(self):
+        return (f"{self.hits} hits, {self.misses} fetches, {len(self._memory)} results in memory "
+                f"(~{self._bytes / 1048576:.1f} MB), {len(self._spilled)} spilled, {self.dropped} dropped")
@@ -1,154 +1,238 @@
 import os
+import logging
 import configparser
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from fpdf import FPDF
 
+# One background worker renders PDFs in submission order; validators only pay for the .xlsx
+_RENDER_POOL = None
+_PENDING = []
+
+
+def _passed(row):
+    """IsCheckPassed is a bool or 'PASS'/'FAIL' depending on the validator; Status otherwise."""
+    value = row.get("IsCheckPassed", row.get("Status"))
+    if isinstance(value, str):
+        return value.strip().upper() in ("PASS", "TRUE", "✅ PASS")
+    return bool(value)
+
+
+def submit(fn, *args, **kwargs):
+    """Run fn in the background PDF worker; returns a Future with the PDF path."""
+    global _RENDER_POOL
+    if _RENDER_POOL is None:
+        _RENDER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-report")
+    future = _RENDER_POOL.submit(fn, *args, **kwargs)
+    _PENDING.append(future)
+    return future
+
+
+def wait_for_pdf_reports(timeout=None):
+    """Block until queued PDFs are written; returns the paths (failed renders are logged)."""
+    paths = []
+    while _PENDING:
+        future = _PENDING.pop(0)
+        try:
+            paths.append(future.result(timeout=timeout))
+        except Exception as e:
+            logging.error(f"❌ PDF report failed: {e}")
+    return paths
+
+
+class _TablePDF(FPDF):
+    """FPDF that repeats the current table header at the top of every page."""
+
+    def __init__(self, title, orientation="P"):
+        super().__init__(orientation=orientation)
+        self.set_auto_page_break(auto=True, margin=15)
+        self.report_title = title
+        self.table_headers = None
+        self.col_widths = None
+
+    def header(self):
+        if self.table_headers and self.page_no() > 1:
+            self.set_font("DejaVu", size=9)
+            self.cell(0, 6, self.report_title, new_x="LMARGIN", new_y="NEXT", align="L")
+            self.table_header_row()
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font("DejaVu", size=8)
+        self.cell(0, 8, f"Page {self.page_no()}/{{nb}}", align="C")
+
+    def table_header_row(self):
+        self.set_font("DejaVu", "B", 8)
+        self.set_fill_color(230, 230, 230)
+        for header, width in zip(self.table_headers, self.col_widths):
+            self.cell(width, 7, self.fit(header, width), border=1, align="C", fill=True)
+        self.ln()
+        self.set_font("DejaVu", size=8)
+
+    def fit(self, text, width):
+        """Single-line cell text, cut with … to the column width (no multi_cell re-layout)."""
+        text = "" if text is None else str(text).replace("\n", " ")
+        if self.get_string_width(text) <= width - 2:
+            return text
+        while text and self.get_string_width(text + "…") > width - 2:
+            text = text[:max(1, int(len(text) * 0.8))] if len(text) > 40 else text[:-1]
+        return text + "…"
+
+
 class PDFReportGenerator:
-    def __init__(self, config_path="config.ini", font_path="DejaVuSans.ttf"):
+    """
+    Summary page + paginated detail table for any list of result dicts.
+
+    Detail rows are capped at [PDF_REPORT] max_detail_rows (failures first); the full data
+    stays in the .xlsx written by ReportHelper, which the PDF links to.
+    """
+
+    def __init__(self, config_path="config.ini", font_path=None):
         # Load config
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
-        
+
         # Get output folder from config
         self.output_folder = self.config.get("PATHS", "report_output_path", fallback="Reports")
         os.makedirs(self.output_folder, exist_ok=True)  # Ensure folder exists
-        
-        # Initialize PDF
-        self.pdf = FPDF()
-        self.font_path = font_path
+
+        self.font_path = font_path or self.config.get("PDF_REPORT", "font_path", fallback="DejaVuSans.ttf")
+        self.max_detail_rows = self.config.getint("PDF_REPORT", "max_detail_rows", fallback=1000)
 
         # Add Unicode font
         if not os.path.exists(self.font_path):
             raise FileNotFoundError(f"Font file not found: {self.font_path}")
-        
-        self.pdf.add_font("DejaVu", "", self.font_path, uni=True)
-        self.pdf.set_font("DejaVu", size=12)
-
-    def generate(self, results, check_type="Validation Report"):
-        self.pdf.add_page()
-
-        # Title
-        self.pdf.set_font("DejaVu", size=16)
-        self.pdf.cell(0, 10, f"{check_type} Report", ln=True, align="C")
-        self.pdf.ln(10)
-
-        # Table Header
-        metric_column_name = check_type
-        #headers = ["Database", "Table Name", "Column Names", "Count", "Status"]
-        headers = ["Database", "Table Name", "Column Names", metric_column_name, "Status"]
-        col_widths = [40, 40, 40, 40, 25]
-
-        self.pdf.set_font("DejaVu", size=12)
-        for i, header in enumerate(headers):
-            self.pdf.cell(col_widths[i], 10, header, border=1, align="C")
-        self.pdf.ln()
-
-        # Table Rows
-        for row in results:
-            self.pdf.cell(col_widths[0], 10, str(row.get("Database", "")), border=1)
-            self.pdf.cell(col_widths[1], 10, str(row.get("Table_name", "")), border=1)
-            # self.pdf.cell(col_widths[2], 10, str(row.get("Column_names", "")), border=1)
-
-            # Wrap text for Column Names
-            col_names = str(row.get("Column_names", ""))
-            x_before = self.pdf.get_x()
-            y_before = self.pdf.get_y()
-            self.pdf.multi_cell(col_widths[2], 10, col_names, border=1)
-            # Move cursor back to the right of Column Names cell
-            self.pdf.set_xy(x_before + col_widths[2], y_before)
-
-            #self.pdf.cell(col_widths[3], 10, str(row.get("DUPLICATE_Count", "")), border=1, align="C")
-            #self.pdf.cell(col_widths[3], 10, str(row.get("Check", "")), border=1, align="C")
-            if "Duplicate" in check_type:
-                #metric_col_name = "Duplicate Count"
-                metric_key = "DUPLICATE_Count"
-            elif "Null" in check_type:
-                #metric_col_name = "Null Count"
-                metric_key = "Null_Count"
-            elif "Count" in check_type:
-                #metric_col_name = "Count Difference"
-                metric_key = "Count_Check"
-            else:
-                #metric_col_name = "Metric"
-                metric_key = "Metric"
-            self.pdf.cell(col_widths[3], 10, str(row.get(metric_key, "")), border=1, align="C")
-
-            # Unicode icons ✔ / ✘
-            status_icon = "✔" if row.get("IsCheckPassed", False) else "✘"
-            self.pdf.cell(col_widths[4], 10, status_icon, border=1, align="C")
-            self.pdf.ln()
-
-        # Generate timestamped filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(
-        self.output_folder, f"{check_type.replace(' ', '_')}_Report_{timestamp}.pdf"
-        )
-
-        # Save PDF
-        self.pdf.output(output_file)
+
+    def _new_pdf(self, title, orientation="P"):
+        pdf = _TablePDF(title, orientation)
+        pdf.add_font("DejaVu", "", self.font_path)
+        # No bold face shipped next to the regular one: reuse it so set_font("DejaVu", "B") works
+        pdf.add_font("DejaVu", "B", self.font_path)
+        return pdf
+
+    @staticmethod
+    def _columns(results):
+        columns = []
+        for row in results[:50]:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+        return columns
+
+    def _summary_page(self, pdf, results, title, xlsx_path):
+        passed = sum(1 for r in results if _passed(r))
+        failed = len(results) - passed
+
+        pdf.add_page()
+        pdf.set_font("DejaVu", size=16)
+        pdf.cell(0, 10, title, new_x="LMARGIN", new_y="NEXT", align="C")
+        pdf.set_font("DejaVu", size=10)
+        pdf.cell(0, 7, f"Generated: {datetime.now():%Y-%m-%d %H:%M:%S}", new_x="LMARGIN", new_y="NEXT", align="C")
+        pdf.ln(6)
+
+        pdf.set_font("DejaVu", size=12)
+        for label, value in (("Checks", len(results)), ("Passed ✔", passed), ("Failed ✘", failed),
+                             ("Pass rate", f"{passed / len(results) * 100:.1f}%" if results else "-")):
+            pdf.cell(60, 9, label, border=1)
+            pdf.cell(40, 9, str(value), border=1, align="R", new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(4)
+
+        # Failures per table (first 40 tables)
+        table_key = next((k for k in ("Table", "Table_name", "Table_Name", "table_name", "Source_Table")
+                          if results and k in results[0]), None)
+        if table_key and failed:
+            per_table = {}
+            for r in results:
+                if not _passed(r):
+                    per_table[r.get(table_key)] = per_table.get(r.get(table_key), 0) + 1
+            pdf.set_font("DejaVu", "B", 10)
+            pdf.cell(100, 8, "Table", border=1)
+            pdf.cell(40, 8, "Failed checks", border=1, align="R", new_x="LMARGIN", new_y="NEXT")
+            pdf.set_font("DejaVu", size=9)
+            for table, count in sorted(per_table.items(), key=lambda kv: -kv[1])[:40]:
+                pdf.cell(100, 7, pdf.fit(table, 100), border=1)
+                pdf.cell(40, 7, str(count), border=1, align="R", new_x="LMARGIN", new_y="NEXT")
+            pdf.ln(4)
+
+        if xlsx_path:
+            pdf.set_font("DejaVu", size=10)
+            pdf.set_text_color(0, 0, 200)
+            pdf.cell(0, 8, f"Full results: {os.path.basename(xlsx_path)}",
+                     link=os.path.basename(xlsx_path), new_x="LMARGIN", new_y="NEXT")
+            pdf.set_text_color(0, 0, 0)
+
+    def _detail_pages(self, pdf, results, columns, headers=None, xlsx_path=None):
+        # Failures first so the capped section shows what needs attention
+        rows = sorted(results, key=_passed)
+        shown = rows[:self.max_detail_rows]
+
+        pdf.add_page()
+        usable = pdf.w - pdf.l_margin - pdf.r_margin
+        pdf.table_headers = headers or columns   # repeated by header() on the next pages
+        pdf.col_widths = [usable / len(columns)] * len(columns)
+        pdf.set_font("DejaVu", size=11)
+        pdf.cell(0, 8, f"Details ({len(shown):,} of {len(rows):,} rows)", new_x="LMARGIN", new_y="NEXT")
+        pdf.table_header_row()
+        for row in shown:
+            for column, width in zip(columns, pdf.col_widths):
+                value = row.get(column, "")
+                if column in ("IsCheckPassed", "Status"):
+                    value = f"{'✔' if _passed(row) else '✘'} {value}"
+                pdf.cell(width, 6, pdf.fit(value, width), border=1)
+            pdf.ln()
+
+        if len(rows) > len(shown):
+            pdf.table_headers = None
+            pdf.ln(3)
+            pdf.set_font("DejaVu", size=9)
+            pdf.set_text_color(0, 0, 200)
+            target = os.path.basename(xlsx_path) if xlsx_path else ""
+            pdf.cell(0, 7, f"{len(rows) - len(shown):,} more rows in {target or 'the Excel report'}",
+                     link=target, new_x="LMARGIN", new_y="NEXT")
+            pdf.set_text_color(0, 0, 0)
+
+    def _write(self, pdf, file_stem, xlsx_path=None):
+        if xlsx_path:
+            # Same name as the workbook, which already carries the environment and a de-dup suffix
+            output_file = os.path.join(self.output_folder, os.path.splitext(os.path.basename(xlsx_path))[0] + ".pdf")
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = os.path.join(self.output_folder, f"{file_stem}_{timestamp}.pdf")
+        pdf.output(output_file)
+        logging.info(f"📄 PDF report saved at {output_file}")
         return output_file
 
+    def generate(self, results, check_type="Validation Report", xlsx_path=None):
+        columns = self._columns(results)
+        pdf = self._new_pdf(f"{check_type} Report", "L" if len(columns) > 6 else "P")
+        self._summary_page(pdf, results, f"{check_type} Report", xlsx_path)
+        if columns:
+            self._detail_pages(pdf, results, columns, xlsx_path=xlsx_path)
+        return self._write(pdf, f"{check_type.replace(' ', '_')}_Report", xlsx_path)
+
+    def generate_async(self, results, check_type="Validation Report", xlsx_path=None):
+        """Queue generate() on the background worker; returns a Future with the PDF path."""
+        return submit(self.generate, list(results), check_type, xlsx_path)
+
 
 # Additional class for count check PDF generation
 # This can be used if you want to separate count check reports from other types
-class CountCheckPDFGenerator:
-    def __init__(self, output_path="Reports",font_path_="DejaVuSans.ttf"):
-        self.output_path = output_path
+class CountCheckPDFGenerator(PDFReportGenerator):
+    COLUMNS = ["Source_Table", "Source_Count", "Stage_Table", "Stage_Count",
+               "Target_Table", "Target_Count", "Status"]
+    HEADERS = ["Source Table", "Source Count", "Stage Table", "Stage Count",
+               "Target Table", "Target Count", "Status"]
+
+    def __init__(self, output_path="Reports", font_path_="DejaVuSans.ttf", config_path="config.ini"):
+        super().__init__(config_path, font_path_)
+        self.output_folder = output_path
         os.makedirs(output_path, exist_ok=True)
-        self.pdf = FPDF()
-        self.pdf.set_auto_page_break(auto=True, margin=15)
-        self.font_path = font_path_
 
-        # Add Unicode font
-        if not os.path.exists(self.font_path):
-            raise FileNotFoundError(f"Font file not found: {self.font_path}")
-        
-        self.pdf.add_font("DejaVu", "", self.font_path, uni=True)
-        self.pdf.add_font("DejaVu", "B", self.font_path, uni=True)
-
-    def generate_count(self, results, file_name_prefix="Count_Check_Report"):
-        
-        # Add timestamp to file name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_name = f"{file_name_prefix}_{timestamp}.pdf"
-        
-        self.pdf.add_page()
-        self.pdf.set_font("Dejavu", "B", 16)
-        self.pdf.cell(0, 10, "Count Check Report", ln=True, align="C")
-
-        self.pdf.ln(10)
-        self.pdf.set_font("Dejavu", "B", 10)
-
-        # Table headers
-        col_widths = [25, 25, 25, 25, 25, 25,25]
-        headers = ["Source Table", "Source Count", "Stage Table", "Stage Count", "Target Table", "Target Count", "Status"]
-
-        for i, header in enumerate(headers):
-            self.pdf.cell(col_widths[i], 10, header, border=1, align="C")
-        self.pdf.ln()
-
-        # for width, header in zip(col_widths,headers):
-        #     self.pdf.cell(width, 10, header, border=1, align="C")
-        # self.pdf.ln()
-
-        self.pdf.set_font("Dejavu", "", 8)
-
-        # Table rows
-        for row in results:
-            self.pdf.cell(col_widths[0], 10, str(row.get("Source_Table", "")), border=1, align="C")
-            self.pdf.cell(col_widths[1], 10, str(row.get("Source_Count", "")), border=1, align="C")
-            self.pdf.cell(col_widths[2], 10, str(row.get("Stage_Table", "")), border=1, align="C")
-            self.pdf.cell(col_widths[3], 10, str(row.get("Stage_Count", "")), border=1, align="C")
-            self.pdf.cell(col_widths[4], 10, str(row.get("Target_Table", "")), border=1, align="C")
-            self.pdf.cell(col_widths[5], 10, str(row.get("Target_Count", "")), border=1, align="C")
-            #self.pdf.ln()
-
-            # Unicode icons ✔ / ✘
-            status_icon = "✘" if row.get("IsCheckPassed", False) else "✔"
-            self.pdf.cell(col_widths[4], 10, status_icon, border=1, align="C")
-            self.pdf.ln()
-
-        # Save file
-        pdf_path = os.path.join(self.output_path, file_name)
-        self.pdf.output(pdf_path)
-        return pdf_path
+    def generate_count(self, results, file_name_prefix="Count_Check_Report", xlsx_path=None):
+        pdf = self._new_pdf("Count Check Report", "L")
+        self._summary_page(pdf, results, "Count Check Report", xlsx_path)
+        self._detail_pages(pdf, results, self.COLUMNS, self.HEADERS, xlsx_path)
+        return self._write(pdf, file_name_prefix, xlsx_path)
+
+    def generate_count_async(self, results, file_name_prefix="Count_Check_Report", xlsx_path=None):
+        return submit(self.generate_count, list(results), file_name_prefix, xlsx_path)
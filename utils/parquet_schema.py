@@ -0,0 +1,96 @@
+import re
+import decimal
+import datetime
+
+
+def _arrow_type(type_code, precision=None, scale=None):
+    """Arrow type for one cursor.description entry (pyodbc Python type or engine type name)."""
+    import pyarrow as pa
+
+    def _decimal(p, s):
+        p, s = int(p or 38), int(s or 0)
+        return pa.decimal128(p, s) if p <= 38 else pa.decimal256(min(p, 76), s)
+
+    # pyodbc: the Python class the column converts to, plus precision / scale for DECIMAL
+    if isinstance(type_code, type):
+        if issubclass(type_code, bool):
+            return pa.bool_()
+        if issubclass(type_code, int):
+            return pa.int64()
+        if issubclass(type_code, float):
+            return pa.float64()
+        if issubclass(type_code, decimal.Decimal):
+            return _decimal(precision, scale)
+        if issubclass(type_code, datetime.datetime):
+            return pa.timestamp("us")
+        if issubclass(type_code, datetime.date):
+            return pa.date32()
+        if issubclass(type_code, datetime.time):
+            return pa.time64("us")
+        if issubclass(type_code, (bytes, bytearray)):
+            return pa.binary()
+        return pa.string()
+
+    # DuckDB (and other engines): the SQL type name
+    name = str(type_code).upper()
+    match = re.match(r"(?:DECIMAL|NUMERIC)\s*\(\s*(\d+)\s*(?:,\s*(\d+))?\s*\)", name)
+    if match:
+        return _decimal(match.group(1), match.group(2))
+    if name in ("TINYINT", "SMALLINT", "INTEGER", "INT", "BIGINT", "UTINYINT", "USMALLINT", "UINTEGER"):
+        return pa.int64()
+    if name in ("DOUBLE", "FLOAT", "REAL"):
+        return pa.float64()
+    if name == "BOOLEAN":
+        return pa.bool_()
+    if name.startswith("TIMESTAMP WITH TIME ZONE"):
+        return pa.timestamp("us", tz="UTC")
+    if name.startswith("TIMESTAMP") or name == "DATETIME":
+        return pa.timestamp("us")
+    if name == "DATE":
+        return pa.date32()
+    if name.startswith("TIME"):
+        return pa.time64("us")
+    if name in ("BLOB", "BYTEA", "VARBINARY"):
+        return pa.binary()
+    return pa.string()
+
+
+def arrow_schema(description):
+    """
+    Parquet schema from the declared column types of a cursor (cursor.description), so every
+    batch of a result fits it: DECIMAL keeps its declared precision / scale and a column that
+    is NULL in the first rows keeps its real type.
+    """
+    import pyarrow as pa
+
+    return pa.schema([
+        pa.field(str(d[0]), _arrow_type(d[1], d[4] if len(d) > 4 else None, d[5] if len(d) > 5 else None))
+        for d in description
+    ])
+
+
+def describe_rows(columns, rows):
+    """
+    Stand-in description when only rows are known (add() without a cursor): the type of each
+    column's first non-NULL value; DECIMAL (precision unknown) and all-NULL columns as text.
+    """
+    description = []
+    for i, name in enumerate(columns):
+        value = next((r[i] for r in rows if r[i] is not None), None)
+        type_code = str if value is None or isinstance(value, decimal.Decimal) else type(value)
+        description.append((name, type_code, None, None, None, None, True))
+    return description
+
+
+def arrow_table(rows, schema):
+    """Row tuples → pyarrow Table with schema (values of string columns that are not str, e.g. UUID, via str())."""
+    import pyarrow as pa
+
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_string(field.type):
+            values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+        arrays.append(pa.array(list(values), type=field.type))
+    # from_arrays: a result may repeat a column name (a.id, b.id)
+    return pa.Table.from_arrays(arrays, schema=schema)
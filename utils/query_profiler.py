@@ -0,0 +1,349 @@
+import os
+import re
+import sys
+import json
+import html
+import time
+import logging
+import configparser
+from datetime import datetime
+from utils.slow_query_capture import SlowQueryCapture
+from utils.query_timeout import QueryTimeouts, QueryWatchdog, QueryTimeoutError
+
+
+class QueryProfiler:
+    """
+    Process-wide recorder of every SQL statement sent through a DBHelper connection.
+
+    Each record holds wall time, server time (optional, from SET STATISTICS TIME),
+    rows fetched, approximate bytes and the calling validator / table / column.
+    Records are appended to Reports/profiles/query_profile_<run_id>.jsonl as they finish.
+    Statements slower than slow_query_ms also get their execution stats and plan captured.
+    Settings come from the [PROFILING] section of config.ini.
+    """
+
+    _instance = None
+    # Set by the test session: pytest-xdist workers share the controller's run id and add their own worker id
+    shared_run_id = None
+    worker_id = None
+
+    # Local variable names the validators use for the object being checked
+    TABLE_LOCALS = ("table", "table_name", "source_table", "stage_table", "target_table",
+                    "child_table", "view_table", "deleted_table", "ETL_Process_Log")
+    COLUMN_LOCALS = ("column", "col", "columns", "child_column", "composite_key")
+
+    _SERVER_TIME = re.compile(r"elapsed time = (\d+) ms", re.I)
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.enabled = config.getboolean("PROFILING", "enabled", fallback=True)
+        self.server_time = config.getboolean("PROFILING", "server_time", fallback=False)
+        self.slowest_n = config.getint("PROFILING", "slowest_n", fallback=10)
+        self.output_dir = config.get("PROFILING", "output_dir", fallback=os.path.join("Reports", "profiles"))
+
+        # base_run_id: the whole run (run history); run_id: this process (profile / spill folders)
+        self.base_run_id = QueryProfiler.shared_run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.run_id = f"{self.base_run_id}_{QueryProfiler.worker_id}" if QueryProfiler.worker_id else self.base_run_id
+        self.records = []
+        self.current_check = None
+        self.jsonl_path = os.path.join(self.output_dir, f"query_profile_{self.run_id}.jsonl")
+        self._jsonl = None
+        self.slow_capture = SlowQueryCapture(config_path, self.run_id)
+        self.timeouts = QueryTimeouts(config_path)
+
+    @classmethod
+    def get(cls, config_path="config.ini"):
+        """Shared instance for the whole run (first config_path wins)."""
+        if cls._instance is None:
+            cls._instance = cls(config_path)
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    def wrap(self, conn):
+        """Return an instrumented proxy for a DB-API connection."""
+        if not self.enabled and not self.timeouts.active:
+            return conn
+        if self.enabled and self.server_time:
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SET STATISTICS TIME ON")
+                cursor.close()
+            except Exception as e:
+                logging.warning(f"⚠️ SET STATISTICS TIME not available, server time disabled: {e}")
+        return ProfiledConnection(conn, self)
+
+    def begin_check(self, check_name):
+        """Mark the start of a check (e.g. a pytest test). Returns a position for since()."""
+        self.current_check = check_name
+        return len(self.records)
+
+    def since(self, mark):
+        return self.records[mark:]
+
+    def slowest(self, records=None, n=None):
+        records = self.records if records is None else records
+        return sorted(records, key=lambda r: r["wall_ms"], reverse=True)[: n or self.slowest_n]
+
+    # ------------------------------------------------------------------
+    def _caller_context(self):
+        """Find the validator (first src.* frame with a self) and its current table / column."""
+        frame = sys._getframe(2)
+        context = {"validator": None, "table": None, "column": None}
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith("src."):
+                local_vars = frame.f_locals
+                if context["validator"] is None and "self" in local_vars:
+                    context["validator"] = type(local_vars["self"]).__name__
+                for key, names in (("table", self.TABLE_LOCALS), ("column", self.COLUMN_LOCALS)):
+                    if context[key] is None:
+                        value = next((local_vars[n] for n in names if isinstance(local_vars.get(n), str)), None)
+                        context[key] = value
+                if context["validator"]:
+                    break
+            frame = frame.f_back
+        return context
+
+    def record(self, statement, started, wall_ms, rows, approx_bytes, server_ms, context, error=None,
+               conn=None, params=()):
+        record = {
+            "run_id": self.run_id,
+            "check": self.current_check,
+            "validator": context["validator"],
+            "table": context["table"],
+            "column": context["column"],
+            "statement": " ".join(str(statement).split())[:4000],
+            "started_at": started,
+            "wall_ms": round(wall_ms, 2),
+            "server_ms": server_ms,
+            "rows": rows,
+            "approx_bytes": approx_bytes,
+            "error": error,
+            "logical_reads": None,
+            "cpu_ms": None,
+            "plan_file": None,
+        }
+        if not self.enabled:
+            return record   # proxy kept only for [TIMEOUTS]
+        if conn is not None and error is None and self.slow_capture.is_slow(wall_ms):
+            self.slow_capture.capture(conn, statement, params, record)
+        self.records.append(record)
+        try:
+            if self._jsonl is None:
+                os.makedirs(self.output_dir, exist_ok=True)
+                self._jsonl = open(self.jsonl_path, "a", encoding="utf-8", buffering=1)
+            self._jsonl.write(json.dumps(record, default=str) + "\n")
+        except Exception as e:
+            logging.warning(f"⚠️ Could not write query profile: {e}")
+        return record
+
+    def server_elapsed_ms(self, cursor):
+        """Sum of 'elapsed time' lines reported by SET STATISTICS TIME (pyodbc >= 4.0.31)."""
+        if not self.server_time:
+            return None
+        messages = getattr(cursor, "messages", None) or []
+        times = [int(m) for _, text in messages for m in self._SERVER_TIME.findall(str(text))]
+        return sum(times) if times else None
+
+    @staticmethod
+    def approx_row_bytes(rows):
+        """Approximate payload size from the first 100 rows."""
+        if not rows:
+            return 0
+        head = rows[:100]
+        size = sum(len(str(v)) for row in head for v in row)
+        return int(size * len(rows) / len(head))
+
+    @staticmethod
+    def to_frame(records):
+        import pandas as pd
+        columns = ["check", "validator", "table", "column", "wall_ms", "server_ms",
+                   "rows", "approx_bytes", "logical_reads", "cpu_ms", "plan_file",
+                   "started_at", "statement", "error"]
+        return pd.DataFrame(records, columns=columns)
+
+    def slowest_html(self, records, n=None):
+        """Small HTML table of the slowest statements (for Allure)."""
+        rows = "".join(
+            f"<tr><td>{r['wall_ms']}</td><td>{r['server_ms'] or ''}</td><td>{r['rows']}</td>"
+            f"<td>{r.get('logical_reads') or ''}</td>"
+            f"<td>{r['validator'] or ''}</td><td>{html.escape(str(r['table'] or ''))}</td>"
+            f"<td>{html.escape(str(r['column'] or ''))}</td>"
+            f"<td><code>{html.escape(r['statement'][:300])}</code></td></tr>"
+            for r in self.slowest(records, n)
+        )
+        return (
+            "<table border='1' cellpadding='4'><tr><th>Wall ms</th><th>Server ms</th><th>Rows</th><th>Logical reads</th>"
+            "<th>Validator</th><th>Table</th><th>Column</th><th>Statement</th></tr>"
+            f"{rows}</table>"
+        )
+
+
+class ProfiledCursor:
+    """Cursor proxy: times execute + fetch and records one entry per statement."""
+
+    # Proxy state; any other attribute (fast_executemany, arraysize, ...) is set on the real cursor
+    _FIELDS = ("_cursor", "_profiler", "_pending", "_watchdog")
+
+    def __init__(self, cursor, profiler):
+        self._cursor = cursor
+        self._profiler = profiler
+        self._pending = None
+        self._watchdog = None
+
+    def execute(self, statement, *params):
+        self._finish()
+        context = self._profiler._caller_context()
+        started = datetime.now().isoformat(timespec="milliseconds")
+        # ⏱️ Per-check limit ([TIMEOUTS]): cancel the statement from a watchdog thread
+        seconds = self._profiler.timeouts.seconds_for(context["validator"])
+        self._watchdog = QueryWatchdog(self._cursor, seconds)
+        start = time.perf_counter()
+        try:
+            self._cursor.execute(statement, *params)
+        except Exception as e:
+            self._profiler.record(statement, started, (time.perf_counter() - start) * 1000,
+                                  0, 0, None, context, error=str(e))
+            self._raise_timeout(e, statement, context)
+            raise
+        self._pending = {
+            "statement": statement, "params": params, "started": started, "start": start,
+            "fetch_s": 0.0, "exec_s": time.perf_counter() - start,
+            "rows": 0, "bytes": 0, "context": context,
+        }
+        return self
+
+    def executemany(self, statement, seq_of_params):
+        """Timed like execute; one entry per batch, rows = number of parameter sets."""
+        self._finish()
+        seq_of_params = seq_of_params if isinstance(seq_of_params, (list, tuple)) else list(seq_of_params)
+        context = self._profiler._caller_context()
+        started = datetime.now().isoformat(timespec="milliseconds")
+        seconds = self._profiler.timeouts.seconds_for(context["validator"])
+        self._watchdog = QueryWatchdog(self._cursor, seconds)
+        start = time.perf_counter()
+        try:
+            self._cursor.executemany(statement, seq_of_params)
+        except Exception as e:
+            self._profiler.record(statement, started, (time.perf_counter() - start) * 1000,
+                                  0, 0, None, context, error=str(e))
+            self._raise_timeout(e, statement, context)
+            raise
+        wall_ms = (time.perf_counter() - start) * 1000
+        self._stop_watchdog()
+        self._profiler.record(
+            statement, started, wall_ms, len(seq_of_params), self._profiler.approx_row_bytes(seq_of_params),
+            self._profiler.server_elapsed_ms(self._cursor), context,
+            conn=getattr(self._cursor, "connection", None), params=seq_of_params[0] if seq_of_params else (),
+        )
+        return self
+
+    def _raise_timeout(self, error, statement, context):
+        """Turn a watchdog cancel / driver timeout (HYT00) into QueryTimeoutError."""
+        watchdog, self._watchdog = self._watchdog, None
+        if watchdog is None:
+            return
+        watchdog.stop()
+        if watchdog.fired or QueryWatchdog.is_timeout(error):
+            seconds = watchdog.seconds or self._profiler.timeouts.connection_timeout()
+            logging.error(f"⏱️ Query cancelled after {seconds:g}s ({context['validator']}, {context['table']})")
+            raise QueryTimeoutError(statement, seconds, context["validator"]) from error
+
+    def _fetch(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            rows = fetch(*args)
+        except Exception as e:
+            if self._pending is not None:
+                self._raise_timeout(e, self._pending["statement"], self._pending["context"])
+            raise
+        return rows, time.perf_counter() - start
+
+    def _fetched(self, rows, elapsed):
+        if self._pending is not None:
+            self._pending["fetch_s"] += elapsed
+            self._pending["rows"] += len(rows)
+            self._pending["bytes"] += self._profiler.approx_row_bytes(rows)
+
+    def fetchall(self):
+        rows, elapsed = self._fetch(self._cursor.fetchall)
+        self._fetched(rows, elapsed)
+        self._stop_watchdog()
+        return rows
+
+    def fetchmany(self, size=None):
+        rows, elapsed = self._fetch(self._cursor.fetchmany, *([size] if size is not None else []))
+        self._fetched(rows, elapsed)
+        return rows
+
+    def fetchone(self):
+        row, elapsed = self._fetch(self._cursor.fetchone)
+        self._fetched([row] if row is not None else [], elapsed)
+        return row
+
+    def _stop_watchdog(self):
+        if self._watchdog is not None:
+            self._watchdog.stop()
+            self._watchdog = None
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def _finish(self, capture=True):
+        self._stop_watchdog()
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        wall_ms = (pending["exec_s"] + pending["fetch_s"]) * 1000
+        # Slow-statement capture runs on the raw connection so it is not profiled itself
+        conn = getattr(self._cursor, "connection", None) if capture else None
+        self._profiler.record(
+            pending["statement"], pending["started"], wall_ms, pending["rows"], pending["bytes"],
+            self._profiler.server_elapsed_ms(self._cursor), pending["context"],
+            conn=conn, params=pending["params"],
+        )
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+    def __del__(self):
+        try:
+            self._finish(capture=False)
+        except Exception:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        if name in ProfiledCursor._FIELDS:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+
+class ProfiledConnection:
+    """Connection proxy handing out ProfiledCursor objects; everything else is delegated."""
+
+    def __init__(self, conn, profiler):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_profiler", profiler)
+
+    @property
+    def raw(self):
+        return self._conn
+
+    def cursor(self):
+        return ProfiledCursor(self._conn.cursor(), self._profiler)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
@@ -0,0 +1,103 @@
+import logging
+import threading
+import configparser
+
+
+class QueryTimeoutError(Exception):
+    """A statement ran longer than its [TIMEOUTS] limit and was cancelled."""
+
+    def __init__(self, statement, seconds, validator=None):
+        self.statement = " ".join(str(statement).split())
+        self.seconds = seconds
+        self.validator = validator
+        super().__init__(f"Query cancelled after {seconds:g}s ({validator or 'no check'}): {self.statement[:200]}")
+
+    @staticmethod
+    def find(error):
+        """The QueryTimeoutError behind error (pd.read_sql wraps it in DatabaseError), or None."""
+        seen = set()
+        while error is not None and id(error) not in seen:
+            if isinstance(error, QueryTimeoutError):
+                return error
+            seen.add(id(error))
+            error = error.__cause__ or error.__context__
+        return None
+
+
+class QueryTimeouts:
+    """
+    Query time limits from the [TIMEOUTS] section of config.ini:
+
+      default_seconds    : every statement (0 = no limit)
+      <ValidatorClass>   : statements issued by that validator, e.g. SCDAuditValidation = 1800
+      connection_timeout : pyodbc connection.timeout, a driver-side backstop on every statement
+                           of every connection (0 / unset = none)
+
+    default_seconds and the per-check limits are enforced by a watchdog that calls
+    cursor.cancel(), so a long per-check limit never becomes the limit of other statements
+    (ETL job EXECs, msdb polls).
+    """
+
+    _RESERVED = {"default_seconds", "enabled", "connection_timeout"}
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.optionxform = str   # keep validator class names as written
+        config.read(config_path)
+        section = config["TIMEOUTS"] if config.has_section("TIMEOUTS") else {}
+        self.enabled = str(section.get("enabled", "true")).strip().lower() in ("1", "true", "yes", "on")
+        self.default = float(section.get("default_seconds", 0) or 0)
+        self.connection = float(section.get("connection_timeout", 0) or 0)
+        self.per_check = {
+            name.lower(): float(value) for name, value in section.items()
+            if name.lower() not in self._RESERVED and str(value).strip()
+        }
+
+    @property
+    def active(self):
+        return self.enabled and (self.default > 0 or any(v > 0 for v in self.per_check.values()))
+
+    def seconds_for(self, validator=None):
+        """Limit for one validator's statements (None = no limit)."""
+        if not self.enabled:
+            return None
+        seconds = self.per_check.get(str(validator).lower(), self.default) if validator else self.default
+        return seconds if seconds > 0 else None
+
+    def connection_timeout(self):
+        """Whole seconds for pyodbc's connection.timeout (0 = none): only the explicit connection_timeout."""
+        if not self.enabled or self.connection <= 0:
+            return 0
+        return int(self.connection + 0.999)
+
+
+class QueryWatchdog:
+    """Cancels a running cursor once its time limit passes (a no-op without a limit)."""
+
+    def __init__(self, cursor, seconds):
+        self.seconds = seconds
+        self.fired = False
+        self._cursor = cursor
+        self._timer = None
+        if seconds:
+            self._timer = threading.Timer(seconds, self._cancel)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel(self):
+        self.fired = True
+        try:
+            self._cursor.cancel()
+        except Exception as e:
+            logging.warning(f"⚠️ Could not cancel timed-out query: {e}")
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    @staticmethod
+    def is_timeout(error):
+        """Native driver timeout (ODBC SQLSTATE HYT00) or a cancel (HY008)."""
+        text = str(error)
+        return "HYT00" in text or "HY008" in text or "timeout expired" in text.lower()
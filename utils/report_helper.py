@@ -6,23 +6,40 @@ import pandas as pd
 import logging
 from tabulate import tabulate
 import textwrap
+from utils.run_history import RunHistory
 
 
 class ReportHelper:
+    # Every workbook written in this run, in order (used to post-process a test's reports)
+    saved_reports = []
+
     def __init__(self, config_path="config.ini"):
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
         self.output_folder = self.config.get("PATHS ", "report_output_path", fallback="Reports")
         os.makedirs(self.output_folder, exist_ok=True)
+        self.config_path = config_path
+        # PDF next to each workbook, rendered by a background worker
+        self.pdf_reports = self.config.getboolean("PDF_REPORT", "enabled", fallback=False)
+        # Set to the --db section when several environments run together (part of the file name)
+        self.environment = None
 
 
     def save_report(self, data, test_type="Null_Check"):
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             safe_test_type = test_type.replace(" ", "_")  # clean spaces if any
+            environment = f"_{self.environment}" if self.environment else ""
             output_file = os.path.join(
-                self.output_folder, f"{safe_test_type}_{timestamp}.xlsx"
+                self.output_folder, f"{safe_test_type}{environment}_{timestamp}.xlsx"
             )
+            # Same check saved twice within a second (e.g. another environment) → keep both
+            n = 2
+            while output_file in ReportHelper.saved_reports:
+                output_file = os.path.join(
+                    self.output_folder, f"{safe_test_type}{environment}_{timestamp}_{n}.xlsx"
+                )
+                n += 1
             print(f"Saving report to: {output_file}")
 
             df = pd.DataFrame(data)
@@ -30,13 +47,73 @@ class ReportHelper:
 
             print("Report saved successfully.")
             logging.info(f"✅ Report saved at {output_file}")
+            ReportHelper.saved_reports.append(output_file)
         except Exception as e:
             print(f"Failed to save report: {e}")
             logging.error(f"❌ Error saving report: {e}")
             raise
+        # Result rows also go to the queryable run history ([HISTORY])
+        RunHistory.get(self.config_path).record_results(data, safe_test_type, output_file)
+        if self.pdf_reports:
+            self.queue_pdf_report(data, safe_test_type, output_file)
         return output_file  # ✅ MUST return path
 
 
+    def queue_pdf_report(self, data, test_type, xlsx_path):
+        """Render the PDF for a saved workbook in the background; returns the Future (or None)."""
+        try:
+            from utils.generate_pdf_report import PDFReportGenerator, CountCheckPDFGenerator
+
+            if test_type.startswith("Count_Check"):
+                generator = CountCheckPDFGenerator(self.output_folder, config_path=self.config_path)
+                return generator.generate_count_async(data, f"{test_type}_Report", xlsx_path)
+            generator = PDFReportGenerator(self.config_path)
+            generator.output_folder = self.output_folder   # next to the workbook it links to
+            return generator.generate_async(data, test_type.replace("_", " "), xlsx_path)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not queue PDF report for {xlsx_path}: {e}")
+            return None
+
+
+    @staticmethod
+    def wait_for_pdf_reports(timeout=None):
+        """Wait for background PDF renders (no-op when no PDF was queued)."""
+        import sys
+        module = sys.modules.get("utils.generate_pdf_report")
+        return module.wait_for_pdf_reports(timeout) if module else []
+
+
+    @staticmethod
+    def append_query_profile(report_file, records):
+        """Add (or replace) a 'Query_Profile' sheet with the statements issued for this report."""
+        if not records or not os.path.exists(report_file):
+            return
+        from utils.query_profiler import QueryProfiler
+        try:
+            profile_df = QueryProfiler.to_frame(records).sort_values("wall_ms", ascending=False)
+            with pd.ExcelWriter(report_file, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
+                profile_df.to_excel(writer, sheet_name="Query_Profile", index=False)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not add Query_Profile sheet to {report_file}: {e}")
+
+
+    def save_environment_summary(self, rows):
+        """
+        Consolidated report of a multi-environment run: one row per test and --db section,
+        plus a Matrix sheet (check × environment → outcome).
+        """
+        report_file = self.save_report(rows, test_type="Multi_Environment_Summary")
+        try:
+            df = pd.DataFrame(rows)
+            matrix = df.pivot_table(index="Check", columns="Environment", values="Outcome",
+                                    aggfunc=lambda v: ", ".join(sorted(set(v)))).reset_index()
+            with pd.ExcelWriter(report_file, engine="openpyxl", mode="a", if_sheet_exists="replace") as writer:
+                matrix.to_excel(writer, sheet_name="Matrix", index=False)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not add Matrix sheet to {report_file}: {e}")
+        return report_file
+
+
     def print_validation_report_Duplicate(self, results, check_type):
 
         print(f"\n📊 {check_type} Summary:\n")
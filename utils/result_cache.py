@@ -0,0 +1,140 @@
+import os
+import json
+import hashlib
+import logging
+import configparser
+from datetime import datetime, timedelta
+
+
+class ResultCache:
+    """
+    Change-aware cache of check verdicts.
+
+    Entries are keyed by (check, table(s), rule hash). A cached verdict is reused only while
+    the change signal of every table it depends on is unchanged and the entry is younger
+    than max_age_hours. Settings are read from the [RESULT_CACHE] section of config.ini.
+    """
+
+    # Cheap per-table change signals (SQL Server). {table} is the table name in the current DB.
+    SIGNAL_QUERIES = {
+        # Server start time is part of the signal because the DMV is reset on restart
+        "index_usage": """
+            SELECT CONVERT(VARCHAR(33), (SELECT sqlserver_start_time FROM sys.dm_os_sys_info), 126)
+                 + '|' + ISNULL(CONVERT(VARCHAR(33), MAX(last_user_update), 126), '')
+            FROM sys.dm_db_index_usage_stats
+            WHERE database_id = DB_ID()
+              AND object_id = OBJECT_ID('{table}')
+        """,
+        "change_tracking": """
+            SELECT ISNULL(MAX(SYS_CHANGE_VERSION), 0)
+            FROM CHANGETABLE(CHANGES {table}, 0) AS CT
+        """,
+        "checksum": """
+            SELECT CAST(COUNT_BIG(*) AS VARCHAR(20)) + '|' + CAST(CHECKSUM_AGG(BINARY_CHECKSUM(*)) AS VARCHAR(20))
+            FROM {table}
+        """,
+    }
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+
+        self.enabled = config.getboolean("RESULT_CACHE", "enabled", fallback=False)
+        self.max_age_hours = config.getfloat("RESULT_CACHE", "max_age_hours", fallback=24.0)
+        self.signal_type = config.get("RESULT_CACHE", "change_signal", fallback="index_usage").strip().lower()
+        self.cache_file = config.get(
+            "RESULT_CACHE", "cache_file", fallback=os.path.join("Reports", "result_cache.json")
+        )
+
+        if self.signal_type not in self.SIGNAL_QUERIES:
+            logging.warning(f"⚠️ Unknown change_signal '{self.signal_type}', falling back to 'index_usage'")
+            self.signal_type = "index_usage"
+
+        self._entries = self._load() if self.enabled else {}
+        self._signals = {}   # (server, database, table) → signal, computed once per run
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def rule_hash(rule):
+        """Stable hash of whatever defines the check (query text, key columns, ...)."""
+        payload = json.dumps(rule, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _load(self):
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not read result cache {self.cache_file}: {e}")
+            return {}
+
+    def _signal(self, db, table):
+        key = (db.server, db.database, table)
+        if key not in self._signals:
+            query = self.SIGNAL_QUERIES[self.signal_type].format(table=table)
+            try:
+                raw = db.execute_query(query)
+                self._signals[key] = str(raw[0][0]) if raw and raw[0][0] is not None else None
+            except Exception as e:
+                logging.warning(f"⚠️ Change signal unavailable for {db.database}.{table}: {e}")
+                self._signals[key] = None
+        return self._signals[key]
+
+    def _key(self, check, rule, sources):
+        tables = "|".join(f"{db.server}/{db.database}/{table}" for db, table in sources)
+        return f"{check}|{tables}|{self.rule_hash(rule)}"
+
+    # ------------------------------------------------------------------
+    def lookup(self, check, rule, sources):
+        """
+        Return the cached result row for this check, or None on a miss.
+        sources is a list of (DBHelper, table_name) the verdict depends on.
+        """
+        if not self.enabled:
+            return None
+
+        # Read the signals before the check runs, so a change during the run invalidates the entry
+        signals = [self._signal(db, table) for db, table in sources]
+
+        entry = self._entries.get(self._key(check, rule, sources))
+        if not entry or None in signals or signals != entry["signals"]:
+            return None
+
+        stored_at = datetime.fromisoformat(entry["stored_at"])
+        if datetime.now() - stored_at > timedelta(hours=self.max_age_hours):
+            return None
+
+        result = dict(entry["result"])
+        result["Cached"] = f"YES ({entry['stored_at']})"
+        logging.info(f"♻️ {check}: reusing cached verdict for {[t for _, t in sources]}")
+        return result
+
+    def store(self, check, rule, sources, result):
+        """Remember the verdict of a freshly executed check."""
+        if not self.enabled:
+            return
+
+        signals = [self._signal(db, table) for db, table in sources]
+        if None in signals:
+            return
+
+        self._entries[self._key(check, rule, sources)] = {
+            "stored_at": datetime.now().isoformat(timespec="seconds"),
+            "signals": signals,
+            "result": {k: v for k, v in result.items() if k != "Cached"},
+        }
+        self._dirty = True
+
+    def flush(self):
+        """Persist new entries to disk (atomic replace)."""
+        if not self.enabled or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, default=str)
+        os.replace(tmp_file, self.cache_file)
+        self._dirty = False
@@ -0,0 +1,121 @@
+import os
+import pandas as pd
+from utils.workbook_cache import read_sheet
+
+
+def _text(value):
+    """Excel cell → stripped str ('' for NaN / None)."""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value).strip()
+
+
+class ColumnRule:
+    """One row of a DB sheet (SOURCEDB / STAGEDB / TARGETDB ...), normalised once."""
+    __slots__ = ("database", "table", "column", "data_type", "constraints", "is_composite_key", "queries", "index")
+
+    def __init__(self, database, table, column, data_type, constraints, queries, index):
+        self.database = database
+        self.table = table
+        self.column = column
+        self.data_type = data_type              # upper-cased Data_Type
+        self.constraints = constraints          # raw Constraints text ('' when blank)
+        self.is_composite_key = "composite key" in constraints.lower()
+        self.queries = queries                  # {"Other_SQL_query": sql, ...} non-blank only, or None
+        self.index = index                      # row label in the sheet DataFrame
+
+    def query(self, kind):
+        """Custom SQL of this row for a *_SQL_query column ('' when blank)."""
+        return self.queries.get(kind, "") if self.queries else ""
+
+    def __repr__(self):
+        return f"ColumnRule({self.table}.{self.column})"
+
+
+class RuleBook:
+    """
+    A DB sheet compiled once into ColumnRule objects with prebuilt indexes:
+    table → rules, table → composite keys, (table, column, kind) → custom SQL.
+
+    Validators look rules up in O(1) instead of walking the sheet with iterrows()
+    and re-filtering it per table / column. Books are shared per (workbook, sheet)
+    until the workbook changes on disk.
+    """
+
+    _books = {}   # (excel path, mtime, sheet) → RuleBook
+
+    def __init__(self, df):
+        self.df = df if df is not None else pd.DataFrame()
+        self.rules = []
+        self._by_table = {}
+        self._keys = {}
+        self._keys_lower = {}
+        self._sql = {}
+
+        if self.df.empty or "table_name" not in self.df.columns:
+            return
+
+        def col(name):
+            return self.df[name].tolist() if name in self.df.columns else [None] * len(self.df)
+
+        sql_cols = [c for c in self.df.columns if str(c).endswith("_SQL_query")]
+        sql_values = {c: col(c) for c in sql_cols}
+
+        for i, (label, database, table, column, data_type, constraints) in enumerate(zip(
+                self.df.index, col("Database"), col("table_name"), col("column_name"),
+                col("Data_Type"), col("Constraints"))):
+            table = _text(table)
+            if not table:
+                continue
+            column = _text(column)
+            queries = {c: _text(sql_values[c][i]) for c in sql_cols if _text(sql_values[c][i])} or None
+            rule = ColumnRule(_text(database), table, column, _text(data_type).upper(),
+                              _text(constraints), queries, label)
+            self.rules.append(rule)
+            self._by_table.setdefault(table, []).append(rule)
+            if rule.is_composite_key:
+                self._keys.setdefault(table, []).append(column)
+            for kind, sql in (queries or {}).items():
+                self._sql.setdefault((table, column, kind), sql)   # first non-blank wins
+
+        for table, keys in self._keys.items():
+            self._keys_lower.setdefault(table.lower(), keys)
+
+    @classmethod
+    def for_sheet(cls, excel_path, sheet_name, df=None):
+        """Shared book for one workbook sheet; df (already read) avoids a second read."""
+        try:
+            key = (os.path.abspath(excel_path), os.path.getmtime(excel_path), sheet_name)
+        except OSError:
+            key = None
+        if key in cls._books:
+            return cls._books[key]
+        if df is None:
+            df = read_sheet(excel_path, sheet_name=sheet_name, engine="openpyxl")
+        book = cls(df)
+        if key is not None:
+            cls._books[key] = book
+        return book
+
+    # ------------------------------------------------------------------
+    @property
+    def tables(self):
+        """Tables in sheet order."""
+        return list(self._by_table)
+
+    def table_rules(self, table):
+        return self._by_table.get(table, [])
+
+    def composite_keys(self, table=None):
+        """COMPOSITE KEY columns of one table (case-insensitive name), or table → keys for all."""
+        if table is None:
+            return self._keys
+        return self._keys.get(table) or self._keys_lower.get(str(table).lower(), [])
+
+    def custom_sql(self, table, column, kind):
+        """First non-blank <kind> SQL of any row for table.column ('' when none)."""
+        return self._sql.get((table, column, kind), "")
+
+    def frame(self, table):
+        """Rows of one table as a DataFrame (for helpers that still take the sheet)."""
+        return self.df.loc[[rule.index for rule in self.table_rules(table)]]
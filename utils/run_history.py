@@ -0,0 +1,336 @@
+import os
+import json
+import socket
+import sqlite3
+import hashlib
+import logging
+import argparse
+import subprocess
+import configparser
+from datetime import datetime
+import pandas as pd
+from tabulate import tabulate
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id        TEXT PRIMARY KEY,
+    started_at    TEXT,
+    finished_at   TEXT,
+    db_section    TEXT,
+    git_commit    TEXT,
+    workbook_path TEXT,
+    workbook_hash TEXT,
+    host          TEXT,
+    exit_status   INTEGER
+);
+CREATE TABLE IF NOT EXISTS checks (
+    run_id      TEXT,
+    check_name  TEXT,
+    started_at  TEXT,
+    duration_ms REAL,
+    outcome     TEXT,
+    queries     INTEGER,
+    query_ms    REAL,
+    environment TEXT,
+    PRIMARY KEY (run_id, check_name)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id      TEXT,
+    check_name  TEXT,
+    test_type   TEXT,
+    table_name  TEXT,
+    column_name TEXT,
+    passed      INTEGER,
+    report_file TEXT,
+    row_json    TEXT,
+    environment TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_runs_started ON runs (started_at);
+CREATE INDEX IF NOT EXISTS ix_checks_name ON checks (check_name, run_id);
+CREATE INDEX IF NOT EXISTS ix_results_run ON results (run_id, test_type, table_name);
+CREATE INDEX IF NOT EXISTS ix_results_table ON results (table_name, test_type, run_id);
+"""
+
+# Columns added after the first release: (table, column, type), added to older history files
+_MIGRATIONS = [("checks", "environment", "TEXT"), ("results", "environment", "TEXT")]
+
+# Result-row keys the validators use for the checked table / column / verdict
+TABLE_KEYS = ("Table_name", "Table", "Table_Name", "Table_Excel", "Source_Table", "Target_Table",
+              "Stage_Table", "Parent_Table", "Child_Table", "View_Name", "deleted_table", "Component")
+COLUMN_KEYS = ("Column_names", "Column", "Column_Name", "Column_Excel", "Child_Column", "Step")
+PASS_VALUES = {"PASS", "PASSED", "TRUE", "OK", "MATCH", "SUCCESS"}
+FAIL_VALUES = {"FAIL", "FAILED", "FALSE", "MISMATCH", "REGRESSION", "ERROR", "TIMEOUT"}
+
+
+def _first(row, keys):
+    for key in keys:
+        value = row.get(key)
+        if value is not None and str(value).strip() not in ("", "nan"):
+            return str(value)
+    return None
+
+
+def _passed(row):
+    """1 / 0 from IsCheckPassed or a Status-like column, None when the row carries no verdict."""
+    value = row.get("IsCheckPassed")
+    if isinstance(value, bool) or value in (0, 1):
+        return int(bool(value))
+    for key in ("IsCheckPassed", "Status", "Result_Status", "DataType_Status", "Constraint_Status"):
+        text = str(row.get(key, "")).strip().upper()
+        if any(text.startswith(v) for v in FAIL_VALUES) or "❌" in text:
+            return 0
+        if any(text.startswith(v) for v in PASS_VALUES) or "✅" in text:
+            return 1
+    return None
+
+
+class RunHistory:
+    """
+    Queryable history of every run: run metadata, per-check duration / outcome and every
+    result row saved through ReportHelper, appended to one SQLite file ([HISTORY] db_file).
+
+    Indexed by run, check and table, so "what failed last night vs tonight" (compare_runs)
+    and "which checks got slower" (slower_checks) are single queries:
+
+        python -m utils.run_history --compare
+        python -m utils.run_history --slower 25
+    """
+
+    _instance = None
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.enabled = config.getboolean("HISTORY", "enabled", fallback=True)
+        self.db_file = config.get("HISTORY", "db_file", fallback=os.path.join("Reports", "run_history.sqlite"))
+        self.store_rows = config.getboolean("HISTORY", "store_rows", fallback=True)
+        self.keep_runs = config.getint("HISTORY", "keep_runs", fallback=0)
+        self.workbook_path = config.get("PATHS", "excel_file_path", fallback="")
+
+        self.run_id = None
+        self.current_check = None
+        self.current_environment = None
+        self._check_started = None
+        self._conn = None
+
+    @classmethod
+    def get(cls, config_path="config.ini"):
+        """Shared store for the whole run (first config_path wins)."""
+        if cls._instance is None:
+            cls._instance = cls(config_path)
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    def connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            for table, column, data_type in _MIGRATIONS:
+                existing = {r[1] for r in self._conn.execute(f"PRAGMA table_info({table})")}
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {data_type}")
+        return self._conn
+
+    @staticmethod
+    def _git_commit():
+        try:
+            return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                  timeout=5).stdout.strip() or None
+        except Exception:
+            return None
+
+    def _workbook_hash(self):
+        if not self.workbook_path or not os.path.exists(self.workbook_path):
+            return None
+        digest = hashlib.sha256()
+        with open(self.workbook_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def begin_run(self, db_section=None, run_id=None):
+        """Register this run once (lazily on the first check / report when not called)."""
+        if not self.enabled or self.run_id is not None:
+            return self.run_id
+        from utils.query_profiler import QueryProfiler
+        # Same id as the query profile (query_profile_<run_id>[_<xdist worker>].jsonl); every
+        # pytest-xdist worker joins the one run row the first of them registered
+        self.run_id = run_id or QueryProfiler.get().base_run_id
+        try:
+            conn = self.connect()
+            conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, started_at, db_section, git_commit, workbook_path, "
+                "workbook_hash, host) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, datetime.now().isoformat(timespec="seconds"), db_section, self._git_commit(),
+                 self.workbook_path, self._workbook_hash(), socket.gethostname()))
+            conn.commit()
+        except Exception as e:
+            logging.warning(f"⚠️ Run history disabled, could not open {self.db_file}: {e}")
+            self.enabled = False
+        return self.run_id
+
+    def begin_check(self, check_name, db_section=None, environment=None):
+        """db_section: the run's --db sections (comma list); environment: the one this check runs against."""
+        self.begin_run(db_section)
+        self.current_check = check_name
+        self.current_environment = environment
+        self._check_started = datetime.now()
+
+    def end_check(self, check_name, outcome, duration_s, queries=None, query_ms=None):
+        if not self.enabled or self.run_id is None:
+            return
+        try:
+            conn = self.connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO checks (run_id, check_name, started_at, duration_ms, outcome, "
+                "queries, query_ms, environment) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, check_name,
+                 (self._check_started or datetime.now()).isoformat(timespec="seconds"),
+                 round(duration_s * 1000, 1), outcome, queries, query_ms, self.current_environment))
+            conn.commit()
+        except Exception as e:
+            logging.warning(f"⚠️ Could not record check {check_name} in run history: {e}")
+        self.current_check = None
+        self.current_environment = None
+
+    def record_results(self, data, test_type, report_file=None):
+        """Append one report's result rows (called by ReportHelper.save_report)."""
+        if not self.enabled:
+            return
+        self.begin_run()
+        check_name = self.current_check or test_type
+        rows = data.to_dict("records") if isinstance(data, pd.DataFrame) else list(data or [])
+        try:
+            conn = self.connect()
+            conn.executemany(
+                "INSERT INTO results (run_id, check_name, test_type, table_name, column_name, passed, "
+                "report_file, row_json, environment) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(self.run_id, check_name, test_type, _first(row, TABLE_KEYS), _first(row, COLUMN_KEYS),
+                  _passed(row), report_file,
+                  json.dumps(row, default=str, ensure_ascii=False) if self.store_rows else None,
+                  self.current_environment)
+                 for row in rows if isinstance(row, dict)])
+            conn.commit()
+        except Exception as e:
+            logging.warning(f"⚠️ Could not record {test_type} results in run history: {e}")
+
+    def end_run(self, exit_status=None):
+        if not self.enabled or self.run_id is None:
+            return
+        try:
+            conn = self.connect()
+            conn.execute("UPDATE runs SET finished_at = ?, exit_status = ? WHERE run_id = ?",
+                         (datetime.now().isoformat(timespec="seconds"), exit_status, self.run_id))
+            if self.keep_runs > 0:
+                old = "SELECT run_id FROM runs ORDER BY started_at DESC LIMIT -1 OFFSET ?"
+                for table in ("results", "checks", "runs"):
+                    conn.execute(f"DELETE FROM {table} WHERE run_id IN ({old})", (self.keep_runs,))
+            conn.commit()
+        except Exception as e:
+            logging.warning(f"⚠️ Could not close run {self.run_id} in run history: {e}")
+
+    # ------------------------------------------------------------------
+    def _last_runs(self, n, db_section=None):
+        """Latest n runs that covered db_section (alone or as one environment of a multi-section run)."""
+        query = "SELECT run_id FROM runs"
+        params = []
+        if db_section:
+            query += (" WHERE UPPER(db_section) = UPPER(?)"
+                      " OR run_id IN (SELECT run_id FROM checks WHERE UPPER(environment) = UPPER(?))")
+            params += [db_section, db_section]
+        query += " ORDER BY started_at DESC, run_id DESC LIMIT ?"
+        return [r[0] for r in self.connect().execute(query, params + [n]).fetchall()]
+
+    def compare_runs(self, previous=None, latest=None, db_section=None):
+        """
+        Result rows whose verdict changed between two runs (default: the last two of db_section):
+        NEW_FAILURE, FIXED, NEW_CHECK (failing, absent before) and GONE (failing before, absent now).
+        Verdicts are compared per environment; db_section limits the comparison to that environment.
+        """
+        if previous is None or latest is None:
+            runs = self._last_runs(2, db_section)
+            if len(runs) < 2:
+                return pd.DataFrame()
+            latest, previous = latest or runs[0], previous or runs[1]
+        query = """
+            WITH prev AS (
+                SELECT environment, test_type, table_name, column_name, MIN(passed) AS passed
+                FROM results WHERE run_id = ? AND (? IS NULL OR environment IS NULL OR UPPER(environment) = UPPER(?))
+                GROUP BY environment, test_type, table_name, column_name
+            ),
+            cur AS (
+                SELECT environment, test_type, table_name, column_name, MIN(passed) AS passed
+                FROM results WHERE run_id = ? AND (? IS NULL OR environment IS NULL OR UPPER(environment) = UPPER(?))
+                GROUP BY environment, test_type, table_name, column_name
+            ),
+            joined AS (
+                SELECT c.environment, c.test_type, c.table_name, c.column_name, p.passed AS previous, c.passed AS latest
+                FROM cur c LEFT JOIN prev p
+                  ON p.environment IS c.environment AND p.test_type = c.test_type
+                 AND p.table_name IS c.table_name AND p.column_name IS c.column_name
+                UNION ALL
+                SELECT p.environment, p.test_type, p.table_name, p.column_name, p.passed, NULL
+                FROM prev p
+                WHERE NOT EXISTS (SELECT 1 FROM cur c WHERE c.environment IS p.environment AND c.test_type = p.test_type
+                                  AND c.table_name IS p.table_name AND c.column_name IS p.column_name)
+            )
+            SELECT environment, test_type, table_name, column_name, previous, latest,
+                   CASE WHEN previous = 1 AND latest = 0 THEN 'NEW_FAILURE'
+                        WHEN previous = 0 AND latest = 1 THEN 'FIXED'
+                        WHEN previous IS NULL AND latest = 0 THEN 'NEW_CHECK'
+                        WHEN latest IS NULL AND previous = 0 THEN 'GONE'
+                   END AS change
+            FROM joined
+            WHERE change IS NOT NULL
+            ORDER BY change, environment, test_type, table_name, column_name
+        """
+        df = pd.read_sql(query, self.connect(),
+                         params=[previous, db_section, db_section, latest, db_section, db_section])
+        df.insert(0, "previous_run", previous)
+        df.insert(1, "latest_run", latest)
+        return df
+
+    def slower_checks(self, threshold_pct=25, baseline_runs=5, db_section=None):
+        """Checks of the latest run slower than their median over the previous baseline_runs runs."""
+        runs = self._last_runs(baseline_runs + 1, db_section)
+        if len(runs) < 2:
+            return pd.DataFrame()
+        df = pd.read_sql(
+            f"SELECT run_id, check_name, duration_ms FROM checks WHERE run_id IN ({', '.join('?' for _ in runs)})"
+            " AND (? IS NULL OR environment IS NULL OR UPPER(environment) = UPPER(?))",
+            self.connect(), params=runs + [db_section, db_section])
+        latest = df[df["run_id"] == runs[0]].set_index("check_name")["duration_ms"]
+        baseline = df[df["run_id"] != runs[0]].groupby("check_name")["duration_ms"].median()
+        out = pd.DataFrame({"latest_ms": latest, "baseline_ms": baseline}).dropna()
+        out["change_pct"] = ((out["latest_ms"] - out["baseline_ms"]) / out["baseline_ms"] * 100).round(1)
+        out = out[out["change_pct"] > threshold_pct].sort_values("change_pct", ascending=False)
+        return out.reset_index().rename(columns={"index": "check_name"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the validation run history")
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument("--db", default=None, help="Only runs of this config section")
+    parser.add_argument("--compare", nargs="*", metavar="RUN_ID",
+                        help="Changed verdicts between two runs (default: the last two)")
+    parser.add_argument("--slower", type=float, metavar="PCT",
+                        help="Checks of the latest run slower than their baseline by more than PCT %%")
+    args = parser.parse_args()
+
+    history = RunHistory(args.config)
+    if args.slower is not None:
+        df = history.slower_checks(args.slower, db_section=args.db)
+    else:
+        previous, latest = (args.compare + [None, None])[:2] if args.compare else (None, None)
+        df = history.compare_runs(previous, latest, db_section=args.db)
+    if df.empty:
+        print("✅ Nothing to report")
+    else:
+        print(tabulate(df, headers="keys", tablefmt="grid", showindex=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import math
+import logging
+import configparser
+import pandas as pd
+
+
+class SamplingPlan:
+    """Sampling settings for one table (or one transformation row)."""
+    __slots__ = ("table", "rate", "seed", "min_rows", "key_columns", "total_rows")
+
+    def __init__(self, table, rate, seed, min_rows, key_columns, total_rows=None):
+        self.table = table
+        self.rate = rate
+        self.seed = seed
+        self.min_rows = min_rows
+        self.key_columns = key_columns
+        self.total_rows = total_rows
+
+    @property
+    def label(self):
+        return f"YES (rate={self.rate:g}, seed={self.seed})"
+
+
+class SamplingHelper:
+    """
+    Statistical sampling for expensive row-level checks on huge tables.
+
+    Per-table settings come from optional Excel columns (Sample_Rate, Sample_Seed,
+    Sample_Min_Rows). Rows are picked with a deterministic hash-modulo on the
+    composite key, so the same keys are sampled on every side and in every run;
+    tables without a key fall back to TABLESAMPLE ... REPEATABLE(seed).
+    Global switches live in the [SAMPLING] section of config.ini.
+    """
+
+    BUCKETS = 1000000
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.enabled = config.getboolean("SAMPLING", "enabled", fallback=False)
+        self.z = config.getfloat("SAMPLING", "z_score", fallback=1.96)   # 95% confidence
+        self.escalate = config.getboolean("SAMPLING", "escalate_on_violation", fallback=True)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _settings(rows):
+        """First non-blank Sample_* values of the given Excel rows."""
+        def first(col, cast, default):
+            if col not in rows.columns:
+                return default
+            vals = rows[col].dropna()
+            vals = vals[vals.astype(str).str.strip() != ""]
+            return cast(vals.iloc[0]) if not vals.empty else default
+
+        return (
+            first("Sample_Rate", float, None),
+            first("Sample_Seed", int, 42),
+            first("Sample_Min_Rows", int, 0),
+        )
+
+    def plan_for_table(self, db, df, table):
+        """
+        Build a plan for a table from its rows in the DB sheet, or None for an exact check.
+        Tables smaller than Sample_Min_Rows are always checked exactly.
+        """
+        if not self.enabled or df is None or "table_name" not in df.columns:
+            return None
+
+        rows = df[df["table_name"] == table]
+        rate, seed, min_rows = self._settings(rows)
+        if not rate or rate >= 1:
+            return None
+
+        constraints = rows["Constraints"].fillna("").str.lower() if "Constraints" in rows.columns else None
+        keys = rows[constraints.str.contains("composite key")]["column_name"].tolist() if constraints is not None else []
+
+        total_rows = self.table_row_count(db, table)
+        if total_rows is not None and total_rows < min_rows:
+            logging.info(f"📏 {table} has {total_rows} rows (< {min_rows}), running exact check")
+            return None
+
+        return SamplingPlan(table, rate, seed, min_rows, keys, total_rows)
+
+    def plan_for_row(self, row, key_column):
+        """Plan for a single Excel row (e.g. TRANSFORMATION), sampled on a known key column."""
+        if not self.enabled:
+            return None
+        rate, seed, min_rows = self._settings(pd.DataFrame([row]))
+        if not rate or rate >= 1:
+            return None
+        return SamplingPlan(None, rate, seed, min_rows, [key_column])
+
+    @staticmethod
+    def table_row_count(db, table):
+        """Row count from partition metadata (no scan)."""
+        try:
+            raw = db.execute_query(f"""
+                SELECT SUM(row_count)
+                FROM sys.dm_db_partition_stats
+                WHERE object_id = OBJECT_ID('{table}') AND index_id IN (0, 1)
+            """)
+            return int(raw[0][0]) if raw and raw[0][0] is not None else None
+        except Exception as e:
+            logging.warning(f"⚠️ Could not read row count for {table}: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    def hash_filter(self, plan, alias=""):
+        """Deterministic predicate keeping ~rate of the keys."""
+        prefix = f"{alias}." if alias else ""
+        key_expr = ", ".join(f"{prefix}{k}" for k in plan.key_columns)
+        threshold = int(plan.rate * self.BUCKETS)
+        return f"ABS(CAST(CHECKSUM({key_expr}, {plan.seed}) AS BIGINT)) % {self.BUCKETS} < {threshold}"
+
+    def sampled_from(self, plan):
+        """FROM clause + WHERE predicate (may be empty) for a sampled scan of plan.table."""
+        if plan.key_columns:
+            return plan.table, self.hash_filter(plan)
+        percent = round(plan.rate * 100, 4)
+        return f"{plan.table} TABLESAMPLE ({percent} PERCENT) REPEATABLE ({plan.seed})", ""
+
+    def sampled_violation_count(self, db, plan, violation_predicate):
+        """Run one sampled scan and return (sample_size, violations)."""
+        source, predicate = self.sampled_from(plan)
+        where = f"WHERE {predicate}" if predicate else ""
+        raw = db.execute_query(f"""
+            SELECT COUNT(*), SUM(CASE WHEN {violation_predicate} THEN 1 ELSE 0 END)
+            FROM {source}
+            {where}
+        """)
+        sample_size, violations = raw[0] if raw else (0, 0)
+        return int(sample_size or 0), int(violations or 0)
+
+    def sample_query(self, plan, query, key_column, value_column):
+        """Wrap an arbitrary two-column (key, value) query so only sampled keys are returned."""
+        inner = query.strip().rstrip(";")
+        return f"""
+            SELECT q.{key_column}, q.{value_column}
+            FROM ({inner}) AS q ({key_column}, {value_column})
+            WHERE {self.hash_filter(plan, alias="q")}
+        """
+
+    # ------------------------------------------------------------------
+    def wilson_interval(self, violations, sample_size):
+        """Wilson score interval for the violation rate."""
+        if not sample_size:
+            return 0.0, 0.0, 1.0
+        p = violations / sample_size
+        z2 = self.z ** 2
+        denom = 1 + z2 / sample_size
+        centre = (p + z2 / (2 * sample_size)) / denom
+        half = self.z * math.sqrt(p * (1 - p) / sample_size + z2 / (4 * sample_size ** 2)) / denom
+        return p, max(0.0, centre - half), min(1.0, centre + half)
+
+    def annotate(self, result, plan, violations, sample_size):
+        """Add sampling columns (estimate + confidence bounds) to a report row."""
+        rate, low, high = self.wilson_interval(violations, sample_size)
+        result.update({
+            "Sampled": plan.label,
+            "Sample_Size": sample_size,
+            "Est_Violation_Rate": round(rate, 6),
+            "CI_Low": round(low, 6),
+            "CI_High": round(high, 6),
+            "Est_Violations": round(rate * plan.total_rows) if plan.total_rows else None,
+        })
+        return result
+
+    @staticmethod
+    def not_sampled(result):
+        result.update({
+            "Sampled": "NO", "Sample_Size": None, "Est_Violation_Rate": None,
+            "CI_Low": None, "CI_High": None, "Est_Violations": None,
+        })
+        return result
+
+    @staticmethod
+    def escalated(result):
+        result["Sampled"] = "ESCALATED (exact)"
+        return result
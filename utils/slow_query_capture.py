@@ -0,0 +1,177 @@
+import os
+import re
+import json
+import logging
+import configparser
+
+
+class SlowQueryCapture:
+    """
+    Captures SQL Server execution statistics and plans for statements slower than a threshold.
+
+    Two modes ([PROFILING] slow_query_capture):
+      - dmv   : read last logical reads / CPU / elapsed time and the cached XML plan from
+                sys.dm_exec_query_stats + sys.dm_exec_query_plan (no re-execution)
+      - rerun : re-run plain queries with SET STATISTICS IO, TIME, XML ON to get per-table
+                logical reads and the actual plan; anything that may write (DML / DDL / EXEC /
+                SELECT ... INTO, also inside a WITH) falls back to dmv and is never re-executed
+    Output goes to <slow_query_dir>/<run_id>/: one .sqlplan and one .json file per statement.
+    """
+
+    QUERY_START = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+    # Comments, string literals and quoted identifiers, removed before looking for keywords
+    _NOT_CODE = re.compile(r"--[^\n]*|/\*.*?\*/|N?'(?:[^']|'')*'|\[[^\]]*\]|\"[^\"]*\"", re.S)
+    WRITES = re.compile(
+        r"\b(INSERT|UPDATE|DELETE|MERGE|INTO|CREATE|ALTER|DROP|TRUNCATE|EXEC|EXECUTE|"
+        r"GRANT|REVOKE|DENY|BULK|OPENROWSET|OPENQUERY|DBCC|BACKUP|RESTORE|KILL|SHUTDOWN)\b",
+        re.I,
+    )
+    _IO = re.compile(r"Table '([^']+)'\. Scan count (\d+), logical reads (\d+)", re.I)
+    _TIME = re.compile(r"CPU time = (\d+) ms,\s*elapsed time = (\d+) ms", re.I)
+
+    DMV_QUERY = """
+        SELECT TOP 1
+            qs.execution_count,
+            qs.last_logical_reads,
+            qs.last_worker_time / 1000  AS last_cpu_ms,
+            qs.last_elapsed_time / 1000 AS last_elapsed_ms,
+            CAST(qp.query_plan AS NVARCHAR(MAX)) AS query_plan
+        FROM sys.dm_exec_query_stats qs
+        CROSS APPLY sys.dm_exec_sql_text(qs.sql_handle) st
+        CROSS APPLY sys.dm_exec_query_plan(qs.plan_handle) qp
+        WHERE st.text LIKE ?
+        ORDER BY qs.last_execution_time DESC
+    """
+
+    def __init__(self, config_path="config.ini", run_id=""):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.threshold_ms = config.getfloat("PROFILING", "slow_query_ms", fallback=5000)
+        self.mode = config.get("PROFILING", "slow_query_capture", fallback="dmv").strip().lower()
+        self.output_dir = os.path.join(
+            config.get("PROFILING", "slow_query_dir", fallback=os.path.join("Reports", "slow_queries")),
+            run_id,
+        )
+        self._count = 0
+
+    def is_slow(self, wall_ms):
+        return self.mode in ("dmv", "rerun") and wall_ms >= self.threshold_ms
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _like_pattern(statement):
+        """LIKE pattern matching the statement text in the plan cache."""
+        head = str(statement).strip()[:120]
+        escaped = re.sub(r"([\[\]%_])", r"[\1]", head)
+        return f"%{escaped}%"
+
+    @classmethod
+    def safe_to_rerun(cls, statement):
+        """True only for a SELECT / WITH query with no DML, DDL, EXEC or INTO outside comments and literals."""
+        code = cls._NOT_CODE.sub(" ", str(statement))
+        return bool(cls.QUERY_START.match(code)) and not cls.WRITES.search(code)
+
+    @staticmethod
+    def _messages(cursor):
+        return [str(text) for _, text in (getattr(cursor, "messages", None) or [])]
+
+    def _capture_dmv(self, conn, statement):
+        cursor = conn.cursor()
+        try:
+            cursor.execute(self.DMV_QUERY, self._like_pattern(statement))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        if row is None:
+            return {"source": "dmv", "found": False}, None
+        return {
+            "source": "dmv",
+            "found": True,
+            "execution_count": row[0],
+            "logical_reads": row[1],
+            "cpu_ms": row[2],
+            "elapsed_ms": row[3],
+        }, row[4]
+
+    def _capture_rerun(self, conn, statement, params):
+        messages, plan_xml = [], None
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SET STATISTICS IO, TIME ON")
+            cursor.execute("SET STATISTICS XML ON")
+            cursor.execute(statement, *params)
+            while True:
+                messages.extend(self._messages(cursor))
+                if cursor.description and "showplan" in str(cursor.description[0][0]).lower():
+                    plan_xml = cursor.fetchone()[0]
+                elif cursor.description:
+                    cursor.fetchall()
+                if not cursor.nextset():
+                    break
+        finally:
+            try:
+                cursor.execute("SET STATISTICS XML OFF")
+                cursor.execute("SET STATISTICS IO, TIME OFF")
+            finally:
+                cursor.close()
+
+        text = "\n".join(messages)
+        io_stats = [
+            {"table": t, "scan_count": int(s), "logical_reads": int(r)}
+            for t, s, r in self._IO.findall(text)
+        ]
+        times = self._TIME.findall(text)
+        return {
+            "source": "rerun",
+            "found": True,
+            "logical_reads": sum(i["logical_reads"] for i in io_stats),
+            "cpu_ms": sum(int(c) for c, _ in times),
+            "elapsed_ms": sum(int(e) for _, e in times),
+            "io_by_table": io_stats,
+        }, plan_xml
+
+    # ------------------------------------------------------------------
+    def capture(self, conn, statement, params, record):
+        """Capture stats + plan for a slow statement; updates the profile record in place."""
+        try:
+            if self.mode == "rerun" and self.safe_to_rerun(statement):
+                stats, plan_xml = self._capture_rerun(conn, statement, params)
+            else:
+                stats, plan_xml = self._capture_dmv(conn, statement)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not capture execution stats for slow statement: {e}")
+            return None
+
+        self._count += 1
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = "_".join(str(p) for p in (self._count, record.get("validator"), record.get("table")) if p)
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)[:80]
+
+        plan_file = None
+        if plan_xml:
+            plan_file = os.path.join(self.output_dir, f"{name}.sqlplan")
+            with open(plan_file, "w", encoding="utf-8") as f:
+                f.write(plan_xml)
+
+        stats.update({
+            "check": record.get("check"),
+            "validator": record.get("validator"),
+            "table": record.get("table"),
+            "column": record.get("column"),
+            "wall_ms": record.get("wall_ms"),
+            "statement": str(statement),
+            "plan_file": plan_file,
+        })
+        with open(os.path.join(self.output_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2, default=str)
+
+        record.update({
+            "logical_reads": stats.get("logical_reads"),
+            "cpu_ms": stats.get("cpu_ms"),
+            "plan_file": plan_file,
+        })
+        logging.warning(
+            f"🐢 Slow statement ({record.get('wall_ms')} ms) in {record.get('validator')} / {record.get('table')}: "
+            f"logical reads={stats.get('logical_reads')}, CPU={stats.get('cpu_ms')} ms → {self.output_dir}"
+        )
+        return stats
@@ -0,0 +1,53 @@
+import os
+import glob
+import logging
+from utils.db_helper import DBHelper
+from utils.duckdb_engine import DuckDBConnection
+
+
+# One in-memory DuckDB instance per snapshot directory. Every <database>/ folder becomes a
+# catalog with a dbo schema and one view per <table>.parquet, so the validators' three-part
+# names (SOURCE_DB.dbo.source_patients) and T-SQL (translated as for the DuckDB stand-in)
+# run unchanged against the local columnar copies.
+_INSTANCES = {}
+
+
+def _instance(snapshot_dir):
+    import duckdb
+
+    path = os.path.abspath(snapshot_dir)
+    if path not in _INSTANCES:
+        instance = duckdb.connect(":memory:")
+        for folder in sorted(glob.glob(os.path.join(path, "*"))):
+            if not os.path.isdir(folder):
+                continue
+            name = os.path.basename(folder)
+            instance.execute(f"ATTACH ':memory:' AS \"{name}\"")
+            instance.execute(f"CREATE SCHEMA \"{name}\".dbo")
+            for parquet_file in sorted(glob.glob(os.path.join(folder, "*.parquet"))):
+                table = os.path.splitext(os.path.basename(parquet_file))[0]
+                source = parquet_file.replace("'", "''")
+                instance.execute(f"CREATE VIEW \"{name}\".dbo.\"{table}\" AS SELECT * FROM read_parquet('{source}')")
+        _INSTANCES[path] = instance
+    return _INSTANCES[path]
+
+
+def _snapshot_connection(helper):
+    snapshot_dir = helper.options.get("snapshot_dir", os.path.join("Reports", "snapshots"))
+    if not os.path.isdir(os.path.join(snapshot_dir, helper.database)):
+        raise FileNotFoundError(
+            f"No snapshot of {helper.database} in {snapshot_dir} "
+            f"(python -m utils.snapshot_store --db <section>)"
+        )
+    logging.info(f"📦 Offline: {helper.database} from snapshot {snapshot_dir}")
+    return DuckDBConnection(_instance(snapshot_dir), helper.database)
+
+
+def reset():
+    """Drop cached instances (e.g. after taking a new snapshot in the same process)."""
+    for instance in _INSTANCES.values():
+        instance.close()
+    _INSTANCES.clear()
+
+
+DBHelper.register_connection_factory("snapshot", _snapshot_connection)
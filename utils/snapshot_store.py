@@ -0,0 +1,141 @@
+import os
+import json
+import logging
+import argparse
+import configparser
+from datetime import datetime
+from utils.db_helper import DBHelper
+from utils.rule_model import RuleBook
+from utils.workbook_cache import read_sheet
+from utils.parquet_schema import arrow_schema, arrow_table
+
+
+class SnapshotStore:
+    """
+    Local Parquet copies of the mapped tables, so comparisons can be re-run offline.
+
+    take() streams each table through DBHelper.iter_query ([SNAPSHOT] fetch_size rows per
+    fetchmany) into <snapshot_dir>/<database>/<table>.parquet and records it in manifest.json;
+    memory stays at one batch per table. With [SNAPSHOT] offline = true every DB section
+    connects to the snapshot engine (utils/snapshot_engine.py) instead of SQL Server.
+
+    Tables of a section: its Table_Mapping column (source_table / stage_table / target_table)
+    plus the tables of its own DB sheet, or an explicit list.
+    """
+
+    MAPPING_COLUMNS = {"SOURCEDB": "source_table", "STAGEDB": "stage_table", "TARGETDB": "target_table"}
+
+    def __init__(self, config_path="config.ini"):
+        self.config_path = config_path
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.snapshot_dir = config.get("SNAPSHOT", "snapshot_dir", fallback=os.path.join("Reports", "snapshots"))
+        self.fetch_size = config.getint("SNAPSHOT", "fetch_size", fallback=50000)
+        self.offline = config.getboolean("SNAPSHOT", "offline", fallback=False)
+        self.excel_path = config.get("PATHS", "excel_file_path", fallback=None)
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.snapshot_dir, "manifest.json")
+
+    def file_for(self, database, table):
+        return os.path.join(self.snapshot_dir, database, f"{table}.parquet")
+
+    # ------------------------------------------------------------------
+    def tables_for(self, section):
+        """Mapped tables + DB sheet tables of one config.ini section, in sheet order."""
+        tables = []
+        column = self.MAPPING_COLUMNS.get(section.upper())
+        try:
+            mapping = read_sheet(self.excel_path, sheet_name="Table_Mapping")
+            if column in mapping.columns:
+                tables += [str(t).strip() for t in mapping[column].dropna()]
+        except Exception as e:
+            logging.warning(f"⚠️ Table_Mapping not readable, using the {section} sheet only: {e}")
+        try:
+            tables += RuleBook.for_sheet(self.excel_path, section).tables
+        except Exception:
+            pass   # no DB sheet for this section
+        return [t for t in dict.fromkeys(tables) if t and t.lower() != "nan"]
+
+    def take(self, section, tables=None):
+        """Extract the tables of section (live connection, never the snapshot); returns {table: rows}."""
+        db = DBHelper.from_config_section(self.config_path, section, use_snapshot=False)
+        db.connect()
+        taken = {}
+        try:
+            for table in tables or self.tables_for(section):
+                try:
+                    taken[table] = self._extract(db, table)
+                    logging.info(f"📦 Snapshot {db.database}.{table}: {taken[table]} rows")
+                except Exception as e:
+                    logging.error(f"❌ Could not snapshot {db.database}.{table}: {e}")
+        finally:
+            db.close()
+        self._record(section, db.database, taken)
+        return taken
+
+    def _extract(self, db, table):
+        import pyarrow.parquet as pq
+
+        path = self.file_for(db.database, table)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        writer, schema, rows_written = None, None, 0
+        try:
+            query = f"SELECT * FROM {db.database}.dbo.{table}"
+            for description, rows in db.iter_query(query, batch_size=self.fetch_size, describe=True):
+                if writer is None:
+                    # Declared column types, not the first batch's values: every batch fits
+                    schema = arrow_schema(description)
+                    writer = pq.ParquetWriter(tmp_path, schema)
+                writer.write_table(arrow_table(rows, schema))
+                rows_written += len(rows)
+        except Exception:
+            if writer is not None:
+                writer.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if writer is None:
+            raise ValueError("query returned no columns")
+        writer.close()
+        os.replace(tmp_path, path)   # a failed extract never replaces the previous snapshot
+        return rows_written
+
+    # ------------------------------------------------------------------
+    def manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _record(self, section, database, taken):
+        manifest = self.manifest()
+        entry = manifest.setdefault(database, {"section": section, "tables": {}})
+        entry["section"] = section
+        now = datetime.now().isoformat(timespec="seconds")
+        for table, rows in taken.items():
+            entry["tables"][table] = {"rows": rows, "taken_at": now,
+                                      "file": os.path.relpath(self.file_for(database, table), self.snapshot_dir)}
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Snapshot mapped tables to local Parquet for offline comparisons")
+    parser.add_argument("--db", nargs="+", help="config.ini sections, e.g. SOURCEDB STAGEDB TARGETDB")
+    parser.add_argument("--tables", nargs="+", help="only these tables (default: mapped + DB sheet tables)")
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument("--list", action="store_true", help="show what the snapshot directory holds")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.config)
+    if args.list or not args.db:
+        for database, entry in store.manifest().items():
+            for table, info in entry["tables"].items():
+                print(f"{entry['section']:<10} {database}.{table:<40} {info['rows']:>12} rows  {info['taken_at']}")
+    for section in args.db or []:
+        store.take(section.upper(), args.tables)
@@ -0,0 +1,244 @@
+import re
+import time
+import logging
+import configparser
+from datetime import datetime
+
+# msdb.dbo.sysjobhistory.run_status
+RUN_STATUS = {0: "Failed", 1: "Succeeded", 2: "Retry", 3: "Canceled", 4: "In Progress"}
+
+_START_JOB = re.compile(r"sp_start_job\b", re.IGNORECASE)
+_JOB_NAME_ARG = re.compile(r"@job_name\s*=\s*N?'((?:[^']|'')*)'", re.IGNORECASE)
+
+
+def _placeholders(values):
+    return ", ".join("?" for _ in values)
+
+
+def run_duration_seconds(run_duration):
+    """sysjobhistory.run_duration is an HHMMSS integer."""
+    if run_duration is None:
+        return None
+    d = int(run_duration)
+    return (d // 10000) * 3600 + (d // 100 % 100) * 60 + d % 100
+
+
+class AgentJob:
+    """One row of the TARGETDW sheet as the runner sees it."""
+
+    def __init__(self, job_name, command, timeout_seconds):
+        self.job_name = job_name
+        self.command = command
+        self.timeout_seconds = timeout_seconds
+        self.is_agent_job = bool(_START_JOB.search(command))
+        match = _JOB_NAME_ARG.search(command)
+        # Name the Agent knows the job by (the sheet name is only a label)
+        self.agent_name = match.group(1).replace("''", "'") if match else job_name
+
+        self.status = "PENDING"      # PENDING → RUNNING → PASS / FAIL / TIMEOUT
+        self.run_status = None
+        self.requested_at = None     # server time just before sp_start_job
+        self.started_at = None       # sysjobactivity.start_execution_date
+        self.finished_at = None
+        self.duration = None
+        self.message = None
+        self.error = None
+        self._started = None         # local clock, for the timeout
+
+    def result(self):
+        return {
+            "Job_Name": self.job_name,
+            "Command": self.command,
+            "Status": self.status,
+            "Run_Status": self.run_status,
+            "Started_At": self.started_at,
+            "Finished_At": self.finished_at,
+            "Execution_Time": self.duration,
+            "Message": self.message,
+            "Error": self.error,
+        }
+
+
+class SQLAgentJobRunner:
+    """
+    Starts SQL Agent jobs without waiting on each one and follows them all with one
+    batched msdb.dbo.sysjobactivity / sysjobhistory query per poll.
+
+    Commands that call sp_start_job return as soon as the Agent has queued the job, so the
+    runner tracks the run the Agent records for the current Agent session and reports its
+    own start / stop times, outcome and per-step history. Any other command (EXEC of a
+    procedure, ...) is synchronous and is timed around the call.
+
+    [JOBS] in config.ini: max_concurrent_jobs, poll_seconds, default_timeout_seconds,
+    stop_on_timeout. A Timeout_Seconds column in the jobs sheet overrides the default per job.
+    """
+
+    ACTIVITY_SQL = """
+        SELECT j.name AS Job_Name,
+               a.start_execution_date,
+               a.stop_execution_date,
+               h.run_status,
+               h.run_duration,
+               h.message
+        FROM msdb.dbo.sysjobs j
+        JOIN msdb.dbo.sysjobactivity a
+            ON a.job_id = j.job_id
+           AND a.session_id = (SELECT MAX(session_id) FROM msdb.dbo.syssessions)
+        LEFT JOIN msdb.dbo.sysjobhistory h
+            ON h.instance_id = a.job_history_id
+        WHERE j.name IN ({names})
+    """
+
+    STEPS_SQL = """
+        SELECT j.name AS Job_Name,
+               h.step_id AS Step_Id,
+               h.step_name AS Step_Name,
+               msdb.dbo.agent_datetime(h.run_date, h.run_time) AS Step_Started_At,
+               h.run_status,
+               h.run_duration,
+               h.message AS Message
+        FROM msdb.dbo.sysjobhistory h
+        JOIN msdb.dbo.sysjobs j ON j.job_id = h.job_id
+        WHERE h.step_id > 0
+          AND j.name IN ({names})
+          AND msdb.dbo.agent_datetime(h.run_date, h.run_time) >= ?
+        ORDER BY j.name, h.step_id
+    """
+
+    def __init__(self, db, config_path="config.ini"):
+        self.db = db
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        # 1 keeps the sheet order strictly sequential (jobs often feed each other)
+        self.max_concurrent = max(1, config.getint("JOBS", "max_concurrent_jobs", fallback=1))
+        self.poll_seconds = config.getfloat("JOBS", "poll_seconds", fallback=10)
+        self.default_timeout = config.getfloat("JOBS", "default_timeout_seconds", fallback=3600)
+        self.stop_on_timeout = config.getboolean("JOBS", "stop_on_timeout", fallback=True)
+
+    def job(self, job_name, command, timeout_seconds=None):
+        try:
+            timeout = float(timeout_seconds)
+            if timeout != timeout or timeout <= 0:   # NaN from an empty Excel cell
+                raise ValueError
+        except (TypeError, ValueError):
+            timeout = self.default_timeout
+        return AgentJob(job_name, command, timeout)
+
+    # ------------------------------------------------------------------
+    def _server_now(self):
+        return self.db.execute_query("SELECT GETDATE()")[0][0]
+
+    def _start(self, job):
+        logging.info(f"▶ Starting job: {job.job_name} | Command: {job.command}")
+        job._started = time.time()
+        try:
+            if job.is_agent_job:
+                job.requested_at = self._server_now()
+                self.db.execute_non_query(job.command)
+                job.status = "RUNNING"
+                return
+
+            # Synchronous command: the call itself is the run
+            job.started_at = datetime.now()
+            self.db.execute_non_query(job.command)
+            job.status, job.run_status = "PASS", "Succeeded"
+        except Exception as ex:
+            logging.error(f"❌ Job failed: {job.job_name} | Error: {ex}")
+            job.status, job.run_status, job.error = "FAIL", "Failed", str(ex)
+        job.finished_at = datetime.now() if job.started_at else None
+        job.duration = round(time.time() - job._started, 2)
+
+    def _poll(self, running):
+        """One batched activity query for every running Agent job."""
+        names = sorted({job.agent_name for job in running})
+        rows = self.db.execute_query(self.ACTIVITY_SQL.format(names=_placeholders(names)), *names)
+        activity = {}
+        for name, start, stop, run_status, run_duration, message in rows:
+            activity[name] = (start, stop, run_status, run_duration, message)
+
+        for job in running:
+            start, stop, run_status, run_duration, message = activity.get(job.agent_name, (None,) * 5)
+            # Activity of an earlier run until the Agent picks up our request
+            if start is None or start < job.requested_at.replace(microsecond=0):
+                start = stop = None
+            job.started_at = start or job.started_at
+
+            if stop is not None:
+                job.finished_at = stop
+                job.run_status = RUN_STATUS.get(run_status, "Unknown")
+                job.duration = run_duration_seconds(run_duration)
+                if job.duration is None:
+                    job.duration = round((stop - start).total_seconds(), 2)
+                job.message = message
+                job.status = "PASS" if run_status == 1 else "FAIL"
+                icon = "✅" if job.status == "PASS" else "❌"
+                logging.info(f"{icon} Job {job.job_name}: {job.run_status} in {job.duration}s")
+            elif time.time() - job._started > job.timeout_seconds:
+                self._timeout(job)
+
+    def _timeout(self, job):
+        job.status, job.run_status = "TIMEOUT", "In Progress"
+        job.duration = round(time.time() - job._started, 2)
+        job.error = f"Still running after {job.timeout_seconds:g}s"
+        logging.error(f"⏰ Job {job.job_name} timed out after {job.timeout_seconds:g}s")
+        if self.stop_on_timeout:
+            try:
+                self.db.execute_non_query(
+                    "EXEC msdb.dbo.sp_stop_job @job_name = N'{}'".format(job.agent_name.replace("'", "''"))
+                )
+                job.error += " (stopped)"
+            except Exception as ex:
+                job.error += f" (sp_stop_job failed: {ex})"
+
+    # ------------------------------------------------------------------
+    def run(self, jobs):
+        """Run jobs in order, at most max_concurrent_jobs at a time; returns the jobs."""
+        pending = list(jobs)
+        running = []
+        while pending or running:
+            while pending and len(running) < self.max_concurrent:
+                job = pending.pop(0)
+                self._start(job)
+                if job.status == "RUNNING":
+                    running.append(job)
+
+            if running:
+                time.sleep(self.poll_seconds)
+                try:
+                    self._poll(running)
+                except Exception as ex:
+                    logging.error(f"❌ Could not read job activity from msdb: {ex}")
+                    for job in running:
+                        if time.time() - job._started > job.timeout_seconds:
+                            self._timeout(job)
+                running = [job for job in running if job.status == "RUNNING"]
+        # Agent jobs wrote while we polled: nothing read before their end is current
+        self.db.data_changed()
+        return jobs
+
+    def step_history(self, jobs):
+        """Per-step rows of the runs started here (one sysjobhistory query)."""
+        finished = [job for job in jobs if job.is_agent_job and job.started_at is not None]
+        if not finished:
+            return []
+        names = sorted({job.agent_name for job in finished})
+        since = min(job.requested_at for job in finished).replace(microsecond=0)
+        rows = self.db.execute_query(self.STEPS_SQL.format(names=_placeholders(names)), *names, since)
+
+        steps = []
+        for name, step_id, step_name, step_start, run_status, run_duration, message in rows:
+            for job in finished:
+                if job.agent_name != name or step_start < job.started_at.replace(microsecond=0):
+                    continue
+                if job.finished_at is not None and step_start > job.finished_at:
+                    continue
+                steps.append({
+                    "Job_Name": job.job_name,
+                    "Step_Id": step_id,
+                    "Step_Name": step_name,
+                    "Step_Started_At": step_start,
+                    "Run_Status": RUN_STATUS.get(run_status, "Unknown"),
+                    "Execution_Time": run_duration_seconds(run_duration),
+                    "Message": message,
+                })
+        return steps
@@ -0,0 +1,100 @@
+import logging
+import configparser
+import pandas as pd
+from utils.detail_collector import DetailCollector
+
+
+class ViolationBudget:
+    """
+    Fail-fast probes for scan-heavy checks (duplicates, referential integrity, SCD metadata,
+    completeness EXCEPT): one offending row is enough to fail the build, so the check query
+    is wrapped in SELECT TOP (n) and stops at the first n violations instead of collecting
+    them all. With full_diagnostics, a check that used up its budget is re-run as an exact
+    COUNT_BIG(*) for the report.
+
+    n comes from an optional Violation_Budget column of the check's sheet row(s), else from
+    max_violations; global switches live in the [VIOLATION_BUDGET] section of config.ini.
+    """
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.config_path = config_path
+        self.enabled = config.getboolean("VIOLATION_BUDGET", "enabled", fallback=False)
+        self.max_violations = config.getint("VIOLATION_BUDGET", "max_violations", fallback=100)
+        self.full_diagnostics = config.getboolean("VIOLATION_BUDGET", "full_diagnostics", fallback=False)
+
+    # ------------------------------------------------------------------
+    def budget(self, rows=None):
+        """
+        Budget for one check: first non-blank Violation_Budget of the given sheet rows
+        (DataFrame or Series), else max_violations. None → exact check (disabled, or budget <= 0).
+        """
+        if not self.enabled:
+            return None
+        value = None
+        if isinstance(rows, pd.DataFrame) and "Violation_Budget" in rows.columns:
+            values = rows["Violation_Budget"].dropna()
+            values = values[values.astype(str).str.strip() != ""]
+            value = values.iloc[0] if not values.empty else None
+        elif isinstance(rows, pd.Series):
+            value = rows.get("Violation_Budget")
+            value = None if pd.isna(value) or str(value).strip() == "" else value
+        n = int(value) if value is not None else self.max_violations
+        return n if n > 0 else None
+
+    @staticmethod
+    def _strip(query):
+        return query.strip().rstrip(";").strip()
+
+    def probe_sql(self, query, n):
+        """SELECT TOP (n) over a violation query (no CTE / ORDER BY at its top level)."""
+        return f"SELECT TOP ({n}) * FROM (\n{self._strip(query)}\n) AS budget_probe"
+
+    def count_sql(self, query):
+        return f"SELECT COUNT_BIG(*) FROM (\n{self._strip(query)}\n) AS budget_count"
+
+    def label(self, n, reached, exact):
+        """Count_Exact column of the report."""
+        if n is None or not reached or exact:
+            return "YES"
+        return f"NO (stopped at budget {n})"
+
+    # ------------------------------------------------------------------
+    def fetch(self, db, query, n, name="details"):
+        """
+        Violation rows of query, at most n of them when a budget applies, streamed into a
+        DetailCollector (exact count, [DETAILS] sample, optional Parquet spill under name).
+        Returns (details, count, budget_reached, exact). count is the exact number of
+        violations unless the budget was reached without full_diagnostics (then it is n).
+        """
+        details = DetailCollector(self.config_path, name).collect(db, self.probe_sql(query, n) if n else query)
+        details.close()
+
+        reached = n is not None and details.count >= n
+        count, exact = details.count, not reached
+        if reached and self.full_diagnostics:
+            count, exact = self.exact_count(db, query), True
+        if reached:
+            logging.info(f"⏱️ Violation budget of {n} reached → {'exact count ' + str(count) if exact else 'stopped early'}")
+        return details, count, reached, exact
+
+    def count(self, db, query, n):
+        """
+        Number of rows of a violation query (e.g. an EXCEPT), stopping at n when a budget applies.
+        Returns (count, budget_reached, exact).
+        """
+        if not n:
+            return self.exact_count(db, query), False, True
+        result = db.execute_query(f"SELECT TOP ({n}) 1 AS violation FROM (\n{self._strip(query)}\n) AS budget_probe")
+        count = len(result) if result else 0
+        if count >= n:
+            if self.full_diagnostics:
+                return self.exact_count(db, query), True, True
+            logging.info(f"⏱️ Violation budget of {n} reached → stopped early")
+            return count, True, False
+        return count, False, True
+
+    def exact_count(self, db, query):
+        result = db.execute_query(self.count_sql(query))
+        return result[0][0] if result else 0
@@ -0,0 +1,113 @@
+import os
+import pickle
+import hashlib
+import logging
+import threading
+import configparser
+import pandas as pd
+
+
+class WorkbookCache:
+    """
+    Parsed workbook sheets shared by every validator and environment of a run.
+
+    The first read of a workbook opens it once (pd.ExcelFile); each sheet is parsed once and
+    handed out as a copy, so Table_Mapping / Audit_tables / the DB sheets are not re-parsed by
+    every check of every --db section. Keys include the file's size and mtime: an edited
+    workbook is read again.
+
+    With [WORKBOOK_CACHE] persist = true the parsed sheets are also pickled to cache_dir, so
+    later runs and parallel workers (pytest -n) load them without openpyxl.
+    """
+
+    _instance = None
+
+    def __init__(self, config_path="config.ini"):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        self.enabled = config.getboolean("WORKBOOK_CACHE", "enabled", fallback=True)
+        self.persist = config.getboolean("WORKBOOK_CACHE", "persist", fallback=False)
+        self.cache_dir = config.get("WORKBOOK_CACHE", "cache_dir",
+                                    fallback=os.path.join("Reports", ".workbook_cache"))
+        self._books = {}     # (path, size, mtime) → pd.ExcelFile
+        self._frames = {}    # (path, size, mtime, sheet) → DataFrame
+        self._lock = threading.Lock()
+        self.reads = 0       # sheets actually parsed (or loaded from disk)
+        self.hits = 0
+
+    @classmethod
+    def get(cls, config_path="config.ini"):
+        """Shared cache for the whole run (first config_path wins)."""
+        if cls._instance is None:
+            cls._instance = cls(config_path)
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _version(excel_path):
+        path = os.path.abspath(excel_path)
+        stat = os.stat(path)
+        return path, stat.st_size, stat.st_mtime_ns
+
+    def _disk_file(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pkl")
+
+    def _parse(self, version, sheet_name):
+        if self.persist:
+            disk_file = self._disk_file(version + (sheet_name,))
+            if os.path.exists(disk_file):
+                try:
+                    with open(disk_file, "rb") as f:
+                        return pickle.load(f)
+                except Exception as e:
+                    logging.warning(f"⚠️ Ignoring unreadable workbook cache {disk_file}: {e}")
+
+        book = self._books.get(version)
+        if book is None:
+            book = self._books[version] = pd.ExcelFile(version[0], engine="openpyxl")
+        df = book.parse(sheet_name)
+
+        if self.persist:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_file = f"{disk_file}.{os.getpid()}.tmp"
+                with open(tmp_file, "wb") as f:
+                    pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_file, disk_file)   # atomic: parallel workers never see half a file
+            except Exception as e:
+                logging.warning(f"⚠️ Could not persist workbook sheet '{sheet_name}': {e}")
+        return df
+
+    def read_sheet(self, excel_path, sheet_name=0, **kwargs):
+        """Drop-in for pd.read_excel(excel_path, sheet_name=...); raises ValueError for a missing sheet."""
+        kwargs.pop("engine", None)
+        if not self.enabled or kwargs:
+            return pd.read_excel(excel_path, sheet_name=sheet_name, engine="openpyxl", **kwargs)
+        try:
+            version = self._version(excel_path)
+        except OSError:
+            return pd.read_excel(excel_path, sheet_name=sheet_name, engine="openpyxl")
+
+        key = version + (sheet_name,)
+        with self._lock:
+            df = self._frames.get(key)
+            if df is None:
+                df = self._frames[key] = self._parse(version, sheet_name)
+                self.reads += 1
+            else:
+                self.hits += 1
+        # A copy, so a validator adding or filtering columns cannot change what the next one sees
+        return df.copy()
+
+    def clear(self):
+        with self._lock:
+            for book in self._books.values():
+                book.close()
+            self._books.clear()
+            self._frames.clear()
+
+
+def read_sheet(excel_path, sheet_name=0, **kwargs):
+    """Read one workbook sheet through the run's shared WorkbookCache."""
+    return WorkbookCache.get().read_sheet(excel_path, sheet_name=sheet_name, **kwargs)